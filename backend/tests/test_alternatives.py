@@ -0,0 +1,135 @@
+"""
+Tests for lower-impact alternatives.
+
+Tests verify:
+- Blocked neighbour search matches a full sort
+- Incremental updates match a rebuild with the same feature scales
+- Alternatives are near neighbours with a lower total on the metric
+- The index follows product edits
+- The API endpoint and export entries carry the same alternatives
+"""
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+from django.test import TestCase, override_settings
+from products.alternatives import (
+    N_NEIGHBOURS,
+    AlternativesIndex,
+    _transform,
+    get_alternatives_index,
+    nearest_neighbours,
+)
+from products.models import Material, Product, ProductComponent
+from static_generation.exporter import StaticDataExporter
+
+
+def synthetic_rows(rng, product_ids, computed_at):
+    """Snapshot-shaped rows with random features."""
+    return [
+        (int(pid), f'product-{pid}', computed_at, *(rng.random(7) * 10 ** rng.integers(0, 4, 7)))
+        for pid in product_ids
+    ]
+
+
+class NearestNeighbourTests(TestCase):
+    """Test the array search without the database."""
+
+    def test_matches_full_sort(self):
+        """Each row's neighbours are the k nearest other rows, nearest first."""
+        features = np.random.default_rng(1).random((60, 4))
+        indices, distances = nearest_neighbours(features, np.arange(60), k=5, block_size=7)
+
+        for row in range(60):
+            expected = np.linalg.norm(features - features[row], axis=1)
+            expected[row] = np.inf
+            self.assertEqual(indices[row].tolist(), np.argsort(expected)[:5].tolist())
+            np.testing.assert_allclose(distances[row], np.sort(expected)[:5])
+
+    def test_small_catalog_padding(self):
+        """Rows are padded when the catalog has fewer than k other products."""
+        indices, distances = nearest_neighbours(np.eye(3), np.arange(3), k=4)
+        self.assertEqual((indices >= 0).sum(axis=1).tolist(), [2, 2, 2])
+        self.assertTrue(np.isinf(distances[:, 2:]).all())
+
+    def test_incremental_update_matches_rebuild(self):
+        """Changing, adding and removing products gives the same neighbours as a full search."""
+        rng = np.random.default_rng(2)
+        start = datetime(2024, 1, 1)
+        index = AlternativesIndex.build(synthetic_rows(rng, range(1, 201), start))
+
+        changed = synthetic_rows(rng, [5, 17, 90, 250, 251], start + timedelta(hours=1))
+        index.update(changed, removed_ids=[3, 120])
+
+        self.assertEqual(len(index), 200)
+        self.assertNotIn(3, index)
+        self.assertIn(251, index)
+        features = _transform(index.values) / index.scale
+        expected, _ = nearest_neighbours(features, np.arange(len(index)))
+        np.testing.assert_array_equal(index.neighbours, index.product_ids[expected])
+
+
+class AlternativesTests(TestCase):
+    """Test alternatives for real products."""
+
+    def setUp(self):
+        """Create bags of similar price and a distant, much dearer product."""
+        self.cotton = Material.objects.create(name='Cotton', production_co2e_kg_per_kg=2.0)
+        self.plastic = Material.objects.create(name='Plastic', production_co2e_kg_per_kg=6.0)
+        self.products = {}
+        for slug, material, grams, price in [
+            ('plastic-bag', self.plastic, 400, 5.0),
+            ('cotton-bag', self.cotton, 400, 6.0),
+            ('light-cotton-bag', self.cotton, 200, 5.5),
+            ('armchair', self.cotton, 20000, 900.0),
+        ]:
+            product = Product.objects.create(
+                name=slug, slug=slug, purchase_price_usd=price, uses_per_year=50, average_lifespan_uses=100
+            )
+            ProductComponent.objects.create(product=product, material=material, weight_grams=grams)
+            self.products[slug] = product
+
+    def slugs(self, slug, metric='greenhouse_gas_kg'):
+        index = get_alternatives_index()
+        return [entry['slug'] for entry in index.alternatives(self.products[slug].id, metric)]
+
+    def test_lower_impact_neighbours(self):
+        """Only neighbours with a lower total are suggested, nearest first."""
+        self.assertEqual(self.slugs('plastic-bag'), ['cotton-bag', 'light-cotton-bag'])
+        self.assertEqual(self.slugs('cotton-bag'), ['light-cotton-bag'])
+        self.assertEqual(self.slugs('light-cotton-bag'), [])
+        self.assertEqual(self.slugs('plastic-bag', metric='water_liters'), [])
+
+    def test_follows_edits(self):
+        """Edited products are re-indexed on the next read."""
+        self.assertEqual(self.slugs('light-cotton-bag'), [])
+        self.plastic.production_co2e_kg_per_kg = 0.1
+        self.plastic.save()
+        self.assertEqual(self.slugs('light-cotton-bag'), ['plastic-bag'])
+        self.assertEqual(len(get_alternatives_index()), 4)
+
+    def test_api_and_export(self):
+        """The endpoint and the export entries list the same alternatives."""
+        response = self.client.get('/api/products/plastic-bag/alternatives/?metric=greenhouse_gas_kg&k=1')
+        self.assertEqual(response.status_code, 200)
+        entries = response.json()['alternatives']['greenhouse_gas_kg']
+        self.assertEqual([entry['slug'] for entry in entries], ['cotton-bag'])
+        self.assertLess(entries[0]['value'], self.products['plastic-bag'].get_total_impact()['greenhouse_gas_kg']['value'])
+
+        self.assertEqual(self.client.get('/api/products/missing/alternatives/').status_code, 404)
+        self.assertEqual(self.client.get('/api/products/plastic-bag/alternatives/?metric=x').status_code, 400)
+        self.assertEqual(
+            self.client.get(f'/api/products/plastic-bag/alternatives/?k={N_NEIGHBOURS + 1}').status_code, 400
+        )
+
+        with TemporaryDirectory() as tmpdir:
+            with override_settings(STATIC_DATA_OUTPUT_DIR=tmpdir):
+                StaticDataExporter(uncertainty_draws=0).export_products()
+                exported = json.loads((Path(tmpdir) / 'products.json').read_text())
+
+        by_slug = {product['slug']: product for product in exported['products']}
+        self.assertEqual(
+            by_slug['plastic-bag']['alternatives']['greenhouse_gas_kg'], ['cotton-bag', 'light-cotton-bag']
+        )
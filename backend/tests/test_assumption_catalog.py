@@ -0,0 +1,144 @@
+"""
+Tests for the compiled assumption catalog cache.
+
+Tests verify:
+- The catalog compiles in three queries and is then served from memory
+  after a one-row version check
+- Saving or deleting any assumption model recompiles it
+- A version written by another process recompiles it
+- Rolled-back assumption changes do not stay in the cached catalog
+- Option multiplier tensors hold each effect, padded with ones
+- Batch assumption tables are sliced from the catalog by scope and owner
+- Repeated list requests do not query the assumption tables
+"""
+import numpy as np
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from products.assumption_catalog import bump_catalog_version, get_assumption_catalog
+from products.assumption_tables import load_assumption_tables
+from products.impact_engine import METRICS, PHASES
+from products.models import Assumption, AssumptionEffect, AssumptionOption, CatalogVersion, Material, Product
+
+
+class AssumptionCatalogTests(TestCase):
+    """Test catalog compilation and invalidation."""
+
+    def setUp(self):
+        """Create product, material and global assumptions."""
+        self.product = Product.objects.create(name='Napkin', slug='napkin')
+        self.material = Material.objects.create(name='Cotton')
+        self.wash = self._assumption('Wash frequency', {'often': 2.0, 'rarely': 0.5}, 'rarely',
+                                     product=self.product, exposed=True)
+        self.yield_ = self._assumption('Crop yield', {'low': 1.5, 'high': 0.8, 'mid': 1.0}, 'mid',
+                                       material=self.material)
+        self.trip = self._assumption('Trip distance', {'near': 0.5}, '', exposed=True)
+
+    def _assumption(self, label, options, default, **scope):
+        assumption = Assumption.objects.create(label=label, default_option_key=default, **scope)
+        for key, multiplier in options.items():
+            option = AssumptionOption.objects.create(assumption=assumption, option_key=key, label=key)
+            AssumptionEffect.objects.create(option=option, phase='use', metric='water_liters', multiplier=multiplier)
+        return assumption
+
+    def test_compiled_once(self):
+        """Compiling is three queries; later reads only check the version."""
+        with self.assertNumQueries(4):
+            catalog = get_assumption_catalog()
+        with self.assertNumQueries(1):
+            self.assertIs(get_assumption_catalog(), catalog)
+            catalog.resolver.exposed_assumptions(self.product.id)
+        self.assertEqual(len(catalog), 3)
+
+    def test_signals_recompile(self):
+        """Edits to assumptions, options and effects each invalidate the catalog."""
+        catalog = get_assumption_catalog()
+        cell = (PHASES.index('use'), METRICS.index('water_liters'))
+
+        effect = AssumptionEffect.objects.get(option__option_key='near')
+        effect.multiplier = 0.25
+        effect.save()
+        updated = get_assumption_catalog()
+        self.assertIsNot(updated, catalog)
+        self.assertEqual(updated.multipliers[updated.row(self.trip.id), 0][cell], 0.25)
+
+        AssumptionOption.objects.create(assumption=self.trip, option_key='far', label='Far')
+        self.assertEqual(get_assumption_catalog().option_keys[updated.row(self.trip.id)], ['near', 'far'])
+
+        self.wash.delete()
+        self.assertNotIn(self.wash.id, get_assumption_catalog())
+
+    def test_other_process_recompiles(self):
+        """A version written elsewhere is seen on the next read."""
+        catalog = get_assumption_catalog()
+        # Another process edits without signals reaching this one.
+        Assumption.objects.filter(pk=self.yield_.id).update(default_option_key='high')
+        CatalogVersion.objects.filter(pk=1).update(token='other')
+        updated = get_assumption_catalog()
+        self.assertIsNot(updated, catalog)
+        self.assertEqual(updated.version, 'other')
+        self.assertEqual(updated.defaults[updated.row(self.yield_.id)], 1)
+
+        bump_catalog_version()
+        self.assertNotEqual(get_assumption_catalog().version, 'other')
+
+    def test_rollback_recompiles(self):
+        """A catalog read inside a rolled-back transaction is not served afterwards."""
+        get_assumption_catalog()
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                extra = self._assumption('Dryer use', {'never': 0.9}, 'never')
+                self.assertIn(extra.id, get_assumption_catalog())
+                raise RuntimeError
+        self.assertNotIn(extra.id, get_assumption_catalog())
+        self.assertEqual(len(get_assumption_catalog()), 3)
+
+    def test_released_savepoint_keeps_catalog(self):
+        """Changes in a savepoint that is released stay in the catalog."""
+        with transaction.atomic():
+            extra = self._assumption('Dryer use', {'never': 0.9}, 'never')
+            self.assertIn(extra.id, get_assumption_catalog())
+        catalog = get_assumption_catalog()
+        self.assertIn(extra.id, catalog)
+        with self.assertNumQueries(1):
+            self.assertIs(get_assumption_catalog(), catalog)
+
+    def test_multiplier_tensor(self):
+        """Each option's effects land in its (phase, metric) cell; padding is ones."""
+        catalog = get_assumption_catalog()
+        row = catalog.row(self.yield_.id)
+        self.assertEqual(catalog.multipliers.shape, (3, 3, len(PHASES), len(METRICS)))
+        self.assertEqual(catalog.option_keys[row], ['low', 'high', 'mid'])
+        self.assertEqual(catalog.defaults[row], 2)
+        self.assertEqual(
+            catalog.multipliers[row, :, PHASES.index('use'), METRICS.index('water_liters')].tolist(),
+            [1.5, 0.8, 1.0],
+        )
+        self.assertEqual(catalog.multipliers[row, :, PHASES.index('production')].tolist(), [[1.0] * 5] * 3)
+        trip = catalog.row(self.trip.id)
+        self.assertTrue((catalog.multipliers[trip, 1:] == 1.0).all())
+
+    def test_tables_from_catalog(self):
+        """Tables keep only the requested owners, mapped to their row indices."""
+        other = Product.objects.create(name='Bag', slug='bag')
+        tables = load_assumption_tables(np.array([other.id, self.product.id]), np.array([self.material.id]))
+        self.assertEqual(tables['product']['ids'].tolist(), [])
+        self.assertEqual(tables['material']['ids'].tolist(), [self.yield_.id])
+        self.assertEqual(tables['material']['tables'].shape, (1, 3, 20))
+
+        tables = load_assumption_tables(np.array([other.id, self.product.id]), np.array([]), exposed=True)
+        self.assertEqual(tables['product']['owners'].tolist(), [1])
+        self.assertEqual(tables['product']['defaults'].tolist(), [1])
+        self.assertEqual(tables['material']['ids'].tolist(), [])
+        self.assertEqual(tables['global']['ids'].tolist(), [self.trip.id])
+
+    def test_repeated_requests_skip_assumption_tables(self):
+        """Once compiled, the product list reads no assumption rows."""
+        self.client.get('/api/products/')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/products/')
+        self.assertEqual(
+            [a['key'] for a in response.json()['products'][0]['assumptions']['exposed_assumptions']],
+            ['wash_frequency', 'trip_distance'],
+        )
+        self.assertFalse(any('products_assumption' in query['sql'] for query in queries))
@@ -0,0 +1,122 @@
+"""
+Tests for the catalog-level assumption resolver.
+
+Tests verify:
+- Assumptions, options and effects load in three queries for any catalog size
+- Product and global assumptions interleave by sort order
+- Global assumption dicts are built once and shared
+- Resolved output matches the per-product path
+- The product list endpoint does not query assumptions per product
+- The export writes global assumptions once and references them by key
+"""
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from products.assumption_resolver import AssumptionResolver
+from products.models import Assumption, AssumptionEffect, AssumptionOption, Material, Product
+from static_generation.exporter import StaticDataExporter
+
+
+class AssumptionResolverTests(TestCase):
+    """Test bulk resolution of exposed assumptions."""
+
+    def setUp(self):
+        """Create products with their own, global, material and hidden assumptions."""
+        self.products = [
+            Product.objects.create(name=f'Product {i}', slug=f'product-{i}') for i in range(4)
+        ]
+        self._assumption('Trip distance', sort_order=1)
+        self._assumption('Grid mix', sort_order=3)
+        for product in self.products:
+            self._assumption('Wash frequency', product=product, sort_order=2)
+        self._assumption('Hidden', product=self.products[0], exposed=False)
+        self._assumption('Recycled content', material=Material.objects.create(name='Steel'))
+
+    def _assumption(self, label, product=None, material=None, exposed=True, sort_order=0):
+        assumption = Assumption.objects.create(
+            product=product, material=material, label=label, exposed=exposed, sort_order=sort_order
+        )
+        for option_order, key in [(2, 'high'), (1, 'low')]:
+            option = AssumptionOption.objects.create(
+                assumption=assumption, option_key=key, label=key, sort_order=option_order
+            )
+            AssumptionEffect.objects.create(option=option, phase='use', metric='cost_usd', multiplier=2.0)
+        return assumption
+
+    def test_three_queries(self):
+        """Assumptions, options and effects are one query each."""
+        with self.assertNumQueries(3):
+            resolver = AssumptionResolver.for_products(Product.objects.all())
+        with self.assertNumQueries(0):
+            for product in self.products:
+                resolver.exposed_assumptions(product.id)
+
+    def test_order_and_sharing(self):
+        """Lists interleave by sort order; global dicts are shared between products."""
+        resolver = AssumptionResolver.for_products()
+        first = resolver.exposed_assumptions(self.products[0].id)
+        second = resolver.exposed_assumptions(self.products[1].id)
+
+        self.assertEqual([a['key'] for a in first], ['trip_distance', 'wash_frequency', 'grid_mix'])
+        self.assertEqual([option['id'] for option in first[0]['options']], ['low', 'high'])
+        self.assertIs(first[0], second[0])
+        self.assertIsNot(first[1], second[1])
+
+    def test_matches_per_product_path(self):
+        """Passing a resolver does not change the serialized assumptions."""
+        resolver = AssumptionResolver.for_products()
+        for product in self.products:
+            self.assertEqual(product.get_assumptions(resolver=resolver), product.get_assumptions())
+
+    def test_list_endpoint_query_count(self):
+        """The product list issues the same number of queries for more products."""
+        def count():
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get('/api/products/?sources=0')
+            return len(queries)
+
+        count()  # fill the snapshots
+        before = count()
+        for i in range(4, 8):
+            product = Product.objects.create(name=f'Product {i}', slug=f'product-{i}')
+            self._assumption('Wash frequency', product=product)
+        count()
+        self.assertEqual(count(), before)
+
+    def _export(self, **options):
+        with TemporaryDirectory() as tmpdir:
+            with override_settings(STATIC_DATA_OUTPUT_DIR=tmpdir):
+                exporter = StaticDataExporter(uncertainty_draws=0, **options)
+                if exporter.shared_assumptions:
+                    exporter.export_assumptions()
+                exporter.export_products()
+                return {path.name: json.loads(path.read_text()) for path in Path(tmpdir).glob('*.json')}
+
+    def test_shared_export(self):
+        """Global assumptions are written once; products list references in order."""
+        files = self._export()
+        shared = files['assumptions.json']['assumptions']
+        self.assertEqual(sorted(shared), ['grid_mix', 'trip_distance'])
+
+        product = files['products.json']['products'][0]
+        exposed = product['assumptions']['exposed_assumptions']
+        self.assertEqual(exposed[0], {'ref': 'trip_distance'})
+        self.assertEqual(exposed[1]['key'], 'wash_frequency')
+        self.assertEqual(exposed[2], {'ref': 'grid_mix'})
+        # Scenarios are still built from the resolved assumptions.
+        self.assertEqual(
+            product['assumption_scenarios']['keys'], ['trip_distance', 'wash_frequency', 'grid_mix']
+        )
+
+        inline = self._export(shared_assumptions=False)
+        self.assertNotIn('assumptions.json', inline)
+        resolved = [
+            shared.get(entry.get('ref'), entry) for entry in exposed
+        ]
+        self.assertEqual(
+            resolved, inline['products.json']['products'][0]['assumptions']['exposed_assumptions']
+        )
@@ -0,0 +1,195 @@
+"""
+Tests for the pairwise break-even matrix.
+
+Tests verify:
+- Line parameters follow getBreakEvenParams for consumables and durables
+- Blocked pairwise solving matches a pair-by-pair calculation
+- Only crossings within the horizon are kept
+- Exposed default options are applied
+- The API endpoint serves pairs and the index; the export shards it per product
+- Each crossing is exported once, in the shard of the lower-indexed product
+"""
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+from django.test import TestCase, override_settings
+from products.breakeven import BreakEvenMatrix, solve_crossings
+from products.impact_engine import METRICS
+from products.models import (
+    Assumption,
+    AssumptionEffect,
+    AssumptionOption,
+    Material,
+    Product,
+    ProductComponent,
+)
+from static_generation.exporter import StaticDataExporter
+
+
+def calculate_break_even_intersection(p1, p2, horizon=100):
+    """Pair-by-pair reference, as in frontend/src/utils/comparison.js."""
+    slope_diff = p1['slope'] - p2['slope']
+    if abs(slope_diff) > 0.000001:
+        t = (p2['initial'] - p1['initial']) / slope_diff
+        if 0 < t < horizon:
+            return t
+    return None
+
+
+class SolveCrossingsTests(TestCase):
+    """Test the vectorized pairwise solve."""
+
+    def test_matches_pairwise_reference(self):
+        """Blocked solving finds exactly the pairs the reference finds."""
+        rng = np.random.default_rng(3)
+        initial = rng.random((40, len(METRICS))) * 100
+        slope = rng.random((40, len(METRICS))) * 10
+        slope[5] = slope[6]  # parallel lines never cross
+
+        crossings = solve_crossings(initial, slope, horizon=50, block_size=7)
+        for m, metric in enumerate(METRICS):
+            found = {(int(i), int(j)): year for (i, j), year in zip(*crossings[metric])}
+            expected = {}
+            for i in range(40):
+                for j in range(i + 1, 40):
+                    year = calculate_break_even_intersection(
+                        {'initial': initial[i, m], 'slope': slope[i, m]},
+                        {'initial': initial[j, m], 'slope': slope[j, m]},
+                        horizon=50,
+                    )
+                    if year is not None:
+                        expected[(i, j)] = year
+            self.assertEqual(found.keys(), expected.keys())
+            for pair, year in expected.items():
+                self.assertAlmostEqual(found[pair], year)
+            self.assertNotIn((5, 6), found)
+
+
+class BreakEvenMatrixTests(TestCase):
+    """Test break-even data for real products."""
+
+    def setUp(self):
+        """Create a consumable and a durable product."""
+        plastic = Material.objects.create(name='Plastic', production_co2e_kg_per_kg=3.0)
+        steel = Material.objects.create(name='Steel', production_co2e_kg_per_kg=5.0)
+
+        self.bag = Product.objects.create(
+            name='Plastic Bag',
+            slug='plastic-bag',
+            purchase_price_usd=0.1,
+            uses_per_year=100,
+            average_lifespan_uses=1,
+        )
+        ProductComponent.objects.create(product=self.bag, material=plastic, weight_grams=10)
+
+        self.bottle = Product.objects.create(
+            name='Steel Bottle',
+            slug='steel-bottle',
+            purchase_price_usd=25.0,
+            uses_per_year=100,
+            average_lifespan_uses=1000,
+            use_cost_per_use=0.01,
+        )
+        ProductComponent.objects.create(product=self.bottle, material=steel, weight_grams=300)
+
+    def test_line_parameters(self):
+        """Consumables start at zero; durables start at their upfront impact."""
+        matrix = BreakEvenMatrix.for_products()
+
+        bag = matrix.pair('plastic-bag', 'steel-bottle', 'greenhouse_gas_kg')
+        self.assertEqual(bag['initial'][0], 0.0)
+        self.assertAlmostEqual(bag['slope'][0], self.bag.get_total_impact()['greenhouse_gas_kg']['value'])
+        self.assertAlmostEqual(bag['initial'][1], 0.3 * 5.0)
+        self.assertEqual(bag['slope'][1], 0.0)
+
+        cost = matrix.pair('plastic-bag', 'steel-bottle', 'cost_usd')
+        self.assertAlmostEqual(cost['slope'][0], 0.1 * 100)
+        self.assertEqual(cost['initial'][1], 25.0)
+        self.assertAlmostEqual(cost['slope'][1], 0.01 * 100)
+
+    def test_crossing_year(self):
+        """The crossing year is symmetric and matches the pairwise formula."""
+        matrix = BreakEvenMatrix.for_products()
+        cost = matrix.pair('plastic-bag', 'steel-bottle', 'cost_usd')
+        expected = calculate_break_even_intersection(
+            {'initial': cost['initial'][0], 'slope': cost['slope'][0]},
+            {'initial': cost['initial'][1], 'slope': cost['slope'][1]},
+        )
+        self.assertAlmostEqual(cost['year'], expected)
+        self.assertEqual(matrix.pair('steel-bottle', 'plastic-bag', 'cost_usd')['year'], cost['year'])
+
+        # Water is zero for both products: no crossing is stored.
+        self.assertIsNone(matrix.pair('plastic-bag', 'steel-bottle', 'water_liters')['year'])
+
+    def test_horizon(self):
+        """Crossings beyond the horizon are dropped."""
+        year = BreakEvenMatrix.for_products().pair('plastic-bag', 'steel-bottle', 'cost_usd')['year']
+        short = BreakEvenMatrix.for_products(horizon=year / 2)
+        self.assertIsNone(short.pair('plastic-bag', 'steel-bottle', 'cost_usd')['year'])
+        self.assertEqual(short.to_index()['crossings']['cost_usd'], [])
+
+    def test_exposed_defaults_applied(self):
+        """Default options of exposed assumptions scale the line parameters."""
+        assumption = Assumption.objects.create(
+            product=self.bottle, label='Wash frequency', exposed=True, default_option_key='often'
+        )
+        option = AssumptionOption.objects.create(assumption=assumption, option_key='often', label='Often')
+        AssumptionEffect.objects.create(option=option, phase='use', metric='cost_usd', multiplier=2.0)
+
+        cost = BreakEvenMatrix.for_products().pair('plastic-bag', 'steel-bottle', 'cost_usd')
+        self.assertAlmostEqual(cost['slope'][1], 0.01 * 100 * 2.0)
+
+    def test_api_and_export(self):
+        """The endpoint serves single pairs and the same index as the export."""
+        response = self.client.get('/api/products/break-even/?a=plastic-bag&b=steel-bottle')
+        self.assertEqual(response.status_code, 200)
+        pair = response.json()
+        self.assertEqual(
+            pair['metrics']['cost_usd'],
+            BreakEvenMatrix.for_products().pair('plastic-bag', 'steel-bottle', 'cost_usd'),
+        )
+
+        self.assertEqual(self.client.get('/api/products/break-even/?a=plastic-bag').status_code, 400)
+        self.assertEqual(
+            self.client.get('/api/products/break-even/?a=plastic-bag&b=missing').status_code, 404
+        )
+
+        index = self.client.get('/api/products/break-even/').json()
+        self.assertEqual(index['products'], ['plastic-bag', 'steel-bottle'])
+        self.assertEqual(len(index['crossings']['cost_usd']), 1)
+        with TemporaryDirectory() as tmpdir:
+            with override_settings(STATIC_DATA_OUTPUT_DIR=tmpdir):
+                StaticDataExporter().export_break_even()
+                shards = {
+                    path.stem: json.loads(path.read_text()) for path in (Path(tmpdir) / 'break-even').glob('*.json')
+                }
+            self.assertFalse((Path(tmpdir) / 'break-even.json').exists())
+
+        self.assertEqual(sorted(shards), ['plastic-bag', 'steel-bottle'])
+        bag, bottle = shards['plastic-bag'], shards['steel-bottle']
+        for metric in METRICS:
+            m = METRICS.index(metric)
+            expected = pair['metrics'][metric]
+            self.assertEqual([bag['initial'][m], bottle['initial'][m]], expected['initial'])
+            self.assertEqual([bag['slope'][m], bottle['slope'][m]], expected['slope'])
+            self.assertEqual(bag['crossings'][metric].get('steel-bottle'), expected['year'])
+            self.assertEqual(bottle['crossings'][metric], {})
+
+    def test_shards_hold_each_pair_once(self):
+        """Crossings land in the lower-indexed product's shard only."""
+        for i in range(3):
+            Product.objects.create(name=f'Cup {i}', slug=f'cup-{i}', purchase_price_usd=1.0 + i)
+        matrix = BreakEvenMatrix.for_products()
+        shards = dict(matrix.product_shards())
+        for metric, (pairs, years) in matrix.crossings.items():
+            exported = [
+                (matrix.slugs.index(slug), matrix.slugs.index(other), year)
+                for slug, shard in shards.items()
+                for other, year in shard['crossings'][metric].items()
+            ]
+            self.assertEqual(
+                sorted(exported), sorted((int(i), int(j), float(y)) for (i, j), y in zip(pairs, years))
+            )
+            self.assertTrue(all(i < j for i, j, _ in exported))
@@ -0,0 +1,78 @@
+"""
+Tests for the columnar binary export of impact values.
+
+Tests verify:
+- The buffer holds every product's phase and total values from products.json
+- The header lists the columns and the dtype; the slugs file the rows in order
+- float32 and float64 buffers are little-endian and sized rows × columns
+- Without the option no columnar files are written
+"""
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+from django.test import TestCase, override_settings
+from products.impact_engine import METRICS, PHASES
+from products.models import Material, Product, ProductComponent
+from static_generation.exporter import StaticDataExporter
+
+
+class ColumnarExportTests(TestCase):
+    """Test products-columns.bin and its header."""
+
+    def setUp(self):
+        """Create products with material and use-phase impacts."""
+        cotton = Material.objects.create(
+            name='Cotton', production_co2e_kg_per_kg=2.0, production_water_liters_per_kg=10000
+        )
+        for i in range(3):
+            product = Product.objects.create(
+                name=f'Product {i}', slug=f'product-{i}', use_water_liters_per_use=i * 1.5
+            )
+            ProductComponent.objects.create(product=product, material=cotton, weight_grams=100 * (i + 1))
+        tmpdir = TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.output = Path(tmpdir.name)
+
+    def export(self, columnar):
+        with override_settings(STATIC_DATA_OUTPUT_DIR=self.output):
+            StaticDataExporter(uncertainty_draws=0, columnar=columnar).export_all()
+        header = json.loads((self.output / 'products-columns.json').read_text())
+        buffer = (self.output / 'products-columns.bin').read_bytes()
+        products = json.loads((self.output / 'products.json').read_text())['products']
+        return header, buffer, products
+
+    def test_values_match_products(self):
+        """Every cell equals the matching value in products.json."""
+        header, buffer, products = self.export('float64')
+        values = np.frombuffer(buffer, dtype='<f8').reshape(header['shape'])
+        slugs = json.loads((self.output / 'products-columns-slugs.json').read_text())['slugs']
+        self.assertEqual(slugs, [product['slug'] for product in products])
+        self.assertNotIn('slugs', header)
+        self.assertEqual(header['columns'][:2], ['production.greenhouse_gas_kg', 'production.water_liters'])
+        self.assertEqual(header['columns'][-1], 'total.cost_usd')
+        for i, product in enumerate(products):
+            for j, column in enumerate(header['columns']):
+                group, metric = column.split('.')
+                impact = product['impacts'][metric] if group == 'total' else product['impacts_by_phase'][group][metric]
+                self.assertEqual(values[i, j], impact['value'])
+        self.assertGreater(values[:, header['columns'].index('production.water_liters')].min(), 0)
+
+    def test_float32_layout(self):
+        """float32 rows are products × (phases + total) × metrics, little-endian."""
+        header, buffer, products = self.export('float32')
+        n_columns = (len(PHASES) + 1) * len(METRICS)
+        self.assertEqual(header['dtype'], 'float32')
+        self.assertEqual(header['byte_order'], 'little')
+        self.assertEqual(header['shape'], [len(products), n_columns])
+        self.assertEqual(len(buffer), len(products) * n_columns * 4)
+        values = np.frombuffer(buffer, dtype='<f4').reshape(header['shape'])
+        totals = [product['impacts']['greenhouse_gas_kg']['value'] for product in products]
+        np.testing.assert_allclose(values[:, header['columns'].index('total.greenhouse_gas_kg')], totals, rtol=1e-6)
+
+    def test_disabled_by_default(self):
+        """Exports without the option write no columnar files."""
+        with override_settings(STATIC_DATA_OUTPUT_DIR=self.output):
+            StaticDataExporter(uncertainty_draws=0).export_all()
+        self.assertEqual(list(self.output.glob('products-columns*')), [])
@@ -0,0 +1,104 @@
+"""
+Tests for the static export profiles.
+
+Tests verify:
+- Minified writers produce the same bytes as compact JSON serialization
+- The dist profile hashes top-level file names and maps them in the manifest
+- Compressed variants decompress to their source file
+- An unchanged dist export writes nothing; a change replaces the hashed files
+- The pretty profile keeps plain names and writes no variants
+"""
+import gzip
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from posts.models import Post
+from products.models import Material, Product, ProductComponent
+from static_generation.exporter import StaticDataExporter
+from static_generation.writers import JsonArrayWriter, compact, dumps, nest
+
+
+class MinifiedWriterTests(SimpleTestCase):
+    """Test the minified serialization helpers."""
+
+    def test_minified_matches_compact(self):
+        """Streamed, nested and direct minified output equal compact JSON."""
+        items = [{'b': 1, 'a': 'é'}, {'c': [1, 2]}]
+        self.assertEqual(nest('post', dumps(items[0], True), True), compact({'post': items[0]}))
+        with TemporaryDirectory() as tmpdir:
+            for entries in (items, []):
+                writer = JsonArrayWriter(Path(tmpdir) / 'items.json', 'items', minify=True)
+                for item in entries:
+                    writer.append(dumps(item, True))
+                writer.close()
+                self.assertEqual(writer.tmp_path.read_bytes(), compact({'items': entries}))
+
+
+class ExportProfileTests(TestCase):
+    """Test pretty and dist exports."""
+
+    def setUp(self):
+        """Create a product and a post."""
+        cotton = Material.objects.create(name='Cotton', production_co2e_kg_per_kg=2.0)
+        product = Product.objects.create(name='Tote', slug='tote')
+        ProductComponent.objects.create(product=product, material=cotton, weight_grams=200)
+        self.post = Post.objects.create(title='Post', slug='post', content='Text', published=True)
+        tmpdir = TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.output = Path(tmpdir.name) / 'data'
+
+    def export(self, profile='dist'):
+        with override_settings(STATIC_DATA_OUTPUT_DIR=self.output):
+            return StaticDataExporter(uncertainty_draws=0, profile=profile).export_all()
+
+    def manifest(self):
+        return json.loads((self.output / 'manifest.json').read_text(encoding='utf-8'))
+
+    def test_hashed_names(self):
+        """Top-level files get hashed names listed in the manifest; shards keep theirs."""
+        self.export()
+        paths = self.manifest()['paths']
+        self.assertIn('products.json', paths)
+        for name, hashed in paths.items():
+            content = (self.output / hashed).read_bytes()
+            self.assertEqual(content, compact(json.loads(content)))
+            self.assertFalse((self.output / name).exists())
+        self.assertTrue((self.output / 'products' / 'tote.json').exists())
+        self.assertTrue((self.output / 'posts' / 'post.json').exists())
+
+    def test_gzip_variants(self):
+        """Every exported file has a .gz sibling with the same content."""
+        self.export()
+        files = self.manifest()['files']
+        for name in files:
+            if name.endswith('.json'):
+                self.assertIn(name + '.gz', files)
+                path = self.output / name
+                self.assertEqual(gzip.decompress((self.output / (name + '.gz')).read_bytes()), path.read_bytes())
+
+    def test_incremental(self):
+        """A rerun writes nothing; a change swaps the hashed file for a new one."""
+        self.export()
+        self.assertEqual(self.export()['written'], [])
+        old = self.manifest()['paths']['posts.json']
+
+        self.post.title = 'Renamed'
+        self.post.save()
+        changes = self.export()
+        new = self.manifest()['paths']['posts.json']
+        self.assertNotEqual(new, old)
+        self.assertIn(new, changes['written'])
+        self.assertIn(new + '.gz', changes['written'])
+        self.assertIn(old, changes['deleted'])
+        self.assertFalse((self.output / old).exists())
+        self.assertFalse((self.output / (old + '.gz')).exists())
+
+    def test_pretty_profile(self):
+        """The default profile writes indented files under their plain names."""
+        self.export(profile='pretty')
+        manifest = self.manifest()
+        self.assertNotIn('paths', manifest)
+        self.assertFalse(any(name.endswith('.gz') for name in manifest['files']))
+        self.assertTrue((self.output / 'products.json').read_text(encoding='utf-8').startswith('{\n  '))
@@ -5,10 +5,9 @@ Tests verify:
 - Data is correctly exported to JSON format
 - All products and posts are included
 - JSON files are properly formatted
-- Timestamp is included in exports
+- Data files carry no timestamp
 """
 import json
-import os
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from django.test import TestCase, override_settings
@@ -77,7 +76,7 @@ class StaticDataExporterTests(TestCase):
                 self.assertIn('products', data)
                 self.assertEqual(len(data['products']), 1)
                 self.assertEqual(data['products'][0]['name'], 'Test T-Shirt')
-                self.assertIn('export_timestamp', data)
+                self.assertNotIn('export_timestamp', data)
 
     @override_settings(STATIC_DATA_OUTPUT_DIR='/tmp/test_export')
     def test_export_posts_file(self):
@@ -96,7 +95,7 @@ class StaticDataExporterTests(TestCase):
                 self.assertIn('posts', data)
                 self.assertEqual(len(data['posts']), 1)
                 self.assertEqual(data['posts'][0]['title'], 'Test Blog Post')
-                self.assertIn('export_timestamp', data)
+                self.assertNotIn('export_timestamp', data)
 
     @override_settings(STATIC_DATA_OUTPUT_DIR='/tmp/test_export')
     def test_export_individual_posts(self):
@@ -0,0 +1,173 @@
+"""
+Tests for the batch impact engine.
+
+Tests verify:
+- Engine phase values match Product.get_impact_by_phase
+- Engine totals match Product.get_total_impact
+- Products without components and zero usage parameters are handled
+- to_dict output is unchanged when values come from the engine
+- PhaseMetricMatrix arithmetic and serialization
+"""
+from django.test import TestCase
+from products.impact_engine import METRICS, PHASES, ImpactEngine
+from products.models import (
+    Assumption,
+    AssumptionEffect,
+    AssumptionOption,
+    Material,
+    Product,
+    ProductComponent,
+)
+from products.phase_matrix import PhaseMetricMatrix
+
+
+class ImpactEngineTests(TestCase):
+    """Compare the vectorized engine against the per-product calculation."""
+
+    def setUp(self):
+        """Create test fixtures."""
+        self.cotton = Material.objects.create(
+            name='Cotton',
+            production_co2e_kg_per_kg=2.0,
+            production_water_liters_per_kg=10000,
+            production_energy_kwh_per_kg=1.0,
+            production_land_m2_per_kg=1.0,
+            production_cost_per_kg=10.0,
+            transport_co2e_kg_per_kg=0.3,
+            end_of_life_co2e_kg_per_kg=0.1,
+            end_of_life_cost_per_kg=0.5,
+        )
+        self.plastic = Material.objects.create(
+            name='Plastic',
+            production_co2e_kg_per_kg=3.0,
+            production_water_liters_per_kg=100,
+            production_energy_kwh_per_kg=2.0,
+            production_land_m2_per_kg=0.1,
+            production_cost_per_kg=2.0,
+            transport_co2e_kg_per_kg=0.2,
+            transport_energy_kwh_per_kg=0.05,
+        )
+
+        self.bag = Product.objects.create(
+            name='Hybrid Bag',
+            slug='hybrid-bag',
+            purchase_price_usd=50.0,
+            uses_per_year=75,
+            average_lifespan_uses=300,
+            use_water_liters_per_use=2.5,
+            use_cost_per_use=0.1,
+        )
+        ProductComponent.objects.create(product=self.bag, material=self.cotton, weight_grams=400)
+        ProductComponent.objects.create(product=self.bag, material=self.plastic, weight_grams=100)
+
+        self.napkin = Product.objects.create(
+            name='Napkin',
+            slug='napkin',
+            uses_per_year=0,
+            average_lifespan_uses=0,
+        )
+        ProductComponent.objects.create(product=self.napkin, material=self.cotton, weight_grams=25)
+
+        self.empty = Product.objects.create(name='Empty', slug='empty')
+
+    def test_phase_values_match_python_calculation(self):
+        """Engine phase values equal the component walk for every product."""
+        engine = ImpactEngine.for_products()
+        for product in Product.objects.all():
+            expected = product.get_impact_by_phase()
+            actual = engine.phase_values(product.id)
+            for phase in PHASES:
+                for metric in METRICS:
+                    self.assertAlmostEqual(
+                        actual[phase][metric], expected[phase][metric]['value'],
+                        msg=f"{product.slug} {phase}/{metric}",
+                    )
+
+    def test_totals_match_python_calculation(self):
+        """Engine totals equal get_total_impact, including zero usage fallbacks."""
+        engine = ImpactEngine.for_products()
+        for product in Product.objects.all():
+            expected = product.get_total_impact()
+            actual = engine.total_values(product.id)
+            for metric in METRICS:
+                self.assertAlmostEqual(
+                    actual[metric], expected[metric]['value'],
+                    msg=f"{product.slug} {metric}",
+                )
+
+    def test_product_without_components(self):
+        """A product with no components only has use-phase values."""
+        engine = ImpactEngine.for_products()
+        phases = engine.phase_values(self.empty.id)
+        for phase in PHASES:
+            for metric in METRICS:
+                self.assertEqual(phases[phase][metric], 0.0)
+
+    def test_engine_limited_to_queryset(self):
+        """Only products in the given queryset are computed."""
+        engine = ImpactEngine.for_products(Product.objects.filter(slug='napkin'))
+        self.assertEqual(len(engine), 1)
+        self.assertIn(self.napkin.id, engine)
+        self.assertNotIn(self.bag.id, engine)
+        self.assertAlmostEqual(engine.phase_values(self.napkin.id)['production']['greenhouse_gas_kg'], 0.05)
+
+    def test_to_dict_with_engine(self):
+        """to_dict produces the same numbers with and without the engine."""
+        engine = ImpactEngine.for_products()
+        with_engine = self.bag.to_dict(engine=engine)
+        without_engine = self.bag.to_dict()
+        for metric in METRICS:
+            self.assertAlmostEqual(
+                with_engine['impacts'][metric]['value'],
+                without_engine['impacts'][metric]['value'],
+            )
+        self.assertEqual(
+            len(with_engine['impacts_by_phase']['production']['greenhouse_gas_kg']['sources']), 2
+        )
+
+
+class PhaseMetricMatrixTests(TestCase):
+    """Test the array-backed phase × metric result type."""
+
+    def test_arithmetic(self):
+        """Add, scale and apply work elementwise and return new matrices."""
+        a = PhaseMetricMatrix.zeros()
+        a['production', 'water_liters'] = 2.0
+        b = PhaseMetricMatrix.ones()
+
+        total = a + b
+        self.assertEqual(total['production', 'water_liters'], 3.0)
+        self.assertEqual(total['use', 'cost_usd'], 1.0)
+        self.assertEqual(total.scale(2)['production', 'water_liters'], 6.0)
+        self.assertEqual(a['production', 'water_liters'], 2.0)
+
+        multipliers = PhaseMetricMatrix.from_phase_multipliers({
+            'transport': {'greenhouse_gas_kg': 1.25},
+            'unknown_phase': {'water_liters': 9.0},
+        })
+        applied = total.apply(multipliers)
+        self.assertEqual(applied['transport', 'greenhouse_gas_kg'], 1.25)
+        self.assertEqual(applied['production', 'water_liters'], 3.0)
+
+    def test_to_dict_round_trip(self):
+        """to_dict produces the serialized shape and from_nested reads it back."""
+        matrix = PhaseMetricMatrix([float(i) for i in range(20)])
+        data = matrix.to_dict(sources=lambda phase, metric: [phase])
+        self.assertEqual(data['transport']['water_liters'], {'value': 6.0, 'sources': ['transport']})
+        self.assertEqual(matrix.to_dict()['use']['cost_usd'], {'value': 19.0})
+        self.assertEqual(PhaseMetricMatrix.from_nested(data), matrix)
+        self.assertEqual(matrix.upfront(), [15.0, 18.0, 21.0, 24.0, 27.0])
+
+    def test_wrong_size_rejected(self):
+        """The matrix always holds exactly 4 × 5 values."""
+        with self.assertRaises(ValueError):
+            PhaseMetricMatrix([1.0, 2.0])
+
+    def test_option_multiplier_matrix(self):
+        """An option's effects compile to a multiplier matrix."""
+        assumption = Assumption.objects.create(label='Wash frequency', exposed=True)
+        option = AssumptionOption.objects.create(assumption=assumption, option_key='every_2_uses', label='Every 2')
+        AssumptionEffect.objects.create(option=option, phase='use', metric='water_liters', multiplier=0.5)
+        matrix = option.multiplier_matrix()
+        self.assertEqual(matrix['use', 'water_liters'], 0.5)
+        self.assertEqual(matrix['use', 'energy_kwh'], 1.0)
@@ -0,0 +1,77 @@
+"""
+Tests for the deterministic, incremental static export.
+
+Tests verify:
+- Data files are byte-identical across runs and carry no timestamp
+- The manifest holds the export timestamp and a content hash per file
+- Unchanged files are not rewritten and the manifest is left alone
+- Files of deleted posts are removed and reported
+"""
+import hashlib
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.test import TestCase, override_settings
+from posts.models import Post
+from products.models import Material, Product, ProductComponent
+from static_generation.exporter import StaticDataExporter
+
+
+class IncrementalExportTests(TestCase):
+    """Test manifest-driven incremental exports."""
+
+    def setUp(self):
+        """Create a product and two published posts."""
+        cotton = Material.objects.create(name='Cotton', production_co2e_kg_per_kg=2.0)
+        product = Product.objects.create(name='Tote', slug='tote', purchase_price_usd=20.0)
+        ProductComponent.objects.create(product=product, material=cotton, weight_grams=200)
+        self.posts = [
+            Post.objects.create(title=f'Post {i}', slug=f'post-{i}', content='Text', published=True)
+            for i in range(2)
+        ]
+        self.tmpdir = TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.output = Path(self.tmpdir.name)
+
+    def export(self):
+        with override_settings(STATIC_DATA_OUTPUT_DIR=self.tmpdir.name):
+            return StaticDataExporter(uncertainty_draws=0).export_all()
+
+    def test_manifest(self):
+        """Every written file is hashed in the manifest; only it has a timestamp."""
+        changes = self.export()
+        manifest = json.loads((self.output / 'manifest.json').read_text())
+        self.assertIn('export_timestamp', manifest)
+        self.assertEqual(sorted(manifest['files']), changes['written'])
+        self.assertIn('posts/post-0.json', changes['written'])
+        for name, digest in manifest['files'].items():
+            content = (self.output / name).read_bytes()
+            self.assertEqual(hashlib.sha256(content).hexdigest(), digest)
+            self.assertNotIn(b'export_timestamp', content)
+
+    def test_unchanged_rerun(self):
+        """A rerun rewrites nothing, not even the manifest."""
+        first = self.export()
+        before = {path: path.stat().st_mtime_ns for path in self.output.rglob('*.json')}
+        manifest = (self.output / 'manifest.json').read_bytes()
+
+        second = self.export()
+        self.assertEqual(second, {'written': [], 'unchanged': first['written'], 'deleted': []})
+        self.assertEqual({path: path.stat().st_mtime_ns for path in self.output.rglob('*.json')}, before)
+        self.assertEqual((self.output / 'manifest.json').read_bytes(), manifest)
+
+    def test_changed_and_deleted(self):
+        """Only changed files are rewritten; files of deleted posts are removed."""
+        self.export()
+        self.posts[0].title = 'Renamed'
+        self.posts[0].save()
+        self.posts[1].delete()
+
+        changes = self.export()
+        self.assertEqual(changes['written'], ['posts.json', 'posts/post-0.json'])
+        self.assertEqual(changes['deleted'], ['posts/post-1.json'])
+        self.assertIn('products.json', changes['unchanged'])
+        self.assertFalse((self.output / 'posts' / 'post-1.json').exists())
+        manifest = json.loads((self.output / 'manifest.json').read_text())
+        self.assertNotIn('posts/post-1.json', manifest['files'])
@@ -0,0 +1,164 @@
+"""
+Tests for applying internal assumption defaults in the impact calculation.
+
+Tests verify:
+- Product, material and global internal defaults scale the phase values
+- Material multipliers apply per component, only to components of that material
+- The batch engine and the per-product evaluation agree
+- Scenarios select other options and reject unknown assumptions or options
+- Exposed assumptions are left to the frontend
+- Snapshots are recomputed with the multipliers after an assumption edit
+- Serialized component impacts add up to the adjusted phase values
+- Batch-loaded multipliers match per-product ones and are loaded once per list
+- Components zeroed by a multiplier are left out of the sources on every path
+"""
+from unittest import mock
+
+from django.test import TestCase
+from products import assumption_tables
+from products.evaluation import load_multipliers
+from products.impact_engine import MATERIAL_PHASES, METRICS, ImpactEngine
+from products.models import (
+    Assumption,
+    AssumptionEffect,
+    AssumptionOption,
+    Material,
+    Product,
+    ProductComponent,
+    ProductImpactSnapshot,
+)
+from products.snapshots import refresh_stale_snapshots
+
+
+class InternalAssumptionTests(TestCase):
+    """Test internal assumption multipliers in the engine and evaluations."""
+
+    def setUp(self):
+        """Create a two-material product with internal assumptions of every scope."""
+        self.cotton = Material.objects.create(name='Cotton', production_co2e_kg_per_kg=2.0)
+        self.steel = Material.objects.create(name='Steel', production_co2e_kg_per_kg=5.0)
+        self.bag = Product.objects.create(
+            name='Bag', slug='bag', uses_per_year=10, average_lifespan_uses=10, use_water_liters_per_use=1.0
+        )
+        ProductComponent.objects.create(product=self.bag, material=self.cotton, weight_grams=1000)
+        ProductComponent.objects.create(product=self.bag, material=self.steel, weight_grams=1000)
+
+        self._assumption('Crop yield', 'production', 'greenhouse_gas_kg', {'base': 1.5, 'high': 3.0},
+                         material=self.cotton)
+        self._assumption('Wash load', 'use', 'water_liters', {'base': 2.0, 'low': 0.5}, product=self.bag)
+        self._assumption('Grid mix', 'production', 'greenhouse_gas_kg', {'base': 0.5, 'renewable': 0.1})
+
+    def _assumption(self, label, phase, metric, options, exposed=False, **scope):
+        assumption = Assumption.objects.create(
+            label=label, exposed=exposed, default_option_key='base', **scope
+        )
+        for key, multiplier in options.items():
+            option = AssumptionOption.objects.create(assumption=assumption, option_key=key, label=key)
+            AssumptionEffect.objects.create(option=option, phase=phase, metric=metric, multiplier=multiplier)
+        return assumption
+
+    def test_defaults_applied(self):
+        """Material defaults scale their components; product and global ones every cell."""
+        phases = ImpactEngine.for_products().phase_values(self.bag.id)
+        # (1 kg cotton * 2.0 * 1.5 + 1 kg steel * 5.0) * 0.5 global
+        self.assertAlmostEqual(phases['production']['greenhouse_gas_kg'], (3.0 + 5.0) * 0.5)
+        self.assertAlmostEqual(phases['use']['water_liters'], 1.0 * 10 * 2.0)
+
+    def test_engine_matches_evaluation(self):
+        """The batch engine and the Python walk produce the same values and sources."""
+        engine = ImpactEngine.for_products()
+        evaluation = self.bag.evaluate()
+        for phase, metrics in engine.phase_values(self.bag.id).items():
+            for metric, value in metrics.items():
+                self.assertAlmostEqual(evaluation.values[phase, metric], value)
+        for metric, value in engine.total_values(self.bag.id).items():
+            self.assertAlmostEqual(evaluation.totals[metric]['value'], value)
+
+        sources = self.bag.get_impact_by_phase()['production']['greenhouse_gas_kg']['sources']
+        self.assertEqual(sorted(source['value'] for source in sources), [1.5, 2.5])
+        self.assertIn('(assumptions)', sources[0]['calculation'])
+
+    def test_scenario(self):
+        """Scenarios override defaults by key or id and validate their selections."""
+        grid = Assumption.objects.get(label='Grid mix')
+        for scenario in [
+            {'grid_mix': 'renewable', 'crop_yield': 'high'},
+            {grid.id: 'renewable', 'crop_yield': 'high'},
+        ]:
+            phases = ImpactEngine.for_products(scenario=scenario).phase_values(self.bag.id)
+            self.assertAlmostEqual(phases['production']['greenhouse_gas_kg'], (6.0 + 5.0) * 0.1)
+            totals = self.bag.get_total_impact(scenario=scenario, include_sources=False)
+            self.assertAlmostEqual(
+                totals['greenhouse_gas_kg']['value'],
+                ImpactEngine.for_products(scenario=scenario).total_values(self.bag.id)['greenhouse_gas_kg'],
+            )
+
+        with self.assertRaises(ValueError):
+            ImpactEngine.for_products(scenario={'grid_mix': 'coal'})
+        with self.assertRaises(ValueError):
+            ImpactEngine.for_products(scenario={'unknown': 'base'})
+        with self.assertRaises(ValueError):
+            self.bag.evaluate(snapshot=ProductImpactSnapshot(), scenario={'grid_mix': 'renewable'})
+
+    def test_exposed_not_applied(self):
+        """Exposed assumptions stay at 1 in the backend and cannot be scenario-selected."""
+        self._assumption('Trip distance', 'use', 'water_liters', {'base': 4.0, 'far': 8.0}, exposed=True)
+        phases = ImpactEngine.for_products().phase_values(self.bag.id)
+        self.assertAlmostEqual(phases['use']['water_liters'], 20.0)
+        with self.assertRaises(ValueError):
+            ImpactEngine.for_products(scenario={'trip_distance': 'far'})
+
+    def test_snapshot_refreshed(self):
+        """Snapshots include the multipliers and follow option edits."""
+        def production_ghg():
+            refresh_stale_snapshots()
+            return ProductImpactSnapshot.objects.get(product=self.bag).production_greenhouse_gas_kg
+
+        self.assertAlmostEqual(production_ghg(), 4.0)
+        effect = AssumptionEffect.objects.get(option__option_key='base', option__assumption__label='Grid mix')
+        effect.multiplier = 1.0
+        effect.save()
+        self.assertAlmostEqual(production_ghg(), 8.0)
+
+    def test_components_add_up(self):
+        """Component impacts carry the multipliers, with or without a snapshot."""
+        refresh_stale_snapshots()
+        snapshot = ProductImpactSnapshot.objects.get(product=self.bag)
+        for data in [self.bag.to_dict(), self.bag.to_dict(snapshot=snapshot)]:
+            by_material = {component['material_name']: component['impacts'] for component in data['components']}
+            # 1 kg cotton * 2.0 * 1.5 crop yield * 0.5 grid mix, 1 kg steel * 5.0 * 0.5
+            self.assertAlmostEqual(by_material['Cotton']['greenhouse_gas_kg'], 1.5)
+            self.assertAlmostEqual(by_material['Steel']['greenhouse_gas_kg'], 2.5)
+            for metric in METRICS:
+                self.assertAlmostEqual(
+                    sum(impacts[metric] for impacts in by_material.values()),
+                    sum(data['impacts_by_phase'][phase][metric]['value'] for phase in MATERIAL_PHASES),
+                )
+
+    def test_batch_multipliers(self):
+        """One catalog pass serves every product, with the same multipliers as a lone product."""
+        tote = Product.objects.create(name='Tote', slug='tote')
+        ProductComponent.objects.create(product=tote, material=self.steel, weight_grams=500)
+        products = Product.objects.prefetch_related('components__material')
+        multipliers = load_multipliers(products)
+        for product in products:
+            self.assertEqual(product.to_dict(multipliers=multipliers[product.id]), product.to_dict())
+
+        refresh_stale_snapshots()
+        with mock.patch.object(
+            assumption_tables, 'internal_multipliers', wraps=assumption_tables.internal_multipliers
+        ) as loaded:
+            response = self.client.get('/api/products/')
+        self.assertEqual(len(response.json()['products']), 2)
+        loaded.assert_called_once()
+
+    def test_zeroed_sources_match(self):
+        """Computed, engine and snapshot provenance all drop a component zeroed by a multiplier."""
+        self._assumption('Offset', 'production', 'greenhouse_gas_kg', {'base': 0.0}, material=self.steel)
+        refresh_stale_snapshots()
+        bag = Product.objects.get(pk=self.bag.pk)
+        computed = bag.get_impact_by_phase()
+        sources = computed['production']['greenhouse_gas_kg']['sources']
+        self.assertEqual([source['item'] for source in sources], ['Cotton'])
+        self.assertEqual(bag.evaluate(engine=ImpactEngine.for_products()).phases, computed)
+        self.assertEqual(ProductImpactSnapshot.objects.get(product=bag).impacts_by_phase, computed)
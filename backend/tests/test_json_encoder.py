@@ -0,0 +1,112 @@
+"""
+Tests for the pluggable JSON encoder.
+
+Tests verify:
+- Every installed backend writes the same bytes as the stdlib encoder
+- Datetimes, decimals and numpy scalars are encoded like JsonResponse does
+- Unknown or uninstalled backends are rejected
+- API views return the same JSON whichever backend is configured
+- The benchmark command times every installed backend
+"""
+import datetime
+import json
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+import numpy as np
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import SimpleTestCase, TestCase, override_settings
+from products import json_encoder
+from products.json_encoder import available_encoders, get_encoder
+from products.models import Material, Product, ProductComponent
+
+
+class EncoderTests(SimpleTestCase):
+    """Test the encoder backends."""
+
+    data = {
+        'name': 'Crème',
+        'values': [0.1, 1.5, -3, 2.0, None, True],
+        'nested': {'b': [], 'a': {}, 'c': {'z': 'line\nbreak'}},
+    }
+
+    def tearDown(self):
+        json_encoder._load.cache_clear()
+
+    def test_backends_match_stdlib(self):
+        """Indented, sorted and compact output are byte-identical across backends."""
+        stdlib = get_encoder('stdlib')
+        for name in available_encoders():
+            for kwargs in ({}, {'sort_keys': True}, {'indent': True, 'sort_keys': True}):
+                with self.subTest(encoder=name, **kwargs):
+                    self.assertEqual(get_encoder(name).encode(self.data, **kwargs), stdlib.encode(self.data, **kwargs))
+        self.assertEqual(
+            stdlib.encode(self.data, indent=True, sort_keys=True),
+            json.dumps(self.data, indent=2, sort_keys=True, ensure_ascii=False).encode('utf-8'),
+        )
+
+    def test_django_types(self):
+        """Types JSON has no notation for are encoded like DjangoJSONEncoder does."""
+        data = {
+            'at': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456),
+            'price': Decimal('12.50'),
+            'share': np.float64(0.25),
+        }
+        expected = json.loads(json.dumps({**data, 'share': 0.25}, cls=DjangoJSONEncoder))
+        for name in available_encoders():
+            with self.subTest(encoder=name):
+                self.assertEqual(json.loads(get_encoder(name).encode(data)), expected)
+
+    def test_invalid_backend(self):
+        """Unknown names and missing packages raise ImproperlyConfigured."""
+        with override_settings(JSON_ENCODER='bogus'):
+            with self.assertRaises(ImproperlyConfigured):
+                get_encoder()
+        with mock.patch.dict(json_encoder.BACKENDS, {'msgspec': (json_encoder.MsgspecEncoder, None)}):
+            with self.assertRaises(ImproperlyConfigured):
+                get_encoder('msgspec')
+
+    def test_auto_prefers_fastest(self):
+        """'auto' picks the first installed backend, stdlib last."""
+        self.assertEqual(get_encoder('auto').name, available_encoders()[0])
+        self.assertEqual(available_encoders()[-1], 'stdlib')
+
+
+class EncodedViewTests(TestCase):
+    """Test API responses through the configured encoder."""
+
+    def setUp(self):
+        """Create a product with a material."""
+        cotton = Material.objects.create(name='Cotton', production_co2e_kg_per_kg=2.0)
+        product = Product.objects.create(name='Tote', slug='tote', purchase_price_usd=12.5)
+        ProductComponent.objects.create(product=product, material=cotton, weight_grams=200)
+
+    def tearDown(self):
+        json_encoder._load.cache_clear()
+
+    def test_views_match_across_backends(self):
+        """List, detail and error responses do not depend on the backend."""
+        urls = ['/api/products/', '/api/products/tote/', '/api/products/missing/', '/api/products/?sort=bogus']
+        responses = {}
+        for name in available_encoders():
+            with override_settings(JSON_ENCODER=name):
+                responses[name] = [self.client.get(url) for url in urls]
+        for name, results in responses.items():
+            for response, expected in zip(results, responses['stdlib']):
+                with self.subTest(encoder=name, url=response.request['PATH_INFO']):
+                    self.assertEqual(response['Content-Type'], 'application/json')
+                    self.assertEqual(response.status_code, expected.status_code)
+                    self.assertEqual(response.json(), expected.json())
+        self.assertEqual([r.status_code for r in responses['stdlib']], [200, 200, 404, 400])
+
+    def test_benchmark_command(self):
+        """The benchmark reports every installed backend."""
+        stdout = StringIO()
+        call_command('benchmark_json', '--repeat', '1', stdout=stdout)
+        output = stdout.getvalue()
+        self.assertIn('1 products', output)
+        for name in available_encoders():
+            self.assertIn(name, output)
@@ -0,0 +1,159 @@
+"""
+Tests for the process-pool static export.
+
+Tests verify:
+- Exports with worker processes are byte-identical to in-process exports
+- Workers receive the exporter pickled, with shared engines precomputed
+- Chunk results are merged in export order
+- The pool is shut down when the export finishes
+- A real spawned pool, with Django set up in each worker, matches a serial export
+"""
+import os
+import pickle
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import pytest
+from django.test import SimpleTestCase, TestCase, override_settings
+from posts.models import Post
+from products.models import Material, Product, ProductComponent
+from static_generation import workers
+from static_generation.exporter import StaticDataExporter
+
+
+class InProcessPool:
+    """
+    Stand-in for ProcessPoolExecutor that runs tasks in this process (the
+    test database is not visible to other processes) but pickles
+    everything crossing the process boundary, as a real pool would.
+    """
+
+    instances = []
+
+    def __init__(self, max_workers, mp_context, initializer, initargs):
+        self.max_workers = max_workers
+        self.shut_down = False
+        initializer(*initargs)
+        InProcessPool.instances.append(self)
+
+    def map(self, fn, *iterables):
+        for args in zip(*iterables):
+            yield pickle.loads(pickle.dumps(fn(*pickle.loads(pickle.dumps(args)))))
+
+    def shutdown(self):
+        self.shut_down = True
+
+
+class ParallelExportTests(TestCase):
+    """Test exports split across worker processes."""
+
+    def setUp(self):
+        """Create enough products and posts for several chunks."""
+        cotton = Material.objects.create(name='Cotton', production_co2e_kg_per_kg=2.0)
+        for i in range(7):
+            product = Product.objects.create(name=f'Product {i}', slug=f'product-{i}', uses_per_year=i + 1)
+            ProductComponent.objects.create(product=product, material=cotton, weight_grams=10 * (i + 1))
+        for i in range(3):
+            Post.objects.create(title=f'Post {i}', slug=f'post-{i}', content='Text', published=True)
+        InProcessPool.instances = []
+        self.addCleanup(setattr, workers, '_exporter', None)
+
+    def export(self, **options):
+        tmpdir = TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        with override_settings(STATIC_DATA_OUTPUT_DIR=tmpdir.name):
+            with mock.patch('static_generation.exporter.ProcessPoolExecutor', InProcessPool):
+                StaticDataExporter(uncertainty_draws=20, chunk_size=2, ndjson=True, **options).export_all()
+        output = Path(tmpdir.name)
+        return {
+            path.relative_to(output).as_posix(): path.read_bytes()
+            for path in output.rglob('*') if path.is_file() and path.name != 'manifest.json'
+        }
+
+    def test_matches_serial_export(self):
+        """Every file is identical with and without workers."""
+        serial = self.export()
+        self.assertEqual(InProcessPool.instances, [])
+        parallel = self.export(jobs=3)
+        self.assertEqual(sorted(parallel), sorted(serial))
+        for name, content in serial.items():
+            self.assertEqual(parallel[name], content, name)
+
+    def test_pool_lifecycle(self):
+        """One pool serves products and posts and is shut down afterwards."""
+        self.export(jobs=3)
+        self.assertEqual(len(InProcessPool.instances), 1)
+        pool = InProcessPool.instances[0]
+        self.assertEqual(pool.max_workers, 3)
+        self.assertTrue(pool.shut_down)
+        # The worker's exporter is a copy with the engines already computed.
+        self.assertIsNotNone(workers._exporter._uncertainty)
+        self.assertIsNotNone(workers._exporter._alternatives)
+        self.assertIsNone(workers._exporter._pool)
+
+
+SPAWN_SETTINGS = """
+import os
+from the_full_price.settings import *
+DATABASES = {'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': os.environ['EXPORT_TEST_DB']}}
+STATIC_DATA_OUTPUT_DIR = os.environ['EXPORT_TEST_OUTPUT']
+"""
+
+SPAWN_SEED = """
+from posts.models import Post
+from products.models import Material, Product, ProductComponent
+cotton = Material.objects.create(name='Cotton', production_co2e_kg_per_kg=2.0)
+for i in range(7):
+    product = Product.objects.create(name=f'Product {i}', slug=f'product-{i}', uses_per_year=i + 1)
+    ProductComponent.objects.create(product=product, material=cotton, weight_grams=10 * (i + 1))
+for i in range(3):
+    Post.objects.create(title=f'Post {i}', slug=f'post-{i}', content='Text', published=True)
+"""
+
+
+@pytest.mark.slow
+class SpawnedPoolExportTests(SimpleTestCase):
+    """
+    Run exportstatic with a real process pool. Spawned workers cannot see
+    the in-memory test database, so this runs the commands in subprocesses
+    against a throwaway SQLite file.
+    """
+
+    def setUp(self):
+        tmpdir = TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.root = Path(tmpdir.name)
+        (self.root / 'spawn_settings.py').write_text(SPAWN_SETTINGS)
+        backend = Path(__file__).resolve().parent.parent
+        self.env = {
+            **os.environ,
+            'PYTHONPATH': os.pathsep.join([str(self.root), str(backend), str(backend / 'the_full_price')]),
+            'DJANGO_SETTINGS_MODULE': 'spawn_settings',
+            'EXPORT_TEST_DB': str(self.root / 'db.sqlite3'),
+            'EXPORT_TEST_OUTPUT': str(self.root / 'unused'),
+        }
+        self.manage('migrate', '--no-input')
+        self.manage('shell', '-c', SPAWN_SEED)
+
+    def manage(self, *args, output=None):
+        env = dict(self.env, EXPORT_TEST_OUTPUT=str(output)) if output else self.env
+        subprocess.run(
+            [sys.executable, '-m', 'django', *args], env=env, check=True, capture_output=True, timeout=300
+        )
+
+    def export(self, jobs):
+        output = self.root / f'jobs-{jobs}'
+        self.manage('exportstatic', '--draws', '20', '--chunk-size', '2', '--jobs', str(jobs), output=output)
+        return {
+            path.relative_to(output).as_posix(): path.read_bytes()
+            for path in output.rglob('*') if path.is_file() and path.name != 'manifest.json'
+        }
+
+    def test_spawned_workers_match_serial_export(self):
+        """Two spawned workers write the same files as the in-process export."""
+        serial = self.export(jobs=1)
+        self.assertIn('products/product-6.json', serial)
+        self.assertEqual(self.export(jobs=2), serial)
@@ -0,0 +1,73 @@
+"""
+Tests for the per-product files and the slim product index.
+
+Tests verify:
+- Each product is written to products/{slug}.json with the full detail
+- The index carries only list-page fields and the five total values
+- Files of deleted products are removed on the next export
+"""
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.test import TestCase, override_settings
+from products.impact_engine import METRICS
+from products.models import Material, Product, ProductComponent
+from static_generation.exporter import StaticDataExporter
+
+
+class ProductShardTests(TestCase):
+    """Test sharded product output."""
+
+    def setUp(self):
+        """Create two products sharing a material."""
+        cotton = Material.objects.create(name='Cotton', production_co2e_kg_per_kg=2.0)
+        self.products = []
+        for name, grams in [('Tote', 200), ('Napkin', 30)]:
+            product = Product.objects.create(
+                name=name, slug=name.lower(), description=f'A {name.lower()}', purchase_price_usd=5.0
+            )
+            ProductComponent.objects.create(product=product, material=cotton, weight_grams=grams)
+            self.products.append(product)
+        self.tmpdir = TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.output = Path(self.tmpdir.name)
+
+    def export(self):
+        with override_settings(STATIC_DATA_OUTPUT_DIR=self.tmpdir.name):
+            return StaticDataExporter(uncertainty_draws=0).export_all()
+
+    def read(self, name):
+        return json.loads((self.output / name).read_text())
+
+    def test_shards_match_products_file(self):
+        """Every shard holds the same entry as products.json."""
+        self.export()
+        products = self.read('products.json')['products']
+        self.assertEqual(sorted(path.name for path in (self.output / 'products').iterdir()),
+                         ['napkin.json', 'tote.json'])
+        for product in products:
+            self.assertEqual(self.read(f"products/{product['slug']}.json"), {'product': product})
+
+    def test_index(self):
+        """The index lists summaries with plain total values."""
+        self.export()
+        products = {product['slug']: product for product in self.read('products.json')['products']}
+        index = self.read('products-index.json')['products']
+        self.assertEqual([entry['slug'] for entry in index], ['napkin', 'tote'])
+        tote = index[1]
+        self.assertEqual(
+            sorted(tote), ['description', 'id', 'impacts', 'name', 'purchase_price_usd', 'slug']
+        )
+        self.assertEqual(sorted(tote['impacts']), sorted(METRICS))
+        for metric in METRICS:
+            self.assertEqual(tote['impacts'][metric], products['tote']['impacts'][metric]['value'])
+
+    def test_deleted_product(self):
+        """A deleted product's file is removed and it leaves the index."""
+        self.export()
+        self.products[0].delete()
+        changes = self.export()
+        self.assertIn('products/tote.json', changes['deleted'])
+        self.assertFalse((self.output / 'products' / 'tote.json').exists())
+        self.assertEqual([entry['slug'] for entry in self.read('products-index.json')['products']], ['napkin'])
@@ -6,10 +6,26 @@ Tests verify:
 - Product impact calculations are accurate
 - ProductComponent calculations work correctly
 - API endpoints return correct data
+- Slugs of the product API's collection routes are reserved, in validation
+  and in the database
 """
 import pytest
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 from django.test import TestCase
-from products.models import Material, Product, ProductComponent
+from products import urls as product_urls
+from products.impact_engine import METRICS, PHASES
+from products.models import (
+    Assumption,
+    AssumptionEffect,
+    AssumptionOption,
+    Material,
+    Product,
+    ProductComponent,
+    ProductImpactSnapshot,
+    RESERVED_PRODUCT_SLUGS,
+)
+from products.snapshots import refresh_stale_snapshots
 
 
 class MaterialModelTests(TestCase):
@@ -264,3 +280,209 @@ class ProductAPITests(TestCase):
         """Test product detail endpoint with non-existent slug."""
         response = self.client.get('/api/products/nonexistent/')
         self.assertEqual(response.status_code, 404)
+
+
+class ProductEvaluationTests(TestCase):
+    """Test that a product is evaluated once per serialization."""
+
+    def setUp(self):
+        """Create test fixtures."""
+        self.product = Product.objects.create(
+            name='Lunch Box',
+            slug='lunch-box',
+            uses_per_year=200,
+            average_lifespan_uses=1000,
+            use_water_liters_per_use=1.5,
+        )
+        for index in range(3):
+            material = Material.objects.create(
+                name=f'Material {index}',
+                production_co2e_kg_per_kg=1.0 + index,
+                transport_co2e_kg_per_kg=0.1,
+            )
+            ProductComponent.objects.create(
+                product=self.product,
+                material=material,
+                weight_grams=100 * (index + 1),
+            )
+
+    def test_totals_derived_from_phases(self):
+        """Totals reuse the phase breakdown of the same evaluation."""
+        evaluation = self.product.evaluate()
+        phases = evaluation.phases
+        upfront = sum(
+            phases[phase]['greenhouse_gas_kg']['value']
+            for phase in ('production', 'transport', 'end_of_life')
+        )
+        self.assertAlmostEqual(
+            evaluation.totals['greenhouse_gas_kg']['value'],
+            upfront / 1000 * 200,
+        )
+        self.assertAlmostEqual(evaluation.totals['water_liters']['value'], 300.0)
+
+    def test_values_only_mode(self):
+        """include_sources=False returns the same values without provenance."""
+        full = self.product.evaluate()
+        values_only = self.product.evaluate(include_sources=False)
+        for metric in METRICS:
+            self.assertEqual(values_only.totals[metric], {'value': full.totals[metric]['value']})
+            for phase in PHASES:
+                self.assertEqual(
+                    values_only.phases[phase][metric], {'value': full.phases[phase][metric]['value']}
+                )
+
+    def test_sources_built_lazily(self):
+        """Reading values does not build any provenance."""
+        evaluation = self.product.evaluate()
+        evaluation.total_values
+        self.assertIsNone(evaluation._phases)
+        self.assertIsNone(evaluation._totals)
+        sources = evaluation.phase_sources('production', 'greenhouse_gas_kg')
+        self.assertEqual([source['item'] for source in sources], ['Material 0', 'Material 1', 'Material 2'])
+        self.assertEqual(sources[0]['calculation'], '0.1 kg * 1')
+
+    def test_values_only_endpoint(self):
+        """?sources=0 drops provenance from the API response."""
+        response = self.client.get('/api/products/lunch-box/?sources=0')
+        impacts = response.json()['impacts']
+        self.assertNotIn('sources', impacts['greenhouse_gas_kg'])
+        self.assertAlmostEqual(impacts['water_liters']['value'], 300.0)
+
+    def test_to_dict_query_count_is_fixed(self):
+        """Components and materials are loaded once: one query, plus assumptions
+        and the assumption catalog version check."""
+        product = Product.objects.get(pk=self.product.pk)
+        with self.assertNumQueries(3):
+            data = product.to_dict()
+        self.assertEqual(len(data['components']), 3)
+        self.assertEqual(
+            len(data['impacts_by_phase']['production']['greenhouse_gas_kg']['sources']), 3
+        )
+
+
+class ProductQuerySetTests(TestCase):
+    """Test database-side impact aggregation."""
+
+    def setUp(self):
+        """Create test fixtures."""
+        self.steel = Material.objects.create(
+            name='Steel',
+            production_co2e_kg_per_kg=2.3,
+            production_energy_kwh_per_kg=5.5,
+            transport_co2e_kg_per_kg=0.7,
+            end_of_life_cost_per_kg=1.1,
+        )
+        self.rubber = Material.objects.create(
+            name='Rubber',
+            production_co2e_kg_per_kg=1.37,
+            production_water_liters_per_kg=3,
+        )
+        self.bottle = Product.objects.create(
+            name='Bottle',
+            slug='bottle',
+            uses_per_year=37,
+            average_lifespan_uses=0,
+            use_cost_per_use=0.13,
+        )
+        ProductComponent.objects.create(product=self.bottle, material=self.steel, weight_grams=123)
+        ProductComponent.objects.create(product=self.bottle, material=self.rubber, weight_grams=77)
+        self.cup = Product.objects.create(name='Cup', slug='cup', uses_per_year=365, average_lifespan_uses=1)
+        ProductComponent.objects.create(product=self.cup, material=self.rubber, weight_grams=10)
+        self.empty = Product.objects.create(name='Empty', slug='empty')
+
+    def test_annotations_match_python_calculation(self):
+        """Annotations equal get_impact_by_phase and get_total_impact exactly."""
+        with self.assertNumQueries(0):
+            queryset = Product.objects.with_impacts()
+        with self.assertNumQueries(1):
+            products = list(queryset)
+        for product in products:
+            totals = product.get_total_impact()
+            phases = product.get_impact_by_phase()
+            for metric in METRICS:
+                self.assertEqual(getattr(product, f'total_{metric}'), totals[metric]['value'])
+                for phase in PHASES:
+                    self.assertEqual(
+                        getattr(product, f'{phase}_{metric}'), phases[phase][metric]['value']
+                    )
+
+    def test_annotations_match_with_internal_assumptions(self):
+        """Annotations equal the Python values for many components and an internal default."""
+        glass = Material.objects.create(
+            name='Glass', production_co2e_kg_per_kg=0.91, transport_co2e_kg_per_kg=0.17,
+            production_water_liters_per_kg=7.3,
+        )
+        cork = Material.objects.create(name='Cork', production_co2e_kg_per_kg=0.33, end_of_life_cost_per_kg=0.07)
+        for i in range(20):
+            product = Product.objects.create(
+                name=f'Jar {i}', slug=f'jar-{i}', uses_per_year=3 + i / 7, average_lifespan_uses=11 + i,
+                use_water_liters_per_use=0.1 * i,
+            )
+            for j, material in enumerate([self.steel, self.rubber, glass, cork]):
+                ProductComponent.objects.create(product=product, material=material, weight_grams=13.7 * (i + j + 1))
+        assumption = Assumption.objects.create(
+            label='Rubber sourcing', exposed=False, default_option_key='base', material=self.rubber
+        )
+        option = AssumptionOption.objects.create(assumption=assumption, option_key='base', label='Base')
+        AssumptionEffect.objects.create(option=option, phase='production', metric='greenhouse_gas_kg', multiplier=1.3)
+
+        # Building the queryset leaves stale snapshots alone; callers refresh them.
+        Product.objects.with_impacts()
+        self.assertTrue(ProductImpactSnapshot.objects.get(product=self.cup).is_stale)
+        refresh_stale_snapshots()
+
+        for product in Product.objects.with_impacts():
+            totals = product.get_total_impact()
+            phases = product.get_impact_by_phase()
+            for metric in METRICS:
+                self.assertEqual(getattr(product, f'total_{metric}'), totals[metric]['value'])
+                for phase in PHASES:
+                    self.assertEqual(getattr(product, f'{phase}_{metric}'), phases[phase][metric]['value'])
+        cup = Product.objects.with_impacts().get(slug='cup')
+        self.assertAlmostEqual(cup.production_greenhouse_gas_kg, 0.01 * 1.37 * 1.3)
+
+    def test_filter_by_impact(self):
+        """Annotated totals can be filtered on in the database."""
+        slugs = Product.objects.with_impacts().filter(total_greenhouse_gas_kg__gt=0).values_list('slug', flat=True)
+        self.assertEqual(sorted(slugs), ['bottle', 'cup'])
+
+    def test_product_list_sorted_by_metric(self):
+        """The list endpoint can sort by annualized impact."""
+        response = self.client.get('/api/products/?sort=-greenhouse_gas_kg')
+        self.assertEqual(response.status_code, 200)
+        slugs = [product['slug'] for product in response.json()['products']]
+        self.assertEqual(slugs, ['bottle', 'cup', 'empty'])
+
+    def test_product_list_unknown_sort_metric(self):
+        """Sorting by an unknown metric is rejected."""
+        response = self.client.get('/api/products/?sort=happiness')
+        self.assertEqual(response.status_code, 400)
+
+
+class ReservedSlugTests(TestCase):
+    """Test that product slugs cannot shadow collection routes."""
+
+    def test_route_slugs_rejected(self):
+        """Validation rejects the reserved slugs and accepts others."""
+        for slug in RESERVED_PRODUCT_SLUGS:
+            with self.assertRaises(ValidationError):
+                Product(name=slug, slug=slug).full_clean()
+        Product(name='Top hat', slug='top-hat').full_clean()
+
+    def test_route_slugs_rejected_by_database(self):
+        """Writes that skip validation are stopped by the check constraint."""
+        for slug in RESERVED_PRODUCT_SLUGS:
+            with self.assertRaises(IntegrityError), transaction.atomic():
+                Product.objects.create(name=slug, slug=slug)
+        product = Product.objects.create(name='Top hat', slug='top-hat')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Product.objects.filter(pk=product.pk).update(slug='top')
+
+    def test_every_static_route_reserved(self):
+        """Each fixed one-segment route next to <slug>/ is in the reserved list."""
+        routes = {
+            str(pattern.pattern).rstrip('/')
+            for pattern in product_urls.urlpatterns
+            if '<' not in str(pattern.pattern) and str(pattern.pattern).count('/') == 1
+        }
+        self.assertEqual(routes, set(RESERVED_PRODUCT_SLUGS))
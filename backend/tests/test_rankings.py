@@ -0,0 +1,144 @@
+"""
+Tests for per-metric product rankings.
+
+Tests verify:
+- Top-k lists are ordered by total or phase value with ties broken by id
+- Rankings follow material edits and recompute stale snapshots first
+- The freshness check reads only the snapshots' stale index
+- Products loaded from fixtures are ranked once their snapshot is recomputed
+- The top-k endpoint validates its parameters
+- The exported rankings match the top-k queries
+"""
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core import serializers
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from products.models import (
+    Assumption,
+    Material,
+    Product,
+    ProductComponent,
+    ProductImpactSnapshot,
+)
+from products.rankings import build_rankings, top_products
+from static_generation.exporter import StaticDataExporter
+
+
+class RankingTests(TestCase):
+    """Test top-k queries and the exported ranking index."""
+
+    def setUp(self):
+        """Create three products with distinct impacts."""
+        self.cotton = Material.objects.create(
+            name='Cotton', production_co2e_kg_per_kg=2.0, transport_co2e_kg_per_kg=0.1
+        )
+        self.steel = Material.objects.create(
+            name='Steel', production_co2e_kg_per_kg=5.0, transport_co2e_kg_per_kg=0.5
+        )
+        self.products = {}
+        for name, material, grams in [
+            ('Tote', self.cotton, 200),
+            ('Bottle', self.steel, 300),
+            ('Napkin', self.cotton, 30),
+        ]:
+            product = Product.objects.create(
+                name=name, slug=name.lower(), uses_per_year=10, average_lifespan_uses=10
+            )
+            ProductComponent.objects.create(product=product, material=material, weight_grams=grams)
+            self.products[name.lower()] = product
+
+    def slugs(self, *args, **kwargs):
+        return [snapshot.product.slug for snapshot, _ in top_products(*args, **kwargs)]
+
+    def test_total_and_phase_order(self):
+        """Totals and single phases are ranked independently."""
+        self.assertEqual(self.slugs('greenhouse_gas_kg'), ['napkin', 'tote', 'bottle'])
+        self.assertEqual(self.slugs('greenhouse_gas_kg', k=1, descending=True), ['bottle'])
+        self.assertEqual(self.slugs('greenhouse_gas_kg', phase='transport'), ['napkin', 'tote', 'bottle'])
+
+        _, value = top_products('greenhouse_gas_kg', k=1, phase='production')[0]
+        self.assertAlmostEqual(value, 0.03 * 2.0)
+
+        # Every product has zero water: ties fall back to product id.
+        ids = sorted(product.id for product in self.products.values())
+        ranked = [snapshot.product_id for snapshot, _ in top_products('water_liters')]
+        self.assertEqual(ranked, ids)
+
+    def test_query_count(self):
+        """A top-k read is a freshness check plus one indexed query."""
+        with self.assertNumQueries(2):
+            self.slugs('cost_usd', k=2)
+
+    def test_freshness_check_reads_stale_index(self):
+        """With nothing stale, a top-k read never scans the products."""
+        with CaptureQueriesContext(connection) as queries:
+            self.slugs('cost_usd', k=1)
+        check = queries[0]['sql']
+        self.assertIn('"products_productimpactsnapshot"."is_stale"', check)
+        self.assertNotIn('products_product"', check)
+        self.assertNotIn('JOIN', check)
+
+    def test_fixture_products_ranked(self):
+        """A product loaded from a fixture gets a stale snapshot, recomputed on read."""
+        now = timezone.now()
+        cup = Product(
+            name='Cup', slug='cup', uses_per_year=10, average_lifespan_uses=10, created_at=now, updated_at=now
+        )
+        component = ProductComponent(material=self.steel, weight_grams=1000)
+        cup.pk = component.pk = 999
+        component.product_id = cup.pk
+        for obj in serializers.deserialize('json', serializers.serialize('json', [cup, component])):
+            obj.save()
+        self.assertTrue(ProductImpactSnapshot.objects.get(product_id=999).is_stale)
+        self.assertEqual(self.slugs('greenhouse_gas_kg', k=1, descending=True), ['cup'])
+
+    def test_rankings_follow_edits(self):
+        """Material edits reorder the rankings; stale snapshots are recomputed first."""
+        self.cotton.production_co2e_kg_per_kg = 100.0
+        self.cotton.save()
+        self.assertEqual(self.slugs('greenhouse_gas_kg'), ['bottle', 'napkin', 'tote'])
+
+        Assumption.objects.create(product=self.products['tote'], label='Recycled fibre')
+        snapshot = ProductImpactSnapshot.objects.get(product=self.products['tote'])
+        self.assertTrue(snapshot.is_stale)
+        snapshot.total_greenhouse_gas_kg = 0.0
+        snapshot.save()
+
+        self.assertEqual(self.slugs('greenhouse_gas_kg'), ['bottle', 'napkin', 'tote'])
+        self.assertFalse(ProductImpactSnapshot.objects.get(product=self.products['tote']).is_stale)
+
+    def test_endpoint(self):
+        """The endpoint returns ranked entries and rejects bad parameters."""
+        response = self.client.get('/api/products/top/?metric=greenhouse_gas_kg&k=2&phase=production')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['phase'], 'production')
+        self.assertEqual([entry['slug'] for entry in data['products']], ['napkin', 'tote'])
+        self.assertEqual(data['products'][0]['rank'], 1)
+        self.assertAlmostEqual(data['products'][0]['value'], 0.03 * 2.0)
+        self.assertIn('cost_usd', data['products'][0]['impacts'])
+
+        for query in ['', 'metric=nope', 'metric=cost_usd&k=0', 'metric=cost_usd&k=x',
+                      'metric=cost_usd&phase=nope', 'metric=cost_usd&order=up']:
+            self.assertEqual(self.client.get(f'/api/products/top/?{query}').status_code, 400, query)
+
+    def test_export(self):
+        """The exported index holds the same order as the top-k queries."""
+        with TemporaryDirectory() as tmpdir:
+            with override_settings(STATIC_DATA_OUTPUT_DIR=tmpdir):
+                StaticDataExporter().export_rankings()
+                exported = json.loads((Path(tmpdir) / 'rankings.json').read_text())
+
+        self.assertEqual(exported, build_rankings())
+        for scope in exported['scopes']:
+            phase = None if scope == 'total' else scope
+            order = exported['rankings']['greenhouse_gas_kg'][scope]
+            self.assertEqual(
+                [exported['products'][index] for index in order],
+                self.slugs('greenhouse_gas_kg', phase=phase),
+            )
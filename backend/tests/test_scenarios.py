@@ -0,0 +1,132 @@
+"""
+Tests for precomputed assumption scenarios.
+
+Tests verify:
+- Multipliers follow the frontend selection semantics
+- The default combination reproduces the exported impacts
+- Full cubes and factorized tables give the same numbers
+- The exporter writes scenarios for every product
+"""
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.test import TestCase, override_settings
+from products.impact_engine import METRICS, PHASES
+from products.models import (
+    Assumption,
+    AssumptionEffect,
+    AssumptionOption,
+    Material,
+    Product,
+    ProductComponent,
+)
+from products.phase_matrix import cell_index
+from products.scenarios import build_scenarios, selection_multipliers
+from static_generation.exporter import StaticDataExporter
+
+
+class AssumptionScenarioTests(TestCase):
+    """Test scenario cubes and factorized tables."""
+
+    def setUp(self):
+        """Create test fixtures."""
+        cotton = Material.objects.create(
+            name='Cotton',
+            production_co2e_kg_per_kg=2.0,
+            transport_co2e_kg_per_kg=0.5,
+        )
+        self.napkin = Product.objects.create(
+            name='Cloth Napkin',
+            slug='cloth-napkin',
+            uses_per_year=250,
+            average_lifespan_uses=500,
+            use_water_liters_per_use=0.4,
+            use_co2e_kg_per_use=0.01,
+        )
+        ProductComponent.objects.create(product=self.napkin, material=cotton, weight_grams=30)
+
+        self._assumption(
+            product=self.napkin,
+            label='Wash frequency',
+            default='every_use',
+            options={'every_use': 1.0, 'every_2_uses': 0.5, 'every_4_uses': 0.25},
+            cells=[('use', 'water_liters'), ('use', 'greenhouse_gas_kg')],
+        )
+        self._assumption(
+            product=None,
+            label='Grocery trip distance',
+            default='moderate',
+            options={'nearby': 0.8, 'moderate': 1.0, 'far': 1.25},
+            cells=[('transport', 'greenhouse_gas_kg')],
+        )
+
+    def _assumption(self, product, label, default, options, cells):
+        assumption = Assumption.objects.create(
+            product=product, label=label, exposed=True, default_option_key=default
+        )
+        for sort_order, (key, multiplier) in enumerate(options.items()):
+            option = AssumptionOption.objects.create(
+                assumption=assumption, option_key=key, label=key, sort_order=sort_order
+            )
+            for phase, metric in cells:
+                AssumptionEffect.objects.create(option=option, phase=phase, metric=metric, multiplier=multiplier)
+
+    def test_selection_multipliers(self):
+        """Selected options multiply their cells; missing selections use defaults."""
+        exposed = self.napkin.to_dict()['assumptions']['exposed_assumptions']
+        multipliers = selection_multipliers(exposed, {'wash_frequency': 'every_2_uses'})
+        self.assertEqual(multipliers['use', 'water_liters'], 0.5)
+        self.assertEqual(multipliers['transport', 'greenhouse_gas_kg'], 1.0)
+        self.assertEqual(multipliers['production', 'greenhouse_gas_kg'], 1.0)
+
+    def test_cube_default_matches_impacts(self):
+        """The default combination reproduces the exported totals."""
+        data = self.napkin.to_dict()
+        scenarios = build_scenarios(data)
+        self.assertEqual(scenarios['mode'], 'cube')
+        self.assertEqual(scenarios['keys'], ['wash_frequency', 'grocery_trip_distance'])
+        self.assertEqual(len(scenarios['totals']), 9)
+
+        default_index = 0 * 3 + 1  # every_use, moderate
+        for m, metric in enumerate(METRICS):
+            self.assertEqual(scenarios['totals'][default_index][m], data['impacts'][metric]['value'])
+
+    def test_cube_matches_factorized(self):
+        """Both table layouts give the same phase values for every combination."""
+        data = self.napkin.to_dict()
+        cube = build_scenarios(data)
+        factorized = build_scenarios(data, cube_limit=4)
+        self.assertEqual(factorized['mode'], 'factorized')
+
+        for wash in range(3):
+            for trip in range(3):
+                combined = [
+                    value * factorized['multipliers'][0][wash][cell] * factorized['multipliers'][1][trip][cell]
+                    for cell, value in enumerate(factorized['base'])
+                ]
+                for cell, value in enumerate(cube['phase_values'][wash * 3 + trip]):
+                    self.assertAlmostEqual(value, combined[cell])
+
+        far_every_4 = cube['phase_values'][2 * 3 + 2]
+        base = data['impacts_by_phase']
+        self.assertAlmostEqual(
+            far_every_4[cell_index('transport', 'greenhouse_gas_kg')],
+            base['transport']['greenhouse_gas_kg']['value'] * 1.25,
+        )
+        self.assertAlmostEqual(
+            far_every_4[cell_index('use', 'water_liters')],
+            base['use']['water_liters']['value'] * 0.25,
+        )
+        self.assertEqual(len(far_every_4), len(PHASES) * len(METRICS))
+
+    def test_exporter_writes_scenarios(self):
+        """Exported products carry their scenario table."""
+        with TemporaryDirectory() as tmpdir:
+            with override_settings(STATIC_DATA_OUTPUT_DIR=tmpdir):
+                StaticDataExporter().export_products()
+                data = json.loads((Path(tmpdir) / 'products.json').read_text())
+
+        scenarios = data['products'][0]['assumption_scenarios']
+        self.assertEqual(scenarios['mode'], 'cube')
+        self.assertEqual(scenarios['options'][1], ['nearby', 'moderate', 'far'])
@@ -0,0 +1,107 @@
+"""
+Tests for the seed_assumptions command.
+
+Tests verify:
+- Bulk mode writes the same rows and summary counts as the per-row path
+- Reseeding in bulk mode changes nothing and issues a fixed number of queries
+- Drifted labels, option orders and multipliers are repaired and counted
+- Bulk writes invalidate the assumption catalog and the impact snapshots
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from products.assumption_catalog import get_assumption_catalog
+from products.models import (
+    Assumption,
+    AssumptionEffect,
+    AssumptionOption,
+    Material,
+    Product,
+    ProductImpactSnapshot,
+)
+
+
+class SeedAssumptionsTests(TestCase):
+    """Test the per-row and bulk seeding paths."""
+
+    def setUp(self):
+        """Create products, one with use-phase impacts, and materials."""
+        for i in range(3):
+            Product.objects.create(name=f'Product {i}', slug=f'product-{i}', use_water_liters_per_use=i)
+        for name in ['Cotton', 'Steel']:
+            Material.objects.create(name=name)
+
+    def seed(self, *args):
+        stdout = StringIO()
+        call_command('seed_assumptions', *args, stdout=stdout)
+        lines = stdout.getvalue().splitlines()[1:]
+        return dict((key.lstrip('- '), int(value)) for key, value in (line.split(': ') for line in lines))
+
+    def rows(self):
+        return {
+            'assumptions': sorted(Assumption.objects.values_list(
+                'product_id', 'material_id', 'key', 'label', 'exposed', 'default_option_key', 'sort_order'
+            ), key=repr),
+            'options': sorted(AssumptionOption.objects.values_list(
+                'assumption__key', 'assumption__product_id', 'assumption__material_id',
+                'option_key', 'label', 'is_default', 'sort_order',
+            ), key=repr),
+            'effects': sorted(AssumptionEffect.objects.values_list(
+                'option__assumption__key', 'option__assumption__product_id',
+                'option__assumption__material_id', 'option__option_key', 'phase', 'metric', 'multiplier',
+            ), key=repr),
+        }
+
+    def test_bulk_matches_per_row(self):
+        """Both paths create the same rows and report the same counts."""
+        summary = self.seed()
+        rows = self.rows()
+        self.assertEqual(self.seed('--reset', '--bulk', '--batch-size', '7'), summary)
+        self.assertEqual(self.rows(), rows)
+        # 1 global + 3 products × 4 phases + 2 with wash frequency + 2 materials × 3 phases
+        self.assertEqual(summary['assumptions_created'], 21)
+        self.assertEqual(summary['effects_created'], 3 * (1 + 3 * 4 * 5 + 2 * 1 + 2 * 3 * 5))
+
+    def test_bulk_reseed_is_noop(self):
+        """A second bulk seed writes nothing, whatever the catalog size."""
+        self.seed('--bulk')
+
+        def count():
+            with CaptureQueriesContext(connection) as queries:
+                summary = self.seed('--bulk')
+            self.assertEqual(set(summary.values()), {0})
+            return len(queries)
+
+        before = count()
+        for i in range(3, 6):
+            Product.objects.create(name=f'Product {i}', slug=f'product-{i}')
+        self.seed('--bulk')
+        self.assertEqual(count(), before)
+
+    def test_bulk_repairs_drift(self):
+        """Changed rows are updated and counted like the per-row path."""
+        self.seed('--bulk')
+        Assumption.objects.filter(key='grocery_trip_distance').update(label='Old label')
+        AssumptionOption.objects.filter(option_key='high').update(sort_order=9)
+        AssumptionEffect.objects.filter(option__option_key='far').update(multiplier=3.0)
+        AssumptionEffect.objects.filter(option__option_key='nearby').delete()
+
+        summary = self.seed('--bulk')
+        self.assertEqual(summary['assumptions_updated'], 1)
+        self.assertEqual(summary['options_updated'], AssumptionOption.objects.filter(option_key='high').count())
+        self.assertEqual(summary['effects_created'], 1)
+        self.assertEqual(Assumption.objects.get(key='grocery_trip_distance').label, 'Grocery trip distance')
+        self.assertEqual(AssumptionEffect.objects.get(option__option_key='far').multiplier, 1.25)
+
+    def test_bulk_invalidates_caches(self):
+        """The catalog is recompiled and snapshots are marked stale."""
+        catalog = get_assumption_catalog()
+        self.assertEqual(len(catalog), 0)
+        ProductImpactSnapshot.objects.update(is_stale=False)
+
+        self.seed('--bulk')
+        self.assertEqual(len(get_assumption_catalog()), Assumption.objects.count())
+        self.assertFalse(ProductImpactSnapshot.objects.filter(is_stale=False).exists())
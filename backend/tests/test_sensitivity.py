@@ -0,0 +1,158 @@
+"""
+Tests for one-at-a-time sensitivity analysis.
+
+Tests verify:
+- Product, material and global option deltas match a direct recalculation
+- Non-unit default options define the base case
+- Assumptions are ranked by swing per metric
+- The management command and export section use the same data
+"""
+import json
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from products.models import (
+    Assumption,
+    AssumptionEffect,
+    AssumptionOption,
+    Material,
+    Product,
+    ProductComponent,
+)
+from products.sensitivity import SensitivityEngine
+from static_generation.exporter import StaticDataExporter
+
+
+class SensitivityEngineTests(TestCase):
+    """Test batched one-at-a-time deltas."""
+
+    def setUp(self):
+        """Create test fixtures."""
+        self.cotton = Material.objects.create(
+            name='Cotton',
+            production_co2e_kg_per_kg=2.0,
+            transport_co2e_kg_per_kg=0.5,
+        )
+        self.steel = Material.objects.create(
+            name='Steel',
+            production_co2e_kg_per_kg=3.0,
+        )
+        self.napkin = Product.objects.create(
+            name='Cloth Napkin',
+            slug='cloth-napkin',
+            uses_per_year=250,
+            average_lifespan_uses=500,
+            use_water_liters_per_use=0.4,
+        )
+        ProductComponent.objects.create(product=self.napkin, material=self.cotton, weight_grams=30)
+        ProductComponent.objects.create(product=self.napkin, material=self.steel, weight_grams=10)
+
+        self.bottle = Product.objects.create(
+            name='Steel Bottle',
+            slug='steel-bottle',
+            uses_per_year=300,
+            average_lifespan_uses=1500,
+        )
+        ProductComponent.objects.create(product=self.bottle, material=self.steel, weight_grams=300)
+
+    def _assumption(self, label, options, cells, default, product=None, material=None, exposed=False):
+        assumption = Assumption.objects.create(
+            product=product,
+            material=material,
+            label=label,
+            exposed=exposed,
+            default_option_key=default,
+        )
+        for sort_order, (key, multiplier) in enumerate(options.items()):
+            option = AssumptionOption.objects.create(
+                assumption=assumption, option_key=key, label=key, sort_order=sort_order
+            )
+            for phase, metric in cells:
+                AssumptionEffect.objects.create(option=option, phase=phase, metric=metric, multiplier=multiplier)
+        return assumption
+
+    def _factor(self, phase, **scope):
+        return self._assumption(
+            f'{phase} factor',
+            {'low': 0.8, 'base': 1.0, 'high': 1.2},
+            [(phase, 'greenhouse_gas_kg')],
+            'base',
+            **scope,
+        )
+
+    def _deltas(self, summary, assumption):
+        entry = next(entry for entry in summary['assumptions'] if entry['id'] == assumption.id)
+        return {option['id']: option['impacts']['greenhouse_gas_kg'] for option in entry['options']}
+
+    def test_product_option_deltas(self):
+        """Product options rescale that product's phase only."""
+        factor = self._factor('production', product=self.napkin)
+        sensitivity = SensitivityEngine.for_products()
+        deltas = self._deltas(sensitivity.summary(self.napkin.id), factor)
+
+        production = 0.03 * 2.0 + 0.01 * 3.0
+        self.assertAlmostEqual(deltas['base'], 0.0)
+        self.assertAlmostEqual(deltas['high'], production * 0.2 / 500 * 250)
+        self.assertAlmostEqual(deltas['low'], -production * 0.2 / 500 * 250)
+        self.assertEqual(sensitivity.summary(self.bottle.id)['assumptions'], [])
+
+    def test_material_option_deltas(self):
+        """Material options rescale only that material's components, in every product."""
+        factor = self._factor('production', material=self.steel)
+        sensitivity = SensitivityEngine.for_products()
+
+        napkin = self._deltas(sensitivity.summary(self.napkin.id), factor)
+        self.assertAlmostEqual(napkin['high'], 0.01 * 3.0 * 0.2 / 500 * 250)
+        bottle = self._deltas(sensitivity.summary(self.bottle.id), factor)
+        self.assertAlmostEqual(bottle['high'], 0.3 * 3.0 * 0.2 / 1500 * 300)
+
+        entry = sensitivity.summary(self.bottle.id)['assumptions'][0]
+        self.assertEqual(entry['scope'], 'material')
+        self.assertEqual(entry['material'], 'Steel')
+
+    def test_global_and_non_unit_default(self):
+        """Global options apply to every product relative to a non-unit default."""
+        trip = self._assumption(
+            'Grocery trip distance',
+            {'nearby': 0.5, 'moderate': 2.0},
+            [('transport', 'greenhouse_gas_kg')],
+            'moderate',
+            exposed=True,
+        )
+        sensitivity = SensitivityEngine.for_products()
+        summary = sensitivity.summary(self.napkin.id)
+
+        transport = 0.03 * 0.5 * 2.0
+        self.assertAlmostEqual(self._deltas(summary, trip)['nearby'], -transport * 0.75 / 500 * 250)
+        expected_base = (0.03 * 2.0 + 0.01 * 3.0 + transport) / 500 * 250
+        self.assertAlmostEqual(summary['base']['greenhouse_gas_kg'], expected_base)
+        self.assertTrue(summary['assumptions'][0]['exposed'])
+
+    def test_ranking(self):
+        """Assumptions are ranked by swing; untouched metrics rank nothing."""
+        production = self._factor('production', product=self.napkin)
+        transport = self._factor('transport', material=self.cotton)
+        summary = SensitivityEngine.for_products().summary(self.napkin.id)
+
+        self.assertEqual(summary['ranking']['greenhouse_gas_kg'], [production.id, transport.id])
+        self.assertEqual(summary['ranking']['water_liters'], [])
+
+    def test_command_and_export(self):
+        """The command reports rankings and the export carries the optional section."""
+        self._factor('production', product=self.napkin)
+        with TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / 'sensitivity.json'
+            stdout = StringIO()
+            call_command('sensitivity', '--product', 'cloth-napkin', '--output', str(output), stdout=stdout)
+            self.assertIn('production factor [product]', stdout.getvalue())
+            from_command = json.loads(output.read_text())
+
+            with override_settings(STATIC_DATA_OUTPUT_DIR=tmpdir):
+                StaticDataExporter(uncertainty_draws=0, include_sensitivity=True).export_products()
+                exported = json.loads((Path(tmpdir) / 'products.json').read_text())
+
+        by_slug = {product['slug']: product for product in exported['products']}
+        self.assertEqual(by_slug['cloth-napkin']['sensitivity'], from_command['cloth-napkin'])
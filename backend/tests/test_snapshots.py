@@ -0,0 +1,94 @@
+"""
+Tests for materialized product impact snapshots.
+
+Tests verify:
+- Snapshots are created and kept current by model signals
+- Material edits recompute only the products that use the material
+- Assumption edits mark the affected snapshots stale
+- Read paths serve snapshot values
+"""
+from django.test import TestCase
+from products.models import (
+    Assumption,
+    AssumptionEffect,
+    AssumptionOption,
+    Material,
+    Product,
+    ProductComponent,
+    ProductImpactSnapshot,
+)
+from products.snapshots import get_snapshots
+
+
+class ProductImpactSnapshotTests(TestCase):
+    """Test snapshot refresh and invalidation."""
+
+    def setUp(self):
+        """Create test fixtures."""
+        self.cotton = Material.objects.create(name='Cotton', production_co2e_kg_per_kg=2.0)
+        self.glass = Material.objects.create(name='Glass', production_co2e_kg_per_kg=1.0)
+        self.shirt = Product.objects.create(name='Shirt', slug='shirt', uses_per_year=10, average_lifespan_uses=10)
+        self.jar = Product.objects.create(name='Jar', slug='jar', uses_per_year=10, average_lifespan_uses=10)
+        ProductComponent.objects.create(product=self.shirt, material=self.cotton, weight_grams=500)
+        ProductComponent.objects.create(product=self.jar, material=self.glass, weight_grams=1000)
+
+    def snapshot(self, product):
+        return ProductImpactSnapshot.objects.get(product=product)
+
+    def test_snapshot_created_on_save(self):
+        """Saving products and components keeps the snapshot fresh."""
+        snapshot = self.snapshot(self.shirt)
+        self.assertFalse(snapshot.is_stale)
+        self.assertAlmostEqual(snapshot.total_greenhouse_gas_kg, 1.0)
+        self.assertAlmostEqual(
+            snapshot.impacts_by_phase['production']['greenhouse_gas_kg']['value'], 1.0
+        )
+
+    def test_material_edit_recomputes_affected_products_only(self):
+        """Changing a factor refreshes the products that use the material."""
+        jar_computed_at = self.snapshot(self.jar).computed_at
+
+        self.cotton.production_co2e_kg_per_kg = 4.0
+        self.cotton.save()
+
+        self.assertAlmostEqual(self.snapshot(self.shirt).total_greenhouse_gas_kg, 2.0)
+        self.assertEqual(self.snapshot(self.jar).computed_at, jar_computed_at)
+
+    def test_component_delete_marks_stale(self):
+        """Removing a component flags the snapshot; the next read recomputes it."""
+        self.shirt.components.all().delete()
+        self.assertTrue(self.snapshot(self.shirt).is_stale)
+
+        snapshots = get_snapshots(Product.objects.filter(pk=self.shirt.pk))
+        self.assertFalse(snapshots[self.shirt.id].is_stale)
+        self.assertEqual(snapshots[self.shirt.id].total_greenhouse_gas_kg, 0.0)
+
+    def test_product_delete_removes_snapshot(self):
+        """Deleting a product cascades to its snapshot."""
+        self.shirt.delete()
+        self.assertFalse(ProductImpactSnapshot.objects.filter(product_id=self.shirt.id).exists())
+
+    def test_global_assumption_marks_all_stale(self):
+        """A global assumption edit invalidates every snapshot."""
+        Assumption.objects.create(label='Grocery trip distance', exposed=True)
+        self.assertEqual(ProductImpactSnapshot.objects.filter(is_stale=True).count(), 2)
+
+    def test_scoped_assumption_marks_scope_stale(self):
+        """Product- and material-scoped assumption edits invalidate only their products."""
+        assumption = Assumption.objects.create(label='Production factor', material=self.glass)
+        self.assertTrue(self.snapshot(self.jar).is_stale)
+        self.assertFalse(self.snapshot(self.shirt).is_stale)
+
+        get_snapshots(Product.objects.all())
+        option = AssumptionOption.objects.create(assumption=assumption, option_key='base', label='Base')
+        AssumptionEffect.objects.create(option=option, phase='production', metric='greenhouse_gas_kg')
+        self.assertTrue(self.snapshot(self.jar).is_stale)
+        self.assertFalse(self.snapshot(self.shirt).is_stale)
+
+    def test_detail_endpoint_reads_snapshot(self):
+        """The detail endpoint serves the stored values."""
+        ProductImpactSnapshot.objects.filter(product=self.shirt).update(
+            impacts={'greenhouse_gas_kg': {'value': 42.0, 'sources': []}}
+        )
+        response = self.client.get('/api/products/shirt/')
+        self.assertEqual(response.json()['impacts']['greenhouse_gas_kg']['value'], 42.0)
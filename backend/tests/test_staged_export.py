@@ -0,0 +1,137 @@
+"""
+Tests for building exports in a staging directory.
+
+Tests verify:
+- Unchanged files are hardlinked from the live export, changed ones rewritten
+- The staging directory is swapped in and removed afterwards
+- A failed export leaves the live export untouched
+- Files the exporter never wrote are carried over
+- A build that runs while another is staging does not disturb it
+- Directory swaps work with and without an atomic exchange
+"""
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from posts.models import Post
+from products.models import Material, Product, ProductComponent
+from static_generation import staging
+from static_generation.exporter import StaticDataExporter
+
+
+class StagedExportTests(TestCase):
+    """Test staged, swapped exports."""
+
+    def setUp(self):
+        """Create a product and two posts."""
+        cotton = Material.objects.create(name='Cotton', production_co2e_kg_per_kg=2.0)
+        product = Product.objects.create(name='Tote', slug='tote')
+        ProductComponent.objects.create(product=product, material=cotton, weight_grams=200)
+        self.posts = [
+            Post.objects.create(title=f'Post {i}', slug=f'post-{i}', content='Text', published=True)
+            for i in range(2)
+        ]
+        tmpdir = TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.output = Path(tmpdir.name) / 'data'
+
+    def export(self):
+        with override_settings(STATIC_DATA_OUTPUT_DIR=self.output):
+            return StaticDataExporter(uncertainty_draws=0).export_all()
+
+    def test_hardlinks_unchanged_files(self):
+        """Unchanged files keep their inode; changed files get a new one."""
+        self.export()
+        inodes = {path.name: path.stat().st_ino for path in self.output.rglob('*.json')}
+        self.posts[0].title = 'Renamed'
+        self.posts[0].save()
+
+        changes = self.export()
+        self.assertEqual(changes['written'], ['posts.json', 'posts/post-0.json'])
+        self.assertEqual((self.output / 'products.json').stat().st_ino, inodes['products.json'])
+        self.assertEqual((self.output / 'posts' / 'post-1.json').stat().st_ino, inodes['post-1.json'])
+        self.assertNotEqual((self.output / 'posts' / 'post-0.json').stat().st_ino, inodes['post-0.json'])
+        self.assertEqual(sorted(path.name for path in self.output.parent.iterdir()), ['data'])
+
+    def test_failure_keeps_live_export(self):
+        """An error before the swap leaves the previous export in place."""
+        self.export()
+        before = {path: path.read_bytes() for path in self.output.rglob('*') if path.is_file()}
+        self.posts[1].delete()
+
+        with mock.patch.object(StaticDataExporter, 'export_rankings', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.export()
+        self.assertEqual({path: path.read_bytes() for path in self.output.rglob('*') if path.is_file()}, before)
+        self.assertEqual(sorted(path.name for path in self.output.parent.iterdir()), ['data'])
+
+    def test_foreign_files_carried_over(self):
+        """Files not produced by the exporter survive the swap; deleted posts do not."""
+        self.export()
+        (self.output / 'README.txt').write_text('hand written')
+        self.posts[1].delete()
+
+        changes = self.export()
+        self.assertEqual(changes['deleted'], ['posts/post-1.json'])
+        self.assertEqual((self.output / 'README.txt').read_text(), 'hand written')
+        self.assertFalse((self.output / 'posts' / 'post-1.json').exists())
+
+
+    def test_concurrent_builds(self):
+        """Each build stages in its own directory; both publish complete exports."""
+        self.export()
+        self.posts[0].title = 'Renamed'
+        self.posts[0].save()
+        export_rankings = StaticDataExporter.export_rankings
+        staged = []
+
+        def build_during(exporter):
+            export_rankings(exporter)
+            staged.append(exporter.build_dir)
+            if len(staged) == 1:
+                Product.objects.filter(slug='tote').update(name='Bag')
+                self.export()
+
+        with mock.patch.object(StaticDataExporter, 'export_rankings', autospec=True, side_effect=build_during):
+            self.export()
+        self.assertEqual(len(set(staged)), 2)
+
+        manifest = json.loads((self.output / 'manifest.json').read_text())
+        for name in manifest['files']:
+            self.assertTrue((self.output / name).is_file(), name)
+        self.assertEqual(json.loads((self.output / 'posts' / 'post-0.json').read_text())['post']['title'], 'Renamed')
+        self.assertEqual(sorted(path.name for path in self.output.parent.iterdir()), ['data'])
+        self.assertEqual(self.output.stat().st_mode & 0o777, 0o755)
+
+
+class SwapDirectoriesTests(SimpleTestCase):
+    """Test the directory swap helper."""
+
+    def check_swap(self):
+        with TemporaryDirectory() as tmpdir:
+            live, build = Path(tmpdir) / 'data', Path(tmpdir) / '.data.staging'
+            for directory, content in [(live, 'old'), (build, 'new')]:
+                directory.mkdir()
+                (directory / 'file.json').write_text(content)
+            staging.swap_directories(build, live)
+            self.assertEqual((live / 'file.json').read_text(), 'new')
+            self.assertEqual([path.name for path in Path(tmpdir).iterdir()], ['data'])
+
+    def test_exchange(self):
+        """The swap works with renameat2 where available."""
+        self.check_swap()
+
+    def test_fallback(self):
+        """Without an atomic exchange, the swap falls back to two renames."""
+        with mock.patch.object(staging, '_exchange', return_value=False):
+            self.check_swap()
+
+    def test_missing_live(self):
+        """A first export renames the staging directory into place."""
+        with TemporaryDirectory() as tmpdir:
+            build = Path(tmpdir) / '.data.staging'
+            build.mkdir()
+            staging.swap_directories(build, Path(tmpdir) / 'data')
+            self.assertEqual([path.name for path in Path(tmpdir).iterdir()], ['data'])
@@ -0,0 +1,133 @@
+"""
+Tests for the streaming product export.
+
+Tests verify:
+- Streamed files are byte-identical to serializing the whole document at once
+- products.ndjson holds one product per line, matching products.json
+- The export issues a fixed number of queries per chunk, not per product
+- A failed export leaves the previous files in place and no temporary files
+- Stale snapshots are refreshed in chunks, posts serialized once for both outputs
+"""
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from posts.models import Post
+from products.models import Material, Product, ProductComponent, ProductImpactSnapshot
+from products.snapshots import refresh_snapshots, refresh_stale_snapshots
+from static_generation.exporter import StaticDataExporter
+from static_generation.writers import JsonArrayWriter, NdjsonWriter, compact, dumps, nest
+
+
+class StreamingWriterTests(TestCase):
+    """Test the streaming writers against in-memory serialization."""
+
+    def test_array_and_nest_match_dumps(self):
+        """Empty, single and multi-item arrays and nested objects serialize identically."""
+        items = [{'name': 'Crème', 'nested': {'b': [1, 2], 'a': None}}, {'name': 'line\nbreak'}, {}]
+        with TemporaryDirectory() as tmpdir:
+            for n in range(len(items) + 1):
+                writer = JsonArrayWriter(Path(tmpdir) / 'out.json', 'products')
+                for item in items[:n]:
+                    writer.append(dumps(item))
+                writer.close()
+                self.assertEqual(writer.tmp_path.read_bytes(), dumps({'products': items[:n]}))
+        self.assertEqual(nest('product', dumps(items[0])), dumps({'product': items[0]}))
+
+    def test_ndjson(self):
+        """One compact object per line."""
+        with TemporaryDirectory() as tmpdir:
+            writer = NdjsonWriter(Path(tmpdir) / 'out.ndjson')
+            writer.append(compact({'b': 1, 'a': 'x'}))
+            writer.append(compact({'c': [1]}))
+            writer.close()
+            self.assertEqual(writer.tmp_path.read_bytes(), b'{"a":"x","b":1}\n{"c":[1]}\n')
+
+
+class StreamingExportTests(TestCase):
+    """Test the streamed product export."""
+
+    def setUp(self):
+        """Create a few products sharing a material."""
+        self.cotton = Material.objects.create(name='Cotton', production_co2e_kg_per_kg=2.0)
+        for i in range(5):
+            self._product(i)
+        self.tmpdir = TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.output = Path(self.tmpdir.name)
+
+    def _product(self, i):
+        product = Product.objects.create(name=f'Product {i}', slug=f'product-{i}', uses_per_year=i)
+        ProductComponent.objects.create(product=product, material=self.cotton, weight_grams=10 * (i + 1))
+
+    def export(self, **options):
+        with override_settings(STATIC_DATA_OUTPUT_DIR=self.tmpdir.name):
+            exporter = StaticDataExporter(uncertainty_draws=0, **options)
+            exporter.export_products()
+            return exporter
+
+    def test_ndjson_matches_products(self):
+        """Small chunks give the same output, and the NDJSON lines match products.json."""
+        self.export(ndjson=True, chunk_size=2)
+        products = json.loads((self.output / 'products.json').read_text())['products']
+        self.assertEqual(len(products), 5)
+        lines = (self.output / 'products.ndjson').read_text().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], products)
+
+        bytes_by_chunk = (self.output / 'products.json').read_bytes()
+        self.export(chunk_size=100)
+        self.assertEqual((self.output / 'products.json').read_bytes(), bytes_by_chunk)
+
+    def test_queries_per_chunk(self):
+        """Adding products does not add queries while they fit in one chunk."""
+        def count():
+            with CaptureQueriesContext(connection) as queries:
+                self.export(chunk_size=100)
+            return len(queries)
+
+        count()
+        before = count()
+        for i in range(5, 10):
+            self._product(i)
+        count()
+        self.assertEqual(count(), before)
+
+    def test_failure_keeps_previous_files(self):
+        """An error mid-stream discards the partial files."""
+        self.export()
+        previous = (self.output / 'products.json').read_bytes()
+        Product.objects.filter(slug='product-0').update(name='Renamed')
+
+        with mock.patch.object(StaticDataExporter, '_index_entry', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.export()
+        self.assertEqual((self.output / 'products.json').read_bytes(), previous)
+        self.assertEqual(list(self.output.glob('*.tmp')), [])
+
+    def test_stale_snapshots_refreshed_in_chunks(self):
+        """Each chunk of stale products is recomputed separately, and all of them are."""
+        ProductImpactSnapshot.objects.update(is_stale=True)
+        with mock.patch('products.snapshots.refresh_snapshots', wraps=refresh_snapshots) as refresh:
+            self.assertEqual(refresh_stale_snapshots(batch_size=2), 5)
+        self.assertEqual([call.args[0].count() for call in refresh.call_args_list], [2, 2, 1])
+        self.assertFalse(ProductImpactSnapshot.objects.filter(is_stale=True).exists())
+
+    def test_posts_serialized_once(self):
+        """posts.json and the per-post files come from one serialization per post."""
+        for i in range(3):
+            Post.objects.create(title=f'Post {i}', slug=f'post-{i}', content='Text', published=True)
+        with override_settings(STATIC_DATA_OUTPUT_DIR=self.tmpdir.name):
+            exporter = StaticDataExporter(uncertainty_draws=0, chunk_size=2)
+            with mock.patch.object(exporter, '_post_entry', wraps=exporter._post_entry) as post_entry:
+                exporter.export_posts()
+        self.assertEqual(post_entry.call_count, 3)
+        posts = json.loads((self.output / 'posts.json').read_text())['posts']
+        for post in posts:
+            shard = json.loads((self.output / 'posts' / f"{post['slug']}.json").read_text())
+            self.assertEqual(shard['post'], post)
+        self.assertFalse(hasattr(exporter, '_posts'))
+
@@ -0,0 +1,170 @@
+"""
+Tests for the Monte Carlo uncertainty engine.
+
+Tests verify:
+- Products without internal assumptions have no spread
+- Low/base/high factors bound the sampled percentiles
+- Material assumptions scale only that material's components
+- Results are reproducible across seeds, block sizes and worker processes
+- Percentiles appear in to_dict and the static export
+"""
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.test import TestCase, override_settings
+from products.impact_engine import METRICS
+from products.models import (
+    Assumption,
+    AssumptionEffect,
+    AssumptionOption,
+    Material,
+    Product,
+    ProductComponent,
+)
+from products.uncertainty import UncertaintyEngine
+from static_generation.exporter import StaticDataExporter
+
+
+class UncertaintyEngineTests(TestCase):
+    """Test sampled impact percentiles."""
+
+    def setUp(self):
+        """Create test fixtures."""
+        self.cotton = Material.objects.create(
+            name='Cotton',
+            production_co2e_kg_per_kg=2.0,
+            transport_co2e_kg_per_kg=0.5,
+        )
+        self.steel = Material.objects.create(
+            name='Steel',
+            production_co2e_kg_per_kg=3.0,
+        )
+        self.napkin = Product.objects.create(
+            name='Cloth Napkin',
+            slug='cloth-napkin',
+            uses_per_year=250,
+            average_lifespan_uses=500,
+            use_water_liters_per_use=0.4,
+        )
+        ProductComponent.objects.create(product=self.napkin, material=self.cotton, weight_grams=30)
+        ProductComponent.objects.create(product=self.napkin, material=self.steel, weight_grams=10)
+
+        self.bottle = Product.objects.create(
+            name='Steel Bottle',
+            slug='steel-bottle',
+            uses_per_year=300,
+            average_lifespan_uses=1500,
+        )
+        ProductComponent.objects.create(product=self.bottle, material=self.steel, weight_grams=300)
+
+    def _factor(self, phase, product=None, material=None):
+        """Create an internal low/base/high factor like seed_assumptions does."""
+        assumption = Assumption.objects.create(
+            product=product,
+            material=material,
+            label=f'{phase} factor',
+            exposed=False,
+            default_option_key='base',
+        )
+        for sort_order, (key, multiplier) in enumerate([('low', 0.8), ('base', 1.0), ('high', 1.2)]):
+            option = AssumptionOption.objects.create(
+                assumption=assumption, option_key=key, label=key, sort_order=sort_order
+            )
+            for metric in METRICS:
+                AssumptionEffect.objects.create(option=option, phase=phase, metric=metric, multiplier=multiplier)
+
+    def test_no_assumptions_no_spread(self):
+        """Without internal assumptions every percentile equals the impact."""
+        uncertainty = UncertaintyEngine.for_products(draws=50)
+        summary = uncertainty.summary(self.napkin.id)
+        expected = self.napkin.get_total_impact()['greenhouse_gas_kg']['value']
+        for label in ('p5', 'p50', 'p95'):
+            self.assertAlmostEqual(summary['impacts']['greenhouse_gas_kg'][label], expected)
+
+    def test_product_factor_bounds(self):
+        """A discrete low/base/high factor yields 0.8×, 1.0× and 1.2× percentiles."""
+        self._factor('production', product=self.napkin)
+        uncertainty = UncertaintyEngine.for_products(draws=1000)
+        production = uncertainty.summary(self.napkin.id)['impacts_by_phase']['production']['greenhouse_gas_kg']
+        base = self.napkin.get_impact_by_phase()['production']['greenhouse_gas_kg']['value']
+
+        self.assertAlmostEqual(production['p5'], base * 0.8)
+        self.assertAlmostEqual(production['p50'], base)
+        self.assertAlmostEqual(production['p95'], base * 1.2)
+
+        # Other products and phases are untouched.
+        transport = uncertainty.summary(self.napkin.id)['impacts_by_phase']['transport']['greenhouse_gas_kg']
+        self.assertEqual(transport['p5'], transport['p95'])
+        bottle = uncertainty.summary(self.bottle.id)['impacts']['greenhouse_gas_kg']
+        self.assertEqual(bottle['p5'], bottle['p95'])
+
+    def test_material_factor_scales_components(self):
+        """A material factor only scales the components made of that material."""
+        self._factor('production', material=self.steel)
+        uncertainty = UncertaintyEngine.for_products(draws=1000)
+        production = uncertainty.summary(self.napkin.id)['impacts_by_phase']['production']['greenhouse_gas_kg']
+
+        cotton = 0.03 * 2.0
+        steel = 0.01 * 3.0
+        self.assertAlmostEqual(production['p5'], cotton + steel * 0.8)
+        self.assertAlmostEqual(production['p95'], cotton + steel * 1.2)
+
+    def test_continuous_distributions_stay_in_range(self):
+        """Uniform and triangular samples stay between the low and high options."""
+        self._factor('use', product=self.napkin)
+        base = self.napkin.get_impact_by_phase()['use']['water_liters']['value']
+        for distribution in ('uniform', 'triangular'):
+            uncertainty = UncertaintyEngine.for_products(draws=500, distribution=distribution)
+            water = uncertainty.summary(self.napkin.id)['impacts_by_phase']['use']['water_liters']
+            self.assertGreater(water['p5'], base * 0.8)
+            self.assertLess(water['p95'], base * 1.2)
+            self.assertLess(water['p5'], water['p50'])
+
+    def test_reproducible(self):
+        """Fixed seeds reproduce results regardless of blocking and workers."""
+        self._factor('production', product=self.napkin)
+        self._factor('production', material=self.steel)
+        reference = UncertaintyEngine.for_products(draws=200, seed=7, distribution='uniform')
+        for options in ({'block_size': 1}, {'block_size': 1, 'jobs': 2}):
+            other = UncertaintyEngine.for_products(draws=200, seed=7, distribution='uniform', **options)
+            self.assertEqual(
+                other.summary(self.napkin.id)['impacts'],
+                reference.summary(self.napkin.id)['impacts'],
+            )
+            self.assertEqual(
+                other.summary(self.bottle.id)['impacts'],
+                reference.summary(self.bottle.id)['impacts'],
+            )
+
+        reseeded = UncertaintyEngine.for_products(draws=200, seed=8, distribution='uniform')
+        self.assertNotEqual(
+            reseeded.summary(self.napkin.id)['impacts'],
+            reference.summary(self.napkin.id)['impacts'],
+        )
+
+    def test_unknown_distribution(self):
+        """Unknown distributions are rejected."""
+        with self.assertRaises(ValueError):
+            UncertaintyEngine.for_products(distribution='normal')
+
+    def test_to_dict_and_export(self):
+        """Percentiles are added to to_dict and the exported products."""
+        self._factor('production', product=self.napkin)
+        uncertainty = UncertaintyEngine.for_products(draws=100)
+        self.assertNotIn('uncertainty', self.napkin.to_dict())
+        data = self.napkin.to_dict(uncertainty=uncertainty)
+        self.assertEqual(data['uncertainty']['draws'], 100)
+        self.assertEqual(data['uncertainty']['percentiles'], [5, 50, 95])
+
+        with TemporaryDirectory() as tmpdir:
+            with override_settings(STATIC_DATA_OUTPUT_DIR=tmpdir):
+                StaticDataExporter(uncertainty_draws=100).export_products()
+                exported = json.loads((Path(tmpdir) / 'products.json').read_text())
+
+                StaticDataExporter(uncertainty_draws=0).export_products()
+                skipped = json.loads((Path(tmpdir) / 'products.json').read_text())
+
+        by_slug = {product['slug']: product for product in exported['products']}
+        self.assertEqual(by_slug['cloth-napkin']['uncertainty'], data['uncertainty'])
+        self.assertNotIn('uncertainty', skipped['products'][0])
@@ -38,10 +38,15 @@ class Post(models.Model):
     def __str__(self):
         return self.title
 
-    def to_dict(self):
+    def to_dict(self, include_sources=True, assumptions=None):
         """
         Convert post to a dictionary suitable for JSON serialization.
         
+        Args:
+            include_sources (bool): Include provenance in compared products' impacts.
+            assumptions (AssumptionResolver, optional): Exposed assumptions
+                loaded for the whole catalog, passed to ``Product.to_dict``.
+
         Returns:
             dict: Post data
         """
@@ -64,7 +69,10 @@ class Post(models.Model):
             comparison_products = self.comparison_products.all().order_by('order')
             data['comparison'] = {
                 'product_ids': [comp.product.id for comp in comparison_products],
-                'products': [comp.product.to_dict() for comp in comparison_products]
+                'products': [
+                    comp.product.to_dict(include_sources=include_sources, assumptions=assumptions)
+                    for comp in comparison_products
+                ]
             }
         else:
             data['products'] = []
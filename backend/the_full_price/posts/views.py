@@ -3,7 +3,7 @@ Views for the posts app.
 These views are minimal since we're primarily generating static JSON data.
 They're here for reference and for development purposes.
 """
-from django.http import JsonResponse
+from products.views import include_sources, json_response
 from .models import Post
 
 
@@ -14,9 +14,9 @@ def post_list(request):
     """
     posts = Post.objects.filter(published=True)
     data = {
-        'posts': [post.to_dict() for post in posts]
+        'posts': [post.to_dict(include_sources=include_sources(request)) for post in posts]
     }
-    return JsonResponse(data)
+    return json_response(data)
 
 
 def post_detail(request, slug):
@@ -26,6 +26,6 @@ def post_detail(request, slug):
     """
     try:
         post = Post.objects.get(slug=slug, published=True)
-        return JsonResponse(post.to_dict())
+        return json_response(post.to_dict(include_sources=include_sources(request)))
     except Post.DoesNotExist:
-        return JsonResponse({'error': 'Post not found'}, status=404)
+        return json_response({'error': 'Post not found'}, status=404)
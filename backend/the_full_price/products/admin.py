@@ -14,6 +14,7 @@ from .models import (
     Product,
     ProductComponent,
 )
+from .snapshots import get_snapshots, refresh_snapshots
 
 
 class AssumptionOptionInline(admin.TabularInline):
@@ -164,7 +165,10 @@ class ProductAdmin(admin.ModelAdmin):
     """
     Admin interface for Product model.
     """
-    list_display = ['name', 'slug', 'purchase_price_usd', 'uses_per_year', 'average_lifespan_uses']
+    list_display = [
+        'name', 'slug', 'purchase_price_usd', 'uses_per_year', 'average_lifespan_uses',
+        'annual_co2e_display', 'annual_cost_display',
+    ]
     list_filter = ['created_at']
     search_fields = ['name', 'slug']
     prepopulated_fields = {'slug': ('name',)}
@@ -195,6 +199,28 @@ class ProductAdmin(admin.ModelAdmin):
         }),
     )
 
+    list_select_related = ['impact_snapshot']
+    actions = ['refresh_impact_snapshots']
+
+    def changelist_view(self, request, extra_context=None):
+        get_snapshots(self.get_queryset(request))
+        return super().changelist_view(request, extra_context=extra_context)
+
+    @admin.display(description='Annual CO₂e (kg)', ordering='impact_snapshot__total_greenhouse_gas_kg')
+    def annual_co2e_display(self, obj):
+        snapshot = getattr(obj, 'impact_snapshot', None)
+        return f"{snapshot.total_greenhouse_gas_kg:.3g}" if snapshot else '—'
+
+    @admin.display(description='Annual cost (USD)', ordering='impact_snapshot__total_cost_usd')
+    def annual_cost_display(self, obj):
+        snapshot = getattr(obj, 'impact_snapshot', None)
+        return f"{snapshot.total_cost_usd:.2f}" if snapshot else '—'
+
+    @admin.action(description='Recompute impact snapshots')
+    def refresh_impact_snapshots(self, request, queryset):
+        refreshed = refresh_snapshots(queryset)
+        self.message_user(request, f"Recomputed {len(refreshed)} impact snapshots.")
+
 
 @admin.register(Assumption)
 class AssumptionAdmin(admin.ModelAdmin):
@@ -0,0 +1,291 @@
+"""
+Lower-impact alternatives for The Full Price project.
+
+Products are compared on a feature vector of purchase price, uses per year
+and the five annualized totals from ``get_total_impact`` (read from the impact
+snapshots). Each feature is log-scaled (signed, so negative totals keep
+their order) and divided by its spread across the catalog, so no single unit
+dominates the distance.
+
+Every product keeps its ``N_NEIGHBOURS`` nearest neighbours, found by blocked
+brute-force search with NumPy. An alternative for a metric is a neighbour
+whose total on that metric is lower, nearest first.
+
+The index lives in the process and follows the snapshots: products whose
+snapshot was recomputed since the last read are re-searched, along with any
+product that listed them as a neighbour, and every other product only merges
+the changed products into its list.
+
+Usage:
+    index = get_alternatives_index()
+    index.alternatives(product.id, 'greenhouse_gas_kg', k=5)
+    index.summary(product.id)   # {metric: [slug, ...]}
+"""
+import numpy as np
+
+from .impact_engine import METRICS
+from .models import ProductImpactSnapshot
+from .snapshots import refresh_stale_snapshots
+
+FEATURE_FIELDS = [
+    'product__purchase_price_usd',
+    'product__uses_per_year',
+    *[f'total_{metric}' for metric in METRICS],
+]
+
+# Offset of the totals within the feature columns.
+TOTALS_START = 2
+
+N_NEIGHBOURS = 32
+DEFAULT_ALTERNATIVES = 5
+
+# Query rows compared against the catalog at once.
+BLOCK_SIZE = 512
+
+# Rebuild from scratch (and recompute feature scales) when more than this
+# share of the catalog changed since the last read.
+REBUILD_FRACTION = 0.25
+
+_index = None
+
+
+class AlternativesIndex:
+    """
+    Nearest neighbours of every product on normalized feature vectors.
+
+    Attributes:
+        product_ids (np.ndarray): Product ids in ascending order, one per row.
+        slugs (list): Product slugs, one per row.
+        computed_at (list): Snapshot ``computed_at`` each row was built from.
+        values (np.ndarray): (products × 7) raw features: price, uses per
+            year and the five annualized totals.
+        scale (np.ndarray): (7,) divisor applied to the log-scaled features.
+        neighbours (np.ndarray): (products × N_NEIGHBOURS) neighbour product
+            ids, nearest first, padded with -1.
+        distances (np.ndarray): (products × N_NEIGHBOURS) matching distances,
+            padded with inf.
+    """
+
+    def __init__(self, product_ids, slugs, computed_at, values, scale, neighbours, distances):
+        self.product_ids = product_ids
+        self.slugs = slugs
+        self.computed_at = computed_at
+        self.values = values
+        self.scale = scale
+        self.neighbours = neighbours
+        self.distances = distances
+        self._row_by_id = {int(pid): row for row, pid in enumerate(product_ids)}
+
+    @classmethod
+    def build(cls, rows):
+        """
+        Build the index from snapshot rows (see ``load_rows``).
+
+        Feature scales are the standard deviation of each log-scaled column.
+        """
+        product_ids, slugs, computed_at, values = _unpack(rows)
+        transformed = _transform(values)
+        scale = transformed.std(axis=0) if len(values) else np.ones(len(FEATURE_FIELDS))
+        scale[scale == 0] = 1.0
+        indices, distances = nearest_neighbours(transformed / scale, np.arange(len(product_ids)))
+        neighbours = np.where(indices >= 0, product_ids[np.maximum(indices, 0)], -1)
+        return cls(product_ids, slugs, computed_at, values, scale, neighbours, distances)
+
+    def update(self, rows, removed_ids=()):
+        """
+        Apply changed or new snapshot rows and removed products in place.
+
+        Changed products, and products that listed a changed or removed
+        product as a neighbour, are searched again against the whole catalog.
+        Every other product merges the changed products into its current
+        list, which costs (products × changed) distances instead of
+        (products × products).
+        """
+        changed_ids, slugs, computed_at, values = _unpack(rows)
+        stale = np.concatenate([changed_ids, np.asarray(removed_ids, dtype=np.int64)])
+
+        keep = ~np.isin(self.product_ids, stale)
+        product_ids = np.concatenate([self.product_ids[keep], changed_ids])
+        order = np.argsort(product_ids, kind='stable')
+        kept_slugs = [slug for slug, kept in zip(self.slugs, keep) if kept]
+        kept_computed = [at for at, kept in zip(self.computed_at, keep) if kept]
+
+        self.product_ids = product_ids[order]
+        self.slugs = [(kept_slugs + slugs)[i] for i in order]
+        self.computed_at = [(kept_computed + computed_at)[i] for i in order]
+        self.values = np.concatenate([self.values[keep], values])[order]
+        self.neighbours = np.concatenate([
+            self.neighbours[keep], np.full((len(changed_ids), N_NEIGHBOURS), -1, dtype=np.int64)
+        ])[order]
+        self.distances = np.concatenate([
+            self.distances[keep], np.full((len(changed_ids), N_NEIGHBOURS), np.inf)
+        ])[order]
+        self._row_by_id = {int(pid): row for row, pid in enumerate(self.product_ids)}
+
+        features = _transform(self.values) / self.scale
+        changed_rows = np.searchsorted(self.product_ids, changed_ids)
+        research = np.isin(self.product_ids, changed_ids) | np.isin(self.neighbours, stale).any(axis=1)
+
+        rows_to_search = np.flatnonzero(research)
+        indices, distances = nearest_neighbours(features, rows_to_search)
+        self.neighbours[rows_to_search] = np.where(
+            indices >= 0, self.product_ids[np.maximum(indices, 0)], -1
+        )
+        self.distances[rows_to_search] = distances
+
+        rows_to_merge = np.flatnonzero(~research)
+        if len(changed_rows) and len(rows_to_merge):
+            for start in range(0, len(rows_to_merge), BLOCK_SIZE):
+                block = rows_to_merge[start:start + BLOCK_SIZE]
+                candidate_distances = np.sqrt(_squared_distances(features[block], features[changed_rows]))
+                merged_ids = np.concatenate([
+                    self.neighbours[block], np.broadcast_to(changed_ids, candidate_distances.shape)
+                ], axis=1)
+                merged_distances = np.concatenate([self.distances[block], candidate_distances], axis=1)
+                best = np.argsort(merged_distances, axis=1, kind='stable')[:, :N_NEIGHBOURS]
+                self.neighbours[block] = np.take_along_axis(merged_ids, best, axis=1)
+                self.distances[block] = np.take_along_axis(merged_distances, best, axis=1)
+        return self
+
+    def __contains__(self, product_id):
+        return product_id in self._row_by_id
+
+    def __len__(self):
+        return len(self.product_ids)
+
+    def alternatives(self, product_id, metric, k=DEFAULT_ALTERNATIVES):
+        """
+        Nearest neighbours with a lower annualized total on one metric.
+
+        Returns:
+            list: ``[{'id', 'slug', 'distance', 'value'}, ...]``, nearest first.
+        """
+        row = self._row_by_id[product_id]
+        column = TOTALS_START + METRICS.index(metric)
+        found = []
+        for neighbour_id, distance in zip(self.neighbours[row], self.distances[row]):
+            if neighbour_id < 0 or len(found) == k:
+                break
+            neighbour = self._row_by_id[int(neighbour_id)]
+            if self.values[neighbour, column] < self.values[row, column]:
+                found.append({
+                    'id': int(neighbour_id),
+                    'slug': self.slugs[neighbour],
+                    'distance': float(distance),
+                    'value': float(self.values[neighbour, column]),
+                })
+        return found
+
+    def summary(self, product_id, k=DEFAULT_ALTERNATIVES):
+        """
+        Alternative slugs for every metric, as written to the export.
+
+        Returns:
+            dict: ``{metric: [slug, ...]}``, nearest first.
+        """
+        return {
+            metric: [entry['slug'] for entry in self.alternatives(product_id, metric, k)]
+            for metric in METRICS
+        }
+
+
+def load_rows(product_ids=None):
+    """
+    Snapshot rows for the index, in one query.
+
+    Returns:
+        list: ``(product id, slug, computed_at, *features)`` tuples in
+        ascending product id order.
+    """
+    snapshots = ProductImpactSnapshot.objects.order_by('product_id')
+    if product_ids is not None:
+        snapshots = snapshots.filter(product_id__in=product_ids)
+    return list(snapshots.values_list('product_id', 'product__slug', 'computed_at', *FEATURE_FIELDS))
+
+
+def get_alternatives_index():
+    """
+    The process-wide index, brought up to date with the snapshots.
+
+    Stale snapshots are recomputed first; products whose snapshot changed
+    since the last call are applied incrementally, unless more than
+    ``REBUILD_FRACTION`` of the catalog changed.
+
+    Returns:
+        AlternativesIndex: The current index.
+    """
+    global _index
+
+    refresh_stale_snapshots()
+    current = dict(ProductImpactSnapshot.objects.values_list('product_id', 'computed_at'))
+    if _index is None:
+        _index = AlternativesIndex.build(load_rows())
+        return _index
+
+    known = {int(pid): at for pid, at in zip(_index.product_ids, _index.computed_at)}
+    changed = [pid for pid, at in current.items() if known.get(pid) != at]
+    removed = [pid for pid in known if pid not in current]
+    if len(changed) + len(removed) > REBUILD_FRACTION * max(len(current), 1):
+        _index = AlternativesIndex.build(load_rows())
+    elif changed or removed:
+        _index.update(load_rows(changed), removed)
+    return _index
+
+
+def nearest_neighbours(features, rows, k=N_NEIGHBOURS, block_size=BLOCK_SIZE):
+    """
+    Blocked brute-force k-nearest-neighbour search.
+
+    Args:
+        features (np.ndarray): (products × features) normalized vectors.
+        rows (np.ndarray): Rows to find neighbours for.
+        k (int): Neighbours per row.
+        block_size (int): Query rows compared against the catalog at once.
+
+    Returns:
+        tuple: (rows × k) neighbour row indices, nearest first and padded
+        with -1, and the matching (rows × k) Euclidean distances, padded
+        with inf. A row is never its own neighbour.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    indices = np.full((len(rows), k), -1, dtype=np.int64)
+    distances = np.full((len(rows), k), np.inf)
+    n_found = min(k, len(features) - 1)
+    if n_found <= 0:
+        return indices, distances
+
+    for start in range(0, len(rows), block_size):
+        block = rows[start:start + block_size]
+        squared = _squared_distances(features[block], features)
+        squared[np.arange(len(block)), block] = np.inf
+
+        nearest = np.argpartition(squared, n_found - 1, axis=1)[:, :n_found]
+        nearest_squared = np.take_along_axis(squared, nearest, axis=1)
+        order = np.lexsort((nearest, nearest_squared), axis=1)
+        indices[start:start + len(block), :n_found] = np.take_along_axis(nearest, order, axis=1)
+        distances[start:start + len(block), :n_found] = np.sqrt(
+            np.take_along_axis(nearest_squared, order, axis=1)
+        )
+    return indices, distances
+
+
+def _squared_distances(queries, features):
+    """(queries × products) squared Euclidean distances."""
+    squared = (
+        (queries ** 2).sum(axis=1)[:, None]
+        + (features ** 2).sum(axis=1)[None, :]
+        - 2 * queries @ features.T
+    )
+    return np.maximum(squared, 0, out=squared)
+
+
+def _unpack(rows):
+    """Split snapshot rows into ids, slugs, timestamps and a feature array."""
+    product_ids = np.array([row[0] for row in rows], dtype=np.int64)
+    values = np.array([row[3:] for row in rows], dtype=np.float64).reshape(len(rows), len(FEATURE_FIELDS))
+    return product_ids, [row[1] for row in rows], [row[2] for row in rows], values
+
+
+def _transform(values):
+    """Signed log scaling, so features spanning orders of magnitude compare evenly."""
+    return np.sign(values) * np.log1p(np.abs(values))
@@ -0,0 +1,210 @@
+"""
+Process-wide compiled assumption catalog for The Full Price project.
+
+Every assumption, with its options and effects, is compiled once into:
+
+- its export dict (``Assumption.to_export_dict``), shared by every product
+  that lists it;
+- a dense (options × phases × metrics) multiplier tensor, from which the
+  batch calculations build their assumption tables.
+
+The catalog is cached in the process and keyed by the token of the
+``CatalogVersion`` row. The save/delete signal handlers in ``products.signals``
+write a new token for all three assumption models; every read compares the
+cached catalog's token with the row (one primary-key query) and recompiles
+if they differ, so an edit made in any process reaches every other process,
+and views and exports otherwise read assumptions without touching the
+assumption tables. Writes that bypass model signals (``bulk_create``,
+``QuerySet.update``) must call ``bump_catalog_version`` themselves.
+
+The token is written in the edit's transaction, so a rollback restores the
+previous token and a catalog compiled from the uncommitted rows is
+recompiled on the next read.
+
+Usage:
+    catalog = get_assumption_catalog()
+    catalog.resolver.exposed_assumptions(product.id)
+    catalog.multipliers[catalog.row(assumption.id)]   # options × 4 × 5
+"""
+import uuid
+
+import numpy as np
+from django.db.models import Prefetch
+
+from .assumption_resolver import AssumptionResolver
+from .impact_engine import METRICS, PHASES
+
+_catalog = None
+
+
+class AssumptionCatalog:
+    """
+    Every assumption compiled to export dicts and multiplier tensors.
+
+    Attributes:
+        version (str): ``CatalogVersion`` token this was compiled at.
+        ids (np.ndarray): (A,) assumption ids, ascending.
+        product_ids (np.ndarray): (A,) owning product id, -1 if none.
+        material_ids (np.ndarray): (A,) owning material id, -1 if none.
+        exposed (np.ndarray): (A,) whether each assumption is exposed.
+        n_options (np.ndarray): (A,) number of options.
+        defaults (np.ndarray): (A,) default option index.
+        option_keys (list): Option keys of each assumption, in option order.
+        multipliers (np.ndarray): (A × max options × phases × metrics)
+            option multipliers, padded with ones.
+        export_dicts (list): ``Assumption.to_export_dict()`` of each assumption.
+        resolver (AssumptionResolver): Exposed product and global assumptions
+            for every product.
+    """
+
+    def __init__(self, version, ids, product_ids, material_ids, exposed, n_options, defaults,
+                 option_keys, multipliers, export_dicts, resolver):
+        self.version = version
+        self.ids = ids
+        self.product_ids = product_ids
+        self.material_ids = material_ids
+        self.exposed = exposed
+        self.n_options = n_options
+        self.defaults = defaults
+        self.option_keys = option_keys
+        self.multipliers = multipliers
+        self.export_dicts = export_dicts
+        self.resolver = resolver
+        self._row_by_id = {int(aid): row for row, aid in enumerate(ids)}
+
+    @classmethod
+    def compile(cls, version=''):
+        """Compile every assumption: assumptions, options and effects are one query each."""
+        from .models import Assumption, AssumptionOption
+
+        assumptions = list(
+            Assumption.objects
+            .prefetch_related(
+                Prefetch('options', queryset=AssumptionOption.objects.prefetch_related('effects'))
+            )
+            .order_by('id')
+        )
+
+        options = [list(assumption.options.all()) for assumption in assumptions]
+        width = max((len(choices) for choices in options), default=1)
+        multipliers = np.ones((len(assumptions), width, len(PHASES), len(METRICS)))
+        defaults = np.zeros(len(assumptions), dtype=np.int64)
+        export_dicts = []
+        by_product, global_assumptions = {}, []
+
+        shape = (len(PHASES), len(METRICS))
+        for row, (assumption, choices) in enumerate(zip(assumptions, options)):
+            for index, option in enumerate(choices):
+                multipliers[row, index] = np.reshape(option.multiplier_matrix().data, shape)
+            defaults[row] = default_option_index(assumption, choices)
+
+            data = assumption.to_export_dict()
+            export_dicts.append(data)
+            if assumption.exposed and assumption.material_id is None:
+                entry = ((assumption.sort_order, assumption.id), data)
+                if assumption.product_id is None:
+                    global_assumptions.append(entry)
+                else:
+                    by_product.setdefault(assumption.product_id, []).append(entry)
+
+        for entries in by_product.values():
+            entries.sort(key=lambda entry: entry[0])
+        global_assumptions.sort(key=lambda entry: entry[0])
+
+        return cls(
+            version,
+            np.array([assumption.id for assumption in assumptions], dtype=np.int64),
+            np.array([assumption.product_id or -1 for assumption in assumptions], dtype=np.int64),
+            np.array([assumption.material_id or -1 for assumption in assumptions], dtype=np.int64),
+            np.array([assumption.exposed for assumption in assumptions], dtype=bool),
+            np.array([len(choices) for choices in options], dtype=np.int64),
+            defaults,
+            [[option.option_key for option in choices] for choices in options],
+            multipliers,
+            export_dicts,
+            AssumptionResolver(by_product, global_assumptions),
+        )
+
+    def __contains__(self, assumption_id):
+        return assumption_id in self._row_by_id
+
+    def __len__(self):
+        return len(self.ids)
+
+    def row(self, assumption_id):
+        """Row of an assumption in the catalog arrays."""
+        return self._row_by_id[assumption_id]
+
+    def resolve_scenario(self, scenario, exposed=False):
+        """
+        Translate a scenario into option indices.
+
+        Args:
+            scenario (dict): ``{assumption id or key: option key}``. A key
+                selects the option for every matching assumption.
+            exposed (bool): Resolve exposed (True) or internal (False)
+                assumptions.
+
+        Returns:
+            dict: ``{assumption id: option index}``.
+
+        Raises:
+            ValueError: If an assumption or option is unknown.
+        """
+        selections = {}
+        for name, option_key in scenario.items():
+            if isinstance(name, int):
+                rows = [self._row_by_id[name]] if name in self._row_by_id else []
+            else:
+                rows = [row for row, data in enumerate(self.export_dicts) if data['key'] == name]
+            rows = [row for row in rows if self.exposed[row] == exposed]
+            if not rows:
+                scope = 'exposed' if exposed else 'internal'
+                raise ValueError(f"Unknown {scope} assumption: {name!r}")
+            for row in rows:
+                if option_key not in self.option_keys[row]:
+                    raise ValueError(f"Unknown option {option_key!r} for assumption {name!r}")
+                selections[int(self.ids[row])] = self.option_keys[row].index(option_key)
+        return selections
+
+
+def default_option_index(assumption, options):
+    """
+    Index of an assumption's default option: the one matching
+    ``default_option_key``, else the first flagged ``is_default``, else 0.
+    """
+    for index, option in enumerate(options):
+        if assumption.default_option_key:
+            if option.option_key == assumption.default_option_key:
+                return index
+        elif option.is_default:
+            return index
+    return 0
+
+
+def bump_catalog_version():
+    """Invalidate the catalog in every process; the next read recompiles it."""
+    from .models import CatalogVersion
+
+    CatalogVersion.objects.update_or_create(pk=1, defaults={'token': uuid.uuid4().hex})
+
+
+def current_catalog_version():
+    """Token of the ``CatalogVersion`` row, or ``''`` before the first bump."""
+    from .models import CatalogVersion
+
+    return CatalogVersion.objects.filter(pk=1).values_list('token', flat=True).first() or ''
+
+
+def get_assumption_catalog():
+    """
+    The process-wide catalog, recompiled if the version has moved on.
+
+    Returns:
+        AssumptionCatalog: The current catalog.
+    """
+    global _catalog
+    version = current_catalog_version()
+    if _catalog is None or _catalog.version != version:
+        _catalog = AssumptionCatalog.compile(version)
+    return _catalog
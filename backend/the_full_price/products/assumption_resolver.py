@@ -0,0 +1,97 @@
+"""
+Catalog-level resolution of exposed assumptions for The Full Price project.
+
+Every product's export dict lists its own exposed assumptions followed (in
+``sort_order``) by the exposed global ones. Resolving that per product costs
+an assumption query per product, an option query per assumption and rebuilds
+the identical global dicts each time. The resolver instead loads every
+exposed product and global assumption with its options and effects in three
+queries, serializes each assumption once and hands each product its list by
+product id.
+
+For the static export, global assumptions can be written once to a shared
+section: ``exposed_assumptions(product_id, shared=True)`` lists each global
+assumption as ``{'ref': key}`` in place, and ``shared_assumptions()`` holds
+the referenced dicts.
+
+Usage:
+    resolver = AssumptionResolver.for_products(Product.objects.all())
+    product.to_dict(assumptions=resolver)
+    resolver.exposed_assumptions(product.id)
+"""
+import heapq
+
+from django.db.models import Prefetch, Q
+
+
+class AssumptionResolver:
+    """
+    Serialized exposed assumptions, grouped by product.
+
+    Attributes:
+        by_product (dict): ``{product_id: [(sort key, export dict), ...]}`` for
+            product-specific assumptions, each list in display order.
+        global_assumptions (list): ``[(sort key, export dict), ...]`` for the
+            global assumptions, built once and shared by every product.
+    """
+
+    def __init__(self, by_product, global_assumptions):
+        self.by_product = by_product
+        self.global_assumptions = global_assumptions
+
+    @classmethod
+    def for_products(cls, products=None):
+        """
+        Load exposed assumptions for a product queryset (defaults to every
+        product) plus the global ones: assumptions, options and effects are
+        one query each.
+        """
+        from .models import Assumption, AssumptionOption
+
+        if products is None:
+            owned = Q(product__isnull=False)
+        else:
+            owned = Q(product__in=products.order_by().values('id'))
+        assumptions = (
+            Assumption.objects
+            .filter(owned | Q(product__isnull=True, material__isnull=True), exposed=True)
+            .prefetch_related(
+                Prefetch('options', queryset=AssumptionOption.objects.prefetch_related('effects'))
+            )
+            .order_by('sort_order', 'id')
+        )
+
+        by_product = {}
+        global_assumptions = []
+        for assumption in assumptions:
+            entry = ((assumption.sort_order, assumption.id), assumption.to_export_dict())
+            if assumption.product_id is None:
+                global_assumptions.append(entry)
+            else:
+                by_product.setdefault(assumption.product_id, []).append(entry)
+        return cls(by_product, global_assumptions)
+
+    def exposed_assumptions(self, product_id, shared=False):
+        """
+        Export dicts for one product's exposed assumptions, product and global
+        interleaved by ``(sort_order, id)`` as a single query would order them.
+
+        Args:
+            product_id (int): Product to list assumptions for.
+            shared (bool): List global assumptions as ``{'ref': key}``
+                references into ``shared_assumptions()`` instead of inline.
+        """
+        global_assumptions = self.global_assumptions
+        if shared:
+            global_assumptions = [(order, {'ref': data['key']}) for order, data in global_assumptions]
+        entries = heapq.merge(
+            self.by_product.get(product_id, []), global_assumptions, key=lambda entry: entry[0]
+        )
+        return [data for _, data in entries]
+
+    def shared_assumptions(self):
+        """
+        Global assumption dicts by key, as referenced by
+        ``exposed_assumptions(..., shared=True)``.
+        """
+        return {data['key']: data for _, data in self.global_assumptions}
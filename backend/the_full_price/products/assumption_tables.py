@@ -0,0 +1,173 @@
+"""
+Assumption multiplier tables for The Full Price project.
+
+Batch calculations treat assumptions as dense arrays rather than model
+instances: every assumption becomes a row of option multiplier matrices
+(options × 20 phase-metric cells), grouped by scope (product, material or
+global) and tagged with the row index of the product or material it
+belongs to. The Monte Carlo, sensitivity and break-even calculations all
+read assumptions through these tables, which are sliced from the compiled
+``AssumptionCatalog`` instead of queried.
+"""
+import numpy as np
+
+from .impact_engine import MATERIAL_PHASES, METRICS
+from .phase_matrix import SIZE
+
+# Material phase cells lead the flat 20-cell layout.
+N_MATERIAL_CELLS = len(MATERIAL_PHASES) * len(METRICS)
+
+
+def load_assumption_tables(product_ids, material_ids, exposed=False):
+    """
+    Build padded multiplier tables from the compiled assumption catalog.
+
+    Args:
+        product_ids (np.ndarray): Products whose assumptions to load.
+        material_ids (np.ndarray): Materials whose assumptions to load.
+        exposed (bool, optional): Only load exposed (True) or internal
+            (False) assumptions. None loads both.
+
+    Returns:
+        dict: ``{'product': ..., 'material': ..., 'global': ...}``, each a dict
+        of ``ids`` (A,), ``owners`` (A,) row indices into ``product_ids`` or
+        ``material_ids`` (-1 for global), ``tables`` (A × options × 20),
+        ``n_options`` (A,) and ``defaults`` (A,) option indices.
+    """
+    from .assumption_catalog import get_assumption_catalog
+
+    catalog = get_assumption_catalog()
+    selected = catalog.n_options > 0
+    if exposed is not None:
+        selected &= catalog.exposed == exposed
+
+    owned_by_product = catalog.product_ids >= 0
+    owned_by_material = catalog.material_ids >= 0
+    scopes = {
+        'product': (selected & owned_by_product, catalog.product_ids, product_ids),
+        'material': (selected & ~owned_by_product & owned_by_material, catalog.material_ids, material_ids),
+        'global': (selected & ~owned_by_product & ~owned_by_material, None, None),
+    }
+    return {
+        scope: _assumption_table(catalog, rows, owner_ids, ids)
+        for scope, (rows, owner_ids, ids) in scopes.items()
+    }
+
+
+def internal_multipliers(product_ids, material_ids, scenario=None):
+    """
+    Combined multipliers of the internal (non-exposed) assumptions.
+
+    Every internal assumption contributes its default option, unless
+    ``scenario`` selects another.
+
+    Args:
+        product_ids (np.ndarray): Products to build multipliers for.
+        material_ids (np.ndarray): Materials to build multipliers for.
+        scenario (dict, optional): ``{assumption id or key: option key}``
+            overrides, see ``AssumptionCatalog.resolve_scenario``.
+
+    Returns:
+        dict: ``product_multipliers`` (products × 20), product-scoped and
+        global assumptions combined, and ``material_multipliers``
+        (materials × 15) for the material phases, applied per component.
+
+    Raises:
+        ValueError: If the scenario names an unknown assumption or option.
+    """
+    from .assumption_catalog import get_assumption_catalog
+
+    tables = load_assumption_tables(product_ids, material_ids, exposed=False)
+    if scenario:
+        selections = get_assumption_catalog().resolve_scenario(scenario)
+        tables = {scope: select_options(table, selections) for scope, table in tables.items()}
+
+    product_multipliers = (
+        default_multipliers(tables['product'], len(product_ids))
+        * default_matrices(tables['global']).prod(axis=0)
+    )
+    material_multipliers = default_multipliers(tables['material'], len(material_ids))
+    return {
+        'product_multipliers': product_multipliers,
+        'material_multipliers': material_multipliers[:, :N_MATERIAL_CELLS],
+    }
+
+
+def select_options(table, selections):
+    """
+    Copy of an assumption table with ``defaults`` replaced by the selected
+    option indices (``{assumption id: option index}``) where given.
+    """
+    defaults = table['defaults'].copy()
+    for a, assumption_id in enumerate(table['ids']):
+        defaults[a] = selections.get(int(assumption_id), defaults[a])
+    return {**table, 'defaults': defaults}
+
+
+def _assumption_table(catalog, selected, owner_ids, row_ids):
+    """
+    Pack the selected catalog rows into padded arrays, keeping only those
+    whose owner is among ``row_ids`` (all of them for global assumptions).
+    """
+    rows = np.flatnonzero(selected)
+    if owner_ids is None:
+        owners = np.full(len(rows), -1, dtype=np.int64)
+    else:
+        # Vectorized lookup of each owner's row: this runs once per batch
+        # but scans every assumption in the catalog.
+        row_ids = np.asarray(row_ids, dtype=np.int64)
+        order = np.argsort(row_ids, kind='stable')
+        sorted_ids = row_ids[order]
+        wanted = owner_ids[rows]
+        positions = np.minimum(np.searchsorted(sorted_ids, wanted), max(len(sorted_ids) - 1, 0))
+        found = sorted_ids[positions] == wanted if len(sorted_ids) else np.zeros(len(rows), dtype=bool)
+        rows, owners = rows[found], order[positions[found]].astype(np.int64)
+
+    n_options = catalog.n_options[rows]
+    width = max(int(n_options.max(initial=0)), 1)
+    return {
+        'ids': catalog.ids[rows],
+        'owners': owners,
+        'tables': catalog.multipliers[rows, :width].reshape(len(rows), width, SIZE),
+        'n_options': n_options,
+        'defaults': catalog.defaults[rows],
+    }
+
+
+def combine_multipliers(table, multipliers, n_owners):
+    """
+    Multiply each owner's assumption multipliers together.
+
+    Args:
+        table (dict): Assumption table from ``load_assumption_tables``.
+        multipliers (np.ndarray): (assumptions × draws × 20) multipliers.
+        n_owners (int): Number of products or materials.
+
+    Returns:
+        np.ndarray: (owners × draws × 20) combined multipliers.
+    """
+    combined = np.ones((n_owners,) + multipliers.shape[1:])
+    owners = table['owners']
+    if len(owners) == 0:
+        return combined
+
+    # Apply the k-th assumption of every owner together: owners are unique
+    # within a layer, so plain fancy indexing is safe (and much faster than
+    # np.multiply.at).
+    order = np.argsort(owners, kind='stable')
+    sorted_owners = owners[order]
+    ranks = np.arange(len(order)) - np.searchsorted(sorted_owners, sorted_owners)
+    for rank in range(ranks.max() + 1):
+        layer = order[ranks == rank]
+        combined[owners[layer]] *= multipliers[layer]
+    return combined
+
+
+def default_matrices(table):
+    """(assumptions × 20) multipliers of each assumption's default option."""
+    return table['tables'][np.arange(len(table['ids'])), table['defaults']]
+
+
+def default_multipliers(table, n_owners):
+    """(owners × 20) combined default multipliers."""
+    return combine_multipliers(table, default_matrices(table)[:, None, :], n_owners)[:, 0, :]
@@ -0,0 +1,252 @@
+"""
+Pairwise break-even matrix for The Full Price project.
+
+Every product's cumulative impact over time is modelled as a line,
+``initial + slope * years``, exactly as ``getBreakEvenParams`` does in
+``frontend/src/utils/comparison.js``:
+
+- consumables (lifespan of at most one use) start at 0 and accumulate their
+  annualized impact (for cost: purchase price times items per year);
+- durables start at their upfront impact (production + transport + end of
+  life, or the purchase price for cost) and accumulate their use phase.
+
+Two lines cross at ``(initial_b - initial_a) / (slope_a - slope_b)`` years
+(``calculateBreakEvenIntersection``). All pairs are solved at once with
+NumPy, in row blocks to bound memory, and only pairs that cross within the
+horizon are kept.
+
+Impacts include the default option of every internal assumption (as in
+``ImpactEngine``) and of every exposed product and global assumption,
+matching what the frontend shows before a visitor changes any selection.
+
+Usage:
+    matrix = BreakEvenMatrix.for_products(Product.objects.all())
+    matrix.to_index()                   # compact form of every pair
+    matrix.product_shards()             # one exportable dict per product
+    matrix.pair('plastic-bag', 'tote', 'greenhouse_gas_kg')
+"""
+import numpy as np
+
+from .assumption_tables import (
+    default_matrices,
+    default_multipliers,
+    internal_multipliers,
+    load_assumption_tables,
+)
+from .impact_engine import METRICS, PHASES, ImpactEngine, annualize, load_arrays
+
+DEFAULT_HORIZON = 100
+
+# Same tolerance as calculateBreakEvenIntersection.
+MIN_SLOPE_DIFFERENCE = 1e-6
+
+# Rows of the pairwise matrix solved together.
+BLOCK_SIZE = 512
+
+COST_INDEX = METRICS.index('cost_usd')
+
+
+class BreakEvenMatrix:
+    """
+    Line parameters per product and sparse pairwise crossing years.
+
+    Attributes:
+        slugs (list): Product slugs, one per row of ``initial`` and ``slope``.
+        initial (np.ndarray): (products × 5) impact at year 0.
+        slope (np.ndarray): (products × 5) impact added per year.
+        crossings (dict): ``{metric: (pairs × 2 int array, (pairs,) years)}``
+            with the lower product index first.
+        horizon (float): Crossings at or beyond this many years are dropped.
+    """
+
+    def __init__(self, slugs, initial, slope, crossings, horizon):
+        self.slugs = slugs
+        self.initial = initial
+        self.slope = slope
+        self.crossings = crossings
+        self.horizon = horizon
+        self._index_by_slug = {slug: index for index, slug in enumerate(slugs)}
+        self._lookup = None
+
+    @classmethod
+    def for_products(cls, products=None, horizon=DEFAULT_HORIZON):
+        """Compute the matrix for a product queryset (defaults to every product)."""
+        from .models import Product
+
+        if products is None:
+            products = Product.objects.all()
+
+        arrays = load_arrays(products)
+        product_ids = arrays['product_ids']
+        params = arrays['product_params']
+        engine = ImpactEngine.from_arrays(
+            **arrays, **internal_multipliers(product_ids, arrays['material_ids'])
+        )
+
+        # Apply exposed default options, as the frontend does on load.
+        tables = load_assumption_tables(product_ids, arrays['material_ids'], exposed=True)
+        multipliers = (
+            default_multipliers(tables['product'], len(product_ids))
+            * default_matrices(tables['global']).prod(axis=0)
+        ).reshape(len(product_ids), len(PHASES), len(METRICS))
+        phase_array = engine.phase_array * multipliers
+        total_array = annualize(phase_array, params[:, 0], params[:, 1])
+
+        details = {
+            pid: (slug, price)
+            for pid, slug, price in products.order_by().values_list('id', 'slug', 'purchase_price_usd')
+        }
+        slugs = [details[int(pid)][0] for pid in product_ids]
+        price_array = np.array([details[int(pid)][1] or 0.0 for pid in product_ids], dtype=np.float64)
+
+        initial, slope = line_parameters(phase_array, total_array, price_array, params[:, 0], params[:, 1])
+        return cls(slugs, initial, slope, solve_crossings(initial, slope, horizon), horizon)
+
+    def pair(self, slug_a, slug_b, metric):
+        """
+        Break-even data for one pair and metric.
+
+        Returns:
+            dict: ``{'initial': [a, b], 'slope': [a, b], 'year': float or None}``.
+
+        Raises:
+            KeyError: If either slug is unknown.
+        """
+        a = self._index_by_slug[slug_a]
+        b = self._index_by_slug[slug_b]
+        m = METRICS.index(metric)
+        if self._lookup is None:
+            self._lookup = {
+                metric_key: {
+                    (int(i), int(j)): float(year) for (i, j), year in zip(pairs, years)
+                }
+                for metric_key, (pairs, years) in self.crossings.items()
+            }
+        return {
+            'initial': [float(self.initial[a, m]), float(self.initial[b, m])],
+            'slope': [float(self.slope[a, m]), float(self.slope[b, m])],
+            'year': self._lookup[metric].get((min(a, b), max(a, b))),
+        }
+
+    def to_index(self):
+        """
+        Compact, JSON-serializable form.
+
+        Returns:
+            dict: {
+                'horizon': ..., 'metrics': [...], 'products': [slug, ...],
+                'initial': [[5 values], ...], 'slope': [[5 values], ...],
+                'crossings': {metric: [[i, j, years], ...]},
+            }
+        """
+        return {
+            'horizon': self.horizon,
+            'metrics': METRICS,
+            'products': self.slugs,
+            'initial': self.initial.tolist(),
+            'slope': self.slope.tolist(),
+            'crossings': {
+                metric: [[int(i), int(j), float(year)] for (i, j), year in zip(pairs, years)]
+                for metric, (pairs, years) in self.crossings.items()
+            },
+        }
+
+
+    def product_shards(self):
+        """
+        One JSON-serializable dict per product, so a comparison downloads
+        the two products' shards instead of every pair. Each crossing is kept
+        once, in the shard of the product with the lower index.
+
+        Yields:
+            tuple: ``(slug, {'slug': ..., 'horizon': ..., 'metrics': [...],
+            'initial': [5 values], 'slope': [5 values],
+            'crossings': {metric: {other slug: years}}})``.
+        """
+        # Pairs grouped by their first (lower) product index, per metric.
+        grouped = {}
+        for metric, (pairs, years) in self.crossings.items():
+            order = np.argsort(pairs[:, 0], kind='stable')
+            firsts = pairs[order, 0]
+            bounds = np.searchsorted(firsts, np.arange(len(self.slugs) + 1))
+            grouped[metric] = (pairs[order, 1], years[order], bounds)
+
+        for a, slug in enumerate(self.slugs):
+            crossings = {}
+            for metric, (others, years, bounds) in grouped.items():
+                start, stop = bounds[a], bounds[a + 1]
+                crossings[metric] = {
+                    self.slugs[b]: float(year) for b, year in zip(others[start:stop], years[start:stop])
+                }
+            yield slug, {
+                'slug': slug,
+                'horizon': self.horizon,
+                'metrics': METRICS,
+                'initial': self.initial[a].tolist(),
+                'slope': self.slope[a].tolist(),
+                'crossings': crossings,
+            }
+
+
+def line_parameters(phase_array, total_array, prices, uses_per_year, lifespan_uses):
+    """
+    Per-product ``initial`` and ``slope`` for every metric.
+
+    Mirrors ``getBreakEvenParams``.
+
+    Returns:
+        tuple: (products × 5) initial values and (products × 5) slopes.
+    """
+    consumable = (np.where(lifespan_uses == 0, 1.0, lifespan_uses) <= 1)[:, None]
+    upfront = phase_array[:, :PHASES.index('use'), :].sum(axis=1)
+    use = phase_array[:, PHASES.index('use'), :]
+
+    initial = np.where(consumable, 0.0, upfront)
+    slope = np.where(consumable, total_array, use)
+
+    items_per_year = (
+        np.where(uses_per_year == 0, 1.0, uses_per_year)
+        / np.where(lifespan_uses == 0, 1.0, lifespan_uses)
+    )
+    initial[:, COST_INDEX] = np.where(consumable[:, 0], 0.0, prices)
+    slope[:, COST_INDEX] = np.where(consumable[:, 0], prices * items_per_year, use[:, COST_INDEX])
+    return initial, slope
+
+
+def solve_crossings(initial, slope, horizon=DEFAULT_HORIZON, block_size=BLOCK_SIZE):
+    """
+    Crossing years for every pair of products, kept only within the horizon.
+
+    Solves ``(initial_b - initial_a) / (slope_a - slope_b)`` for all pairs
+    ``a < b`` in blocks of ``block_size`` rows.
+
+    Returns:
+        dict: ``{metric: (pairs × 2 int array, (pairs,) years)}``.
+    """
+    n_products = len(initial)
+    found = {metric: ([], []) for metric in METRICS}
+    columns = np.arange(n_products)
+
+    for start in range(0, n_products, block_size):
+        rows = np.arange(start, min(start + block_size, n_products))
+        upper = columns[None, :] > rows[:, None]
+        for m, metric in enumerate(METRICS):
+            slope_difference = slope[rows, m][:, None] - slope[None, :, m]
+            valid = upper & (np.abs(slope_difference) > MIN_SLOPE_DIFFERENCE)
+            years = np.divide(
+                initial[None, :, m] - initial[rows, m][:, None],
+                slope_difference,
+                out=np.zeros_like(slope_difference),
+                where=valid,
+            )
+            a, b = np.nonzero(valid & (years > 0) & (years < horizon))
+            found[metric][0].append(np.stack([rows[a], b], axis=1))
+            found[metric][1].append(years[a, b])
+
+    return {
+        metric: (
+            np.concatenate(pairs) if pairs else np.zeros((0, 2), dtype=np.int64),
+            np.concatenate(years) if years else np.zeros(0),
+        )
+        for metric, (pairs, years) in found.items()
+    }
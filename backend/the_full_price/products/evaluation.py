@@ -0,0 +1,399 @@
+"""
+Per-product evaluation context for The Full Price project.
+
+A ProductEvaluation loads a product's components (with their materials) once,
+computes the lifecycle phase breakdown once, and derives the annualized
+totals from that same breakdown. Product.get_impact_by_phase,
+Product.get_total_impact and Product.to_dict all read from one evaluation,
+so serializing a product costs a fixed number of queries and a single
+calculation pass.
+
+Values and provenance are kept apart: the calculation pass only records
+(component, phase, metric) references, and the ``sources`` lists with their
+calculation text are built from those references when they are serialized.
+With ``include_sources=False`` they are never built at all.
+
+Internal assumptions scale the values exactly as in ``ImpactEngine``:
+material-scoped multipliers per component, product-scoped and global ones
+per phase cell. Their multipliers come from the cached assumption catalog;
+callers serializing many products load them for the whole batch with
+``load_multipliers`` and pass each product its entry.
+"""
+import numpy as np
+
+from .impact_engine import MATERIAL_PHASES, METRIC_FIELD_SUFFIXES, METRICS
+from .phase_matrix import PhaseMetricMatrix, cell_index
+
+# (flat matrix index, phase, metric, Material field) for every material factor.
+MATERIAL_FACTOR_CELLS = [
+    (cell_index(phase, metric), phase, metric, f"{phase}_{suffix}_per_kg")
+    for phase in MATERIAL_PHASES
+    for metric, suffix in METRIC_FIELD_SUFFIXES.items()
+]
+
+USE_CELLS = [
+    (cell_index('use', metric), f"use_{suffix}_per_use")
+    for metric, suffix in METRIC_FIELD_SUFFIXES.items()
+]
+
+
+class ProductEvaluation:
+    """
+    Cached impact calculation for a single product.
+
+    Attributes:
+        product (Product): The product being evaluated.
+        components (list): The product's components with materials loaded.
+        values (PhaseMetricMatrix): Phase breakdown.
+        total_values (dict): ``{metric: value}`` annualized totals.
+        phases (dict): Phase breakdown in the serialized ``{'value', 'sources'}`` shape.
+        totals (dict): Annualized totals in the serialized ``{'value', 'sources'}`` shape.
+    """
+
+    def __init__(self, product, engine=None, snapshot=None, include_sources=True, scenario=None,
+                 multipliers=None):
+        """
+        Args:
+            product (Product): Product to evaluate.
+            engine (ImpactEngine, optional): Precomputed batch results. When
+                given, values come from the engine and components are only
+                walked if sources are needed.
+            snapshot (ProductImpactSnapshot, optional): Stored results. When
+                given, phases and totals are read from it without recomputing.
+            include_sources (bool): Whether ``phases`` and ``totals`` carry
+                provenance. When False they hold ``{'value': ...}`` only.
+            scenario (dict, optional): ``{assumption id or key: option key}``
+                choosing non-default options of internal assumptions.
+            multipliers (tuple, optional): This product's entry from
+                ``load_multipliers``, instead of loading it for one product.
+
+        Raises:
+            ValueError: If a scenario is combined with an engine or snapshot,
+                whose values are already fixed, or with precomputed multipliers.
+        """
+        if scenario and (engine is not None or snapshot is not None):
+            raise ValueError("A scenario cannot be applied to engine or snapshot values")
+        if scenario and multipliers is not None:
+            raise ValueError("A scenario cannot be applied to precomputed multipliers")
+        self.product = product
+        self.engine = engine
+        self.snapshot = snapshot
+        self.include_sources = include_sources
+        self.scenario = scenario
+        self._components = None
+        self._multipliers = multipliers
+        self._values = None
+        self._total_values = None
+        self._references = None
+        self._phases = None
+        self._totals = None
+
+    @property
+    def components(self):
+        if self._components is None:
+            self._components = load_components(self.product)
+        return self._components
+
+    @property
+    def multipliers(self):
+        """
+        Internal assumption multipliers: a 20-cell product list and
+        ``{material_id: 15-cell list}`` for the product's materials.
+        """
+        if self._multipliers is None:
+            self._multipliers = _multipliers_by_product(
+                [self.product.id], {component.material_id for component in self.components}, self.scenario
+            )[self.product.id]
+        return self._multipliers
+
+    def component_multipliers(self, component):
+        """
+        Combined material and product multipliers per phase matrix cell for
+        one component, as applied to its contributions in ``values``.
+        """
+        product_multipliers, material_multipliers = self.multipliers
+        return [
+            material * product
+            for material, product in zip(material_multipliers[component.material_id], product_multipliers)
+        ]
+
+    @property
+    def values(self):
+        if self._values is None:
+            if self.snapshot is not None:
+                self._values = PhaseMetricMatrix.from_nested(self.snapshot.impacts_by_phase)
+            elif self.engine is not None:
+                self._values = self.engine.phase_matrix(self.product.id)
+            else:
+                self._values = self._compute_values()
+        return self._values
+
+    @property
+    def total_values(self):
+        if self._total_values is None:
+            if self.snapshot is not None:
+                self._total_values = {
+                    metric: entry['value'] for metric, entry in self.snapshot.impacts.items()
+                }
+            elif self.engine is not None:
+                self._total_values = self.engine.total_values(self.product.id)
+            else:
+                self._total_values = {
+                    metric: annualized_upfront + annual_use
+                    for metric, (_, annualized_upfront, annual_use) in self._annualized_parts().items()
+                }
+        return self._total_values
+
+    @property
+    def phases(self):
+        if self._phases is None:
+            if self.snapshot is not None and self.include_sources:
+                self._phases = self.snapshot.impacts_by_phase
+            else:
+                self._phases = self._build_phases()
+        return self._phases
+
+    @property
+    def totals(self):
+        if self._totals is None:
+            if self.snapshot is not None and self.include_sources:
+                self._totals = self.snapshot.impacts
+            else:
+                self._totals = self._build_totals()
+        return self._totals
+
+    def _compute_values(self):
+        """
+        Sum component and use-phase impacts into a PhaseMetricMatrix.
+
+        Records a (component, phase, metric) reference for every non-zero
+        contribution so provenance can be built later without a second walk.
+        """
+        product = self.product
+        values = PhaseMetricMatrix.zeros()
+        data = values.data
+        references = {}
+        product_multipliers, material_multipliers = self.multipliers
+
+        # Material Phases
+        for component in self.components:
+            material = component.material
+            w = component.get_weight_kg()
+            component_multipliers = material_multipliers[component.material_id]
+            for index, phase, metric, field in MATERIAL_FACTOR_CELLS:
+                impact = w * getattr(material, field, 0) * component_multipliers[index]
+                data[index] += impact
+                if _contributes(impact, product_multipliers[index]):
+                    references.setdefault((phase, metric), []).append(component)
+
+        # Use Phase
+        # Use phase impacts are per use, so multiply by uses_per_year for annualized impact
+        for index, field in USE_CELLS:
+            data[index] = getattr(product, field, 0) * product.uses_per_year
+
+        for index, multiplier in enumerate(product_multipliers):
+            data[index] *= multiplier
+
+        self._references = references
+        return values
+
+    def _collect_references(self):
+        """
+        Rebuild (component, phase, metric) references when values came from
+        elsewhere, keeping the same components as ``_compute_values``.
+        """
+        references = {}
+        product_multipliers, material_multipliers = self.multipliers
+        for component in self.components:
+            w = component.get_weight_kg()
+            component_multipliers = material_multipliers[component.material_id]
+            for index, phase, metric, field in MATERIAL_FACTOR_CELLS:
+                impact = w * getattr(component.material, field, 0) * component_multipliers[index]
+                if _contributes(impact, product_multipliers[index]):
+                    references.setdefault((phase, metric), []).append(component)
+        return references
+
+    def _annualized_parts(self):
+        """Return ``{metric: (upfront, annualized_upfront, annual_use)}``."""
+        product = self.product
+        values = self.values
+        uses_per_year = product.uses_per_year or 1
+        lifespan_uses = product.average_lifespan_uses or 1
+
+        # Upfront impact per item (sum of production, transport, end_of_life)
+        upfront = values.upfront()
+        annual_use = values.row('use')
+        return {
+            metric: (upfront[m], (upfront[m] / lifespan_uses) * uses_per_year, annual_use[m])
+            for m, metric in enumerate(METRICS)
+        }
+
+    def phase_sources(self, phase, metric):
+        """Build the provenance list for one phase and metric."""
+        product = self.product
+        if phase == 'use':
+            per_use = getattr(product, f"use_{METRIC_FIELD_SUFFIXES[metric]}_per_use", 0)
+            total = self.values['use', metric]
+            if total <= 0:
+                return []
+            multiplier = self.multipliers[0][cell_index('use', metric)]
+            return [{
+                'item': "Direct Use (Annual)",
+                'value': total,
+                'calculation': (
+                    f"{per_use:.3g} / use * {product.uses_per_year} uses/yr"
+                    + _assumption_factor(multiplier)
+                ),
+                'source': self._use_source(),
+            }]
+
+        if self._references is None:
+            self._references = self._collect_references()
+
+        factor_field = f"{phase}_{METRIC_FIELD_SUFFIXES[metric]}_per_kg"
+        index = cell_index(phase, metric)
+        product_multipliers, material_multipliers = self.multipliers
+        sources = []
+        for component in self._references.get((phase, metric), []):
+            material = component.material
+            w = component.get_weight_kg()
+            factor = getattr(material, factor_field, 0)
+            multiplier = material_multipliers[component.material_id][index] * product_multipliers[index]
+            sources.append({
+                'item': material.name,
+                'value': w * factor * multiplier,
+                'calculation': f"{w:.3g} kg * {factor:.3g}" + _assumption_factor(multiplier),
+                'source': {
+                    'url': getattr(material, f"{phase}_source_url", ""),
+                    'name': getattr(material, f"{phase}_source_name", ""),
+                    'note': getattr(material, f"{phase}_source_note", ""),
+                },
+            })
+        return sources
+
+    def _use_source(self):
+        product = self.product
+        return {
+            'url': product.use_phase_source_url,
+            'name': product.use_phase_source_name,
+            'note': product.use_phase_source_note
+        }
+
+    def _build_phases(self):
+        """
+        Product environmental impact broken down by lifecycle phase, in the
+        serialized shape.
+
+        Returns:
+            dict: {
+                'production': { 'metric': {'value': val, 'sources': [...]}, ... },
+                ...
+            }
+        """
+        return self.values.to_dict(sources=self.phase_sources if self.include_sources else None)
+
+    def _build_totals(self):
+        """
+        Total lifecycle impact annualized over the product's lifespan, in the
+        serialized shape.
+
+        Formula: (Production + Transport + End of Life) / Lifespan Years  +  Annual Use Impact
+
+        Returns:
+            dict: Total annualized impact for each metric and sources.
+        """
+        total_values = self.total_values
+        if not self.include_sources:
+            return {metric: {'value': value} for metric, value in total_values.items()}
+
+        product = self.product
+        phases = self.phases
+        uses_per_year = product.uses_per_year or 1
+        lifespan_uses = product.average_lifespan_uses or 1
+
+        impact = {}
+        for metric, (upfront, annualized_upfront, annual_use) in self._annualized_parts().items():
+            sources = []
+            if annualized_upfront > 0:
+                sources.append({
+                    'item': "Manufacturing & EOL (Annualized)",
+                    'value': annualized_upfront,
+                    'calculation': f"({upfront:.3g} upfront / {lifespan_uses:.3g} uses) * {uses_per_year:.3g} uses/yr",
+                    'source': "Derived from component phases",
+                    'sub_sources': phases['production'][metric]['sources'] + phases['transport'][metric]['sources'] + phases['end_of_life'][metric]['sources']
+                })
+
+            if annual_use > 0:
+                sources.append({
+                    'item': "Use Phase (Annual)",
+                    'value': annual_use,
+                    'calculation': "Annual direct use",
+                    'source': self._use_source(),
+                    'sub_sources': phases['use'][metric]['sources']
+                })
+
+            impact[metric] = {
+                'value': total_values[metric],
+                'sources': sources
+            }
+
+        return impact
+
+
+def _contributes(impact, product_multiplier):
+    """Whether a component's impact, with all multipliers applied, is listed as a source."""
+    return impact * product_multiplier > 0
+
+
+def _assumption_factor(multiplier):
+    """Calculation text for an assumption multiplier, empty when it is 1."""
+    return "" if multiplier == 1 else f" * {multiplier:.3g} (assumptions)"
+
+
+def load_components(product):
+    """
+    Return the product's components with materials attached, in one query.
+
+    Reuses ``prefetch_related('components__material')`` results when the
+    caller already prefetched them.
+    """
+    prefetched = getattr(product, '_prefetched_objects_cache', {})
+    if 'components' in prefetched:
+        return list(product.components.all())
+    return list(product.components.select_related('material'))
+
+
+def load_multipliers(products):
+    """
+    Internal assumption multipliers for a batch of products, in one pass
+    over the assumption catalog.
+
+    Args:
+        products (iterable): Products, ideally with
+            ``prefetch_related('components__material')``.
+
+    Returns:
+        dict: ``{product id: (20-cell product list, {material id: 15-cell
+        list})}``, to pass as ``multipliers`` to ``Product.to_dict``. The
+        material dict is shared between products.
+    """
+    products = list(products)
+    material_ids = {
+        component.material_id for product in products for component in load_components(product)
+    }
+    return _multipliers_by_product([product.id for product in products], material_ids)
+
+
+def _multipliers_by_product(product_ids, material_ids, scenario=None):
+    from .assumption_tables import internal_multipliers
+
+    material_ids = np.array(sorted(material_ids), dtype=np.int64)
+    multipliers = internal_multipliers(np.array(product_ids, dtype=np.int64), material_ids, scenario)
+    by_material = {
+        int(material_id): row.tolist()
+        for material_id, row in zip(material_ids, multipliers['material_multipliers'])
+    }
+    return {
+        product_id: (row.tolist(), by_material)
+        for product_id, row in zip(product_ids, multipliers['product_multipliers'])
+    }
@@ -0,0 +1,250 @@
+"""
+Batch impact engine for The Full Price project.
+
+Computes lifecycle impacts for many products at once with NumPy instead of
+walking every component and material attribute in Python.
+
+Materials are loaded into a (materials × 3 phases × 5 metrics) factor array
+and product components into a sparse product × material weight matrix (kept
+in coordinate form), so the material phases for the whole catalog come out
+of a single sparse matrix multiply. The use phase is taken directly from the
+product's ``use_*_per_use`` columns.
+
+Internal (non-exposed) assumptions are applied as multipliers from the
+compiled assumption catalog: material-scoped ones scale each component's
+contribution inside the batched sum, product-scoped and global ones scale
+the product's phase values. Each uses its default option unless a scenario
+picks another; exposed assumptions are left to the frontend.
+
+Usage:
+    engine = ImpactEngine.for_products(Product.objects.all())
+    engine.phase_values(product.id)   # {'production': {'greenhouse_gas_kg': ...}, ...}
+    engine.total_values(product.id)   # {'greenhouse_gas_kg': ..., ...}
+    ImpactEngine.for_products(scenario={'grid_mix': 'renewable'})
+"""
+import numpy as np
+
+PHASES = ['production', 'transport', 'end_of_life', 'use']
+MATERIAL_PHASES = ['production', 'transport', 'end_of_life']
+METRICS = ['greenhouse_gas_kg', 'water_liters', 'energy_kwh', 'land_m2', 'cost_usd']
+
+# Metric key → column suffix used on Material (``{phase}_{suffix}_per_kg``)
+# and Product (``use_{suffix}_per_use``).
+METRIC_FIELD_SUFFIXES = {
+    'greenhouse_gas_kg': 'co2e_kg',
+    'water_liters': 'water_liters',
+    'energy_kwh': 'energy_kwh',
+    'land_m2': 'land_m2',
+    'cost_usd': 'cost',
+}
+
+MATERIAL_FACTOR_FIELDS = [
+    f"{phase}_{METRIC_FIELD_SUFFIXES[metric]}_per_kg"
+    for phase in MATERIAL_PHASES
+    for metric in METRICS
+]
+
+USE_FIELDS = [f"use_{METRIC_FIELD_SUFFIXES[metric]}_per_use" for metric in METRICS]
+
+
+class ImpactEngine:
+    """
+    Vectorized phase × metric impact calculation for a set of products.
+
+    Attributes:
+        product_ids (np.ndarray): Product ids, one per row of the result arrays.
+        phase_array (np.ndarray): (products × 4 phases × 5 metrics) phase values.
+        total_array (np.ndarray): (products × 5 metrics) annualized totals.
+    """
+
+    def __init__(self, product_ids, phase_array, total_array):
+        self.product_ids = product_ids
+        self.phase_array = phase_array
+        self.total_array = total_array
+        self._row_by_id = {int(pid): row for row, pid in enumerate(product_ids)}
+
+    @classmethod
+    def for_products(cls, products=None, scenario=None):
+        """
+        Build an engine for a product queryset (defaults to every product).
+
+        Issues three queries regardless of catalog size: products, materials
+        and components. Assumptions come from the cached catalog.
+
+        Args:
+            products (QuerySet, optional): Products to compute.
+            scenario (dict, optional): ``{assumption id or key: option key}``
+                choosing non-default options of internal assumptions.
+        """
+        from .assumption_tables import internal_multipliers
+
+        arrays = load_arrays(products)
+        multipliers = internal_multipliers(arrays['product_ids'], arrays['material_ids'], scenario)
+        return cls.from_arrays(**arrays, **multipliers)
+
+    @classmethod
+    def from_arrays(cls, product_ids, product_params, material_ids, material_factors, components,
+                    product_multipliers=None, material_multipliers=None):
+        """
+        Compute impacts from raw arrays.
+
+        Args:
+            product_ids: (P,) product ids.
+            product_params: (P × 7) uses_per_year, average_lifespan_uses and
+                the five ``use_*_per_use`` values, in METRICS order.
+            material_ids: (M,) material ids.
+            material_factors: (M × 15) per-kg factors, phase-major in
+                MATERIAL_PHASES × METRICS order.
+            components: (C × 3) product id, material id, weight in grams.
+            product_multipliers: Optional (P × 20) multipliers on the phase
+                values.
+            material_multipliers: Optional (M × 15) multipliers on each
+                component's material phase contributions.
+        """
+        n_products = len(product_ids)
+        n_metrics = len(METRICS)
+        n_material_phases = len(MATERIAL_PHASES)
+
+        # Sparse (products × materials) weight matrix times (materials × 15)
+        # factors, evaluated column by column over the non-zero entries.
+        rows, cols, contributions = component_contributions(
+            product_ids, material_ids, material_factors, components
+        )
+        if material_multipliers is not None:
+            contributions = contributions * material_multipliers[cols]
+        material_totals = np.empty((n_products, n_material_phases * n_metrics))
+        for column in range(material_totals.shape[1]):
+            material_totals[:, column] = np.bincount(
+                rows, weights=contributions[:, column], minlength=n_products
+            )
+
+        uses_per_year = product_params[:, 0]
+        lifespan_uses = product_params[:, 1]
+        use_per_use = product_params[:, 2:]
+
+        phase_array = np.empty((n_products, len(PHASES), n_metrics))
+        phase_array[:, :n_material_phases, :] = material_totals.reshape(
+            n_products, n_material_phases, n_metrics
+        )
+        phase_array[:, PHASES.index('use'), :] = use_per_use * uses_per_year[:, None]
+        if product_multipliers is not None:
+            phase_array *= product_multipliers.reshape(n_products, len(PHASES), n_metrics)
+
+        total_array = annualize(phase_array, uses_per_year, lifespan_uses)
+        return cls(product_ids, phase_array, total_array)
+
+    def __contains__(self, product_id):
+        return product_id in self._row_by_id
+
+    def __len__(self):
+        return len(self.product_ids)
+
+    def row(self, product_id):
+        """Return the result row index for a product id."""
+        return self._row_by_id[product_id]
+
+    def phase_values(self, product_id):
+        """Return ``{phase: {metric: value}}`` for one product."""
+        values = self.phase_array[self.row(product_id)]
+        return {
+            phase: {metric: float(values[p, m]) for m, metric in enumerate(METRICS)}
+            for p, phase in enumerate(PHASES)
+        }
+
+    def phase_matrix(self, product_id):
+        """Return one product's phase values as a PhaseMetricMatrix."""
+        from .phase_matrix import PhaseMetricMatrix
+        return PhaseMetricMatrix(self.phase_array[self.row(product_id)].ravel().tolist())
+
+    def total_values(self, product_id):
+        """Return ``{metric: annualized total}`` for one product."""
+        values = self.total_array[self.row(product_id)]
+        return {metric: float(values[m]) for m, metric in enumerate(METRICS)}
+
+
+def component_contributions(product_ids, material_ids, material_factors, components):
+    """
+    Per-component material phase impacts.
+
+    Args:
+        product_ids, material_ids, material_factors, components: As accepted
+            by ``ImpactEngine.from_arrays``.
+
+    Returns:
+        tuple: (C,) product row indices, (C,) material row indices and
+        (C × 15) impacts (weight in kg times per-kg factors).
+    """
+    # Map database ids onto dense row indices.
+    product_order = np.argsort(product_ids)
+    material_order = np.argsort(material_ids)
+    component_products = components[:, 0].astype(np.int64)
+    component_materials = components[:, 1].astype(np.int64)
+    rows = product_order[np.searchsorted(product_ids, component_products, sorter=product_order)]
+    cols = material_order[np.searchsorted(material_ids, component_materials, sorter=material_order)]
+    weights_kg = components[:, 2] / 1000
+    return rows, cols, weights_kg[:, None] * material_factors[cols]
+
+
+def load_arrays(products=None):
+    """
+    Load the raw inputs of a batch calculation in three queries.
+
+    Returns:
+        dict: ``product_ids``, ``product_params``, ``material_ids``,
+        ``material_factors`` and ``components`` arrays, as accepted by
+        ``ImpactEngine.from_arrays``.
+    """
+    from .models import Material, Product, ProductComponent
+
+    if products is None:
+        products = Product.objects.all()
+
+    product_rows = list(
+        products.order_by().values_list(
+            'id', 'uses_per_year', 'average_lifespan_uses', *USE_FIELDS
+        )
+    )
+    product_ids = np.array([row[0] for row in product_rows], dtype=np.int64)
+    product_params = np.array(
+        [row[1:] for row in product_rows], dtype=np.float64
+    ).reshape(len(product_rows), 2 + len(METRICS))
+
+    material_rows = list(Material.objects.order_by().values_list('id', *MATERIAL_FACTOR_FIELDS))
+    material_ids = np.array([row[0] for row in material_rows], dtype=np.int64)
+    factors = np.array(
+        [row[1:] for row in material_rows], dtype=np.float64
+    ).reshape(len(material_rows), len(MATERIAL_PHASES) * len(METRICS))
+
+    component_rows = list(
+        ProductComponent.objects
+        .filter(product_id__in=products.order_by().values('id'))
+        .values_list('product_id', 'material_id', 'weight_grams')
+    )
+    components = np.array(component_rows, dtype=np.float64).reshape(len(component_rows), 3)
+
+    return {
+        'product_ids': product_ids,
+        'product_params': product_params,
+        'material_ids': material_ids,
+        'material_factors': factors,
+        'components': components,
+    }
+
+
+def annualize(phase_array, uses_per_year, lifespan_uses):
+    """
+    Annualize (products × 4 × 5) phase values into (products × 5) totals.
+
+    Mirrors ``Product.get_total_impact``: upfront phases are spread over the
+    lifespan and repeated ``uses_per_year`` times, zero usage parameters fall
+    back to 1, and the (already annual) use phase is added on top.
+    """
+    uses_per_year = np.where(uses_per_year == 0, 1.0, uses_per_year)
+    lifespan_uses = np.where(lifespan_uses == 0, 1.0, lifespan_uses)
+    upfront = (
+        phase_array[:, PHASES.index('production'), :]
+        + phase_array[:, PHASES.index('transport'), :]
+        + phase_array[:, PHASES.index('end_of_life'), :]
+    )
+    annualized_upfront = (upfront / lifespan_uses[:, None]) * uses_per_year[:, None]
+    return annualized_upfront + phase_array[:, PHASES.index('use'), :]
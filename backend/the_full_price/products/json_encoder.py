@@ -0,0 +1,146 @@
+"""
+JSON encoding for the static export and the API views.
+
+Serializing the catalog is a large share of export time, and the stdlib
+encoder is the slow part. ``get_encoder()`` returns the backend chosen by
+``settings.JSON_ENCODER``:
+
+- ``'auto'`` (default): orjson if installed, else msgspec, else stdlib
+- ``'orjson'``, ``'msgspec'``, ``'stdlib'``: that backend; asking for one
+  that is not installed raises ImproperlyConfigured
+
+Every backend encodes straight to UTF-8 bytes with non-ASCII characters
+left unescaped, and falls back to ``DjangoJSONEncoder`` for types JSON has
+no notation for (datetimes, decimals, lazy strings), so API responses match
+``JsonResponse``. Backends agree on the parsed value, not always on bytes:
+float spellings differ (``1e-05`` vs ``1e-5``), so switching backends
+rewrites every exported file once.
+
+Usage:
+    from products.json_encoder import get_encoder
+
+    content = get_encoder().encode(data, indent=True, sort_keys=True)
+"""
+import json
+from functools import lru_cache
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on the environment
+    msgspec = None
+
+ENCODERS = ('auto', 'orjson', 'msgspec', 'stdlib')
+
+
+def _default(obj):
+    """Encode what JSON has no notation for the way ``JsonResponse`` does."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return DjangoJSONEncoder().default(obj)
+
+
+class StdlibEncoder:
+    """The ``json`` module: always available, and the slowest."""
+
+    name = 'stdlib'
+
+    def encode(self, data, indent=False, sort_keys=False):
+        """
+        Encode data as UTF-8 JSON.
+
+        Args:
+            data: JSON-serializable data.
+            indent (bool): Indent by two spaces instead of writing one line.
+            sort_keys (bool): Order object keys, for deterministic output.
+
+        Returns:
+            bytes: The encoded document.
+        """
+        return json.dumps(
+            data,
+            indent=2 if indent else None,
+            separators=None if indent else (',', ':'),
+            sort_keys=sort_keys,
+            ensure_ascii=False,
+            default=_default,
+        ).encode('utf-8')
+
+
+class OrjsonEncoder(StdlibEncoder):
+    """orjson: a Rust encoder that writes bytes directly."""
+
+    name = 'orjson'
+
+    def encode(self, data, indent=False, sort_keys=False):
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(data, default=_default, option=option)
+
+
+class MsgspecEncoder(StdlibEncoder):
+    """msgspec: a C encoder; indented output is reformatted from compact."""
+
+    name = 'msgspec'
+
+    def __init__(self):
+        self._encoders = {
+            sort_keys: msgspec.json.Encoder(enc_hook=_default, order='sorted' if sort_keys else None)
+            for sort_keys in (False, True)
+        }
+
+    def encode(self, data, indent=False, sort_keys=False):
+        content = self._encoders[sort_keys].encode(data)
+        return msgspec.json.format(content, indent=2) if indent else content
+
+
+BACKENDS = {
+    'orjson': (OrjsonEncoder, orjson),
+    'msgspec': (MsgspecEncoder, msgspec),
+    'stdlib': (StdlibEncoder, json),
+}
+
+
+def available_encoders():
+    """Names of the backends installed in this environment, fastest first."""
+    return [name for name, (_, module) in BACKENDS.items() if module is not None]
+
+
+@lru_cache(maxsize=None)
+def _load(name):
+    if name == 'auto':
+        name = available_encoders()[0]
+    if name not in BACKENDS:
+        raise ImproperlyConfigured(f"JSON_ENCODER must be one of {', '.join(ENCODERS)}, not {name!r}")
+    cls, module = BACKENDS[name]
+    if module is None:
+        raise ImproperlyConfigured(f"JSON_ENCODER is {name!r} but the {name} package is not installed")
+    return cls()
+
+
+def get_encoder(name=None):
+    """
+    The JSON encoder to use.
+
+    Args:
+        name (str): Backend name; defaults to ``settings.JSON_ENCODER``.
+
+    Returns:
+        StdlibEncoder: An encoder with ``encode(data, indent, sort_keys)``.
+
+    Raises:
+        ImproperlyConfigured: For an unknown or uninstalled backend.
+    """
+    return _load(name or getattr(settings, 'JSON_ENCODER', 'auto'))
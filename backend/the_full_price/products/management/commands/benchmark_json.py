@@ -0,0 +1,66 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.assumption_catalog import get_assumption_catalog
+from products.evaluation import load_multipliers
+from products.json_encoder import available_encoders, get_encoder
+from products.models import Product
+from products.snapshots import get_snapshots
+
+
+class Command(BaseCommand):
+    help = "Time each installed JSON encoder on the serialized product catalog."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Timed runs per encoder and format; the fastest is reported.',
+        )
+        parser.add_argument(
+            '--copies',
+            type=int,
+            default=1,
+            help='Repeat the catalog this many times in the payload, to time a larger catalog.',
+        )
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1 or options['copies'] < 1:
+            raise CommandError("--repeat and --copies must be at least 1")
+
+        products = Product.objects.prefetch_related('components__material')
+        snapshots = get_snapshots(products)
+        assumptions = get_assumption_catalog().resolver
+        multipliers = load_multipliers(products)
+        entries = [
+            product.to_dict(
+                snapshot=snapshots[product.id], assumptions=assumptions, multipliers=multipliers[product.id]
+            )
+            for product in products
+        ]
+        data = {'products': entries * options['copies']}
+
+        # The exporter writes indented, sorted files; the API writes compact ones.
+        formats = {'export': {'indent': True, 'sort_keys': True}, 'api': {}}
+        timings = {}
+        for name in available_encoders():
+            encoder = get_encoder(name)
+            timings[name] = {}
+            for label, kwargs in formats.items():
+                runs = []
+                for _ in range(options['repeat']):
+                    start = time.perf_counter()
+                    content = encoder.encode(data, **kwargs)
+                    runs.append(time.perf_counter() - start)
+                timings[name][label] = (min(runs), len(content))
+
+        self.stdout.write(f"{len(data['products'])} products, best of {options['repeat']} runs")
+        baseline = timings['stdlib']
+        for name, results in timings.items():
+            columns = [
+                f"{label} {seconds * 1000:8.1f} ms ({baseline[label][0] / seconds:4.1f}x, {size / 1024:.0f} KiB)"
+                for label, (seconds, size) in results.items()
+            ]
+            self.stdout.write(f"  {name:<8} " + '   '.join(columns))
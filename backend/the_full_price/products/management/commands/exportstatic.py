@@ -2,11 +2,94 @@
 Custom management command to export static data for the frontend.
 """
 from django.core.management.base import BaseCommand
-from the_full_price.static_generation.exporter import run_export
+from products.uncertainty import DEFAULT_DRAWS, DEFAULT_SEED, DISTRIBUTIONS
+from the_full_price.static_generation.exporter import COLUMNAR_DTYPES, DEFAULT_CHUNK_SIZE, PROFILES, run_export
 
 class Command(BaseCommand):
     help = "Export all static data for the frontend."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--no-sources',
+            action='store_true',
+            help='Export impact values only, without provenance sources.',
+        )
+        parser.add_argument(
+            '--draws',
+            type=int,
+            default=DEFAULT_DRAWS,
+            help='Monte Carlo draws per product for the uncertainty section (0 to skip).',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=DEFAULT_SEED,
+            help='Random seed for the Monte Carlo simulation.',
+        )
+        parser.add_argument(
+            '--distribution',
+            choices=DISTRIBUTIONS,
+            default='discrete',
+            help='How internal assumption options are sampled.',
+        )
+        parser.add_argument(
+            '--uncertainty-jobs',
+            type=int,
+            default=1,
+            help='Worker processes for the Monte Carlo simulation.',
+        )
+        parser.add_argument(
+            '--sensitivity',
+            action='store_true',
+            help='Add per-assumption sensitivity (tornado) data to each product.',
+        )
+        parser.add_argument(
+            '--inline-assumptions',
+            action='store_true',
+            help='Copy global assumptions into every product instead of writing assumptions.json.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Products fetched per database round trip while streaming the export.',
+        )
+        parser.add_argument(
+            '--ndjson',
+            action='store_true',
+            help='Also write products.ndjson with one product per line.',
+        )
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=1,
+            help='Worker processes serializing products and posts, each with its own DB connection.',
+        )
+        parser.add_argument(
+            '--profile',
+            choices=sorted(PROFILES),
+            default='pretty',
+            help="Output profile: 'dist' writes minified, precompressed, content-hashed files.",
+        )
+        parser.add_argument(
+            '--columnar',
+            choices=COLUMNAR_DTYPES,
+            help='Also write impact values as a little-endian float buffer of this dtype (products-columns.bin).',
+        )
+
     def handle(self, *args, **options):
-        run_export()
+        run_export(
+            include_sources=not options['no_sources'],
+            uncertainty_draws=options['draws'],
+            uncertainty_seed=options['seed'],
+            uncertainty_distribution=options['distribution'],
+            uncertainty_jobs=options['uncertainty_jobs'],
+            include_sensitivity=options['sensitivity'],
+            shared_assumptions=not options['inline_assumptions'],
+            chunk_size=options['chunk_size'],
+            ndjson=options['ndjson'],
+            jobs=options['jobs'],
+            profile=options['profile'],
+            columnar=options['columnar'],
+        )
         self.stdout.write(self.style.SUCCESS("Static data export complete."))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from products.models import Product
+from products.snapshots import get_snapshots, refresh_snapshots
+
+
+class Command(BaseCommand):
+    help = "Recompute stored product impact snapshots."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stale-only',
+            action='store_true',
+            help='Only recompute snapshots that are missing or marked stale.',
+        )
+
+    def handle(self, *args, **options):
+        products = Product.objects.all()
+        if options.get('stale_only'):
+            outdated = products.exclude(impact_snapshot__is_stale=False).count()
+            get_snapshots(products)
+            self.stdout.write(self.style.SUCCESS(f'Recomputed {outdated} stale impact snapshots.'))
+        else:
+            refreshed = refresh_snapshots(products)
+            self.stdout.write(self.style.SUCCESS(f'Recomputed {len(refreshed)} impact snapshots.'))
@@ -1,7 +1,9 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from django.utils import timezone
 from django.utils.text import slugify
 
+from products.assumption_catalog import bump_catalog_version
 from products.models import (
     Assumption,
     AssumptionEffect,
@@ -9,6 +11,11 @@ from products.models import (
     Material,
     Product,
 )
+from products.snapshots import mark_stale
+
+ASSUMPTION_FIELDS = ('label', 'description', 'input_type', 'exposed', 'default_option_key', 'sort_order')
+OPTION_FIELDS = ('label', 'is_default', 'sort_order')
+DEFAULT_BATCH_SIZE = 1000
 
 
 METRICS = [
@@ -42,9 +49,23 @@ class Command(BaseCommand):
             action='store_true',
             help='Delete existing assumptions/options/effects before seeding fresh data.',
         )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Diff against existing rows in memory and write with bulk_create/bulk_update.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Rows per bulk write with --bulk (default: {DEFAULT_BATCH_SIZE}).',
+        )
 
     def handle(self, *args, **options):
         reset = options.get('reset', False)
+        # In bulk mode _upsert_assumption only collects specs; they are
+        # written together by _bulk_upsert.
+        self._pending = [] if options.get('bulk') else None
 
         with transaction.atomic():
             if reset:
@@ -69,6 +90,9 @@ class Command(BaseCommand):
             for material in Material.objects.all().order_by('id'):
                 self._seed_material_defaults(material, summary)
 
+            if self._pending is not None:
+                self._bulk_upsert(self._pending, summary, options.get('batch_size') or DEFAULT_BATCH_SIZE)
+
             self.stdout.write(self.style.SUCCESS('Assumptions seeding complete.'))
             for key, value in summary.items():
                 self.stdout.write(f"- {key}: {value}")
@@ -108,6 +132,23 @@ class Command(BaseCommand):
         """
         derived_key = slugify(label).replace('-', '_')
 
+        if self._pending is not None:
+            self._pending.append({
+                'product_id': product.pk if product else None,
+                'material_id': material.pk if material else None,
+                'key': derived_key,
+                'values': {
+                    'label': label,
+                    'description': description,
+                    'input_type': input_type,
+                    'exposed': exposed,
+                    'default_option_key': default_option_key,
+                    'sort_order': sort_order,
+                },
+                'options': options or [],
+            })
+            return
+
         assumption, created = Assumption.objects.get_or_create(
             product=product,
             material=material,
@@ -184,6 +225,111 @@ class Command(BaseCommand):
                     _effect.multiplier = effect_data['multiplier']
                     _effect.save(update_fields=['multiplier'])
 
+    # ------------------------------------------------------------------
+    # Bulk upsert
+    # ------------------------------------------------------------------
+
+    def _bulk_upsert(self, specs, summary, batch_size):
+        """
+        Write collected assumption specs with bulk operations.
+
+        Existing assumptions, options and effects are loaded once and diffed
+        in memory, so the summary counts match the per-row path. Bulk writes
+        bypass the model signals, so the assumption catalog and the impact
+        snapshots are invalidated here.
+        """
+        now = timezone.now()
+
+        # Assumptions, keyed like the get_or_create lookup; the oldest row wins.
+        existing = {}
+        for assumption in Assumption.objects.order_by('-id'):
+            existing[(assumption.product_id, assumption.material_id, assumption.key)] = assumption
+
+        new_assumptions, changed_assumptions = [], []
+        for spec in specs:
+            lookup = (spec['product_id'], spec['material_id'], spec['key'])
+            assumption = existing.get(lookup)
+            if assumption is None:
+                assumption = Assumption(
+                    product_id=spec['product_id'], material_id=spec['material_id'], key=spec['key'],
+                    **spec['values'],
+                )
+                existing[lookup] = assumption
+                new_assumptions.append(assumption)
+                summary['assumptions_created'] += 1
+            elif _apply_changes(assumption, spec['values']):
+                assumption.updated_at = now
+                changed_assumptions.append(assumption)
+                summary['assumptions_updated'] += 1
+            spec['assumption'] = assumption
+
+        Assumption.objects.bulk_create(new_assumptions, batch_size=batch_size)
+        Assumption.objects.bulk_update(
+            changed_assumptions, ASSUMPTION_FIELDS + ('updated_at',), batch_size=batch_size
+        )
+
+        # Options
+        existing_options = {
+            (option.assumption_id, option.option_key): option
+            for option in AssumptionOption.objects.only('id', 'assumption_id', 'option_key', *OPTION_FIELDS)
+        }
+        new_options, changed_options, option_specs = [], [], []
+        for spec in specs:
+            assumption_id = spec['assumption'].pk
+            for option_index, option_data in enumerate(spec['options']):
+                values = {
+                    'label': option_data['label'],
+                    'is_default': option_data.get('is_default', False),
+                    'sort_order': option_index,
+                }
+                lookup = (assumption_id, option_data['option_key'])
+                option = existing_options.get(lookup)
+                if option is None:
+                    option = AssumptionOption(
+                        assumption_id=assumption_id, option_key=option_data['option_key'], **values
+                    )
+                    existing_options[lookup] = option
+                    new_options.append(option)
+                    summary['options_created'] += 1
+                elif _apply_changes(option, values):
+                    changed_options.append(option)
+                    summary['options_updated'] += 1
+                option_specs.append((option, option_data.get('effects', [])))
+
+        AssumptionOption.objects.bulk_create(new_options, batch_size=batch_size)
+        AssumptionOption.objects.bulk_update(changed_options, OPTION_FIELDS, batch_size=batch_size)
+
+        # Effects: only ids and multipliers are needed to diff.
+        existing_effects = {
+            (option_id, phase, metric): (effect_id, multiplier)
+            for effect_id, option_id, phase, metric, multiplier in AssumptionEffect.objects.values_list(
+                'id', 'option_id', 'phase', 'metric', 'multiplier'
+            ).iterator(chunk_size=batch_size)
+        }
+        new_effects, changed_effects = [], []
+        for option, effects in option_specs:
+            for effect_data in effects:
+                lookup = (option.pk, effect_data['phase'], effect_data['metric'])
+                current = existing_effects.get(lookup)
+                if current is None:
+                    existing_effects[lookup] = (None, effect_data['multiplier'])
+                    new_effects.append(AssumptionEffect(
+                        option_id=option.pk,
+                        phase=effect_data['phase'],
+                        metric=effect_data['metric'],
+                        multiplier=effect_data['multiplier'],
+                    ))
+                    summary['effects_created'] += 1
+                elif current[1] != effect_data['multiplier'] and current[0] is not None:
+                    changed_effects.append(AssumptionEffect(id=current[0], multiplier=effect_data['multiplier']))
+
+        AssumptionEffect.objects.bulk_create(new_effects, batch_size=batch_size)
+        AssumptionEffect.objects.bulk_update(changed_effects, ['multiplier'], batch_size=batch_size)
+
+        if new_assumptions or changed_assumptions or new_options or changed_options or new_effects or changed_effects:
+            bump_catalog_version()
+            mark_stale()
+
     # ------------------------------------------------------------------
     # Global assumptions (shared across all products)
     # ------------------------------------------------------------------
@@ -310,3 +456,13 @@ class Command(BaseCommand):
                 ],
                 summary=summary,
             )
+
+
+def _apply_changes(instance, values):
+    """Set ``values`` on ``instance``; return whether any field changed."""
+    changed = False
+    for field, value in values.items():
+        if getattr(instance, field) != value:
+            setattr(instance, field, value)
+            changed = True
+    return changed
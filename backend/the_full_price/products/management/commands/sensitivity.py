@@ -0,0 +1,70 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.impact_engine import METRICS
+from products.models import Product
+from products.sensitivity import SensitivityEngine
+
+
+class Command(BaseCommand):
+    help = "Report which assumptions move each product's impacts the most (one option at a time)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--product',
+            action='append',
+            dest='slugs',
+            metavar='SLUG',
+            help='Only report this product. May be given more than once.',
+        )
+        parser.add_argument(
+            '--metric',
+            choices=METRICS,
+            default='greenhouse_gas_kg',
+            help='Metric to rank assumptions by.',
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=5,
+            help='Number of assumptions to list per product.',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the full sensitivity data for every product to this JSON file.',
+        )
+
+    def handle(self, *args, **options):
+        products = Product.objects.all()
+        if options['slugs']:
+            products = products.filter(slug__in=options['slugs'])
+            missing = set(options['slugs']) - set(products.values_list('slug', flat=True))
+            if missing:
+                raise CommandError(f"Unknown product slug(s): {', '.join(sorted(missing))}")
+
+        sensitivity = SensitivityEngine.for_products(products)
+        metric = options['metric']
+        summaries = {}
+
+        for product in products.order_by('name'):
+            summary = sensitivity.summary(product.id)
+            summaries[product.slug] = summary
+            by_id = {entry['id']: entry for entry in summary['assumptions']}
+
+            self.stdout.write(f"{product.name} (base {metric}: {summary['base'][metric]:.4g})")
+            ranking = summary['ranking'][metric][:options['top']]
+            if not ranking:
+                self.stdout.write("  no assumption changes this metric")
+            for assumption_id in ranking:
+                entry = by_id[assumption_id]
+                deltas = [option['impacts'][metric] for option in entry['options']]
+                scope = entry['material'] if entry['scope'] == 'material' else entry['scope']
+                self.stdout.write(
+                    f"  {entry['label']} [{scope}]: {min(deltas):+.4g} … {max(deltas):+.4g}"
+                )
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(summaries, f, indent=2, ensure_ascii=False)
+            self.stdout.write(self.style.SUCCESS(f"Wrote sensitivity data to {options['output']}"))
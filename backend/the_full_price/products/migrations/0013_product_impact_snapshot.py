@@ -0,0 +1,32 @@
+# Generated by Django 5.0 on 2026-10-17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0012_multi_metric_global_assumptions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductImpactSnapshot',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='impact_snapshot', serialize=False, to='products.product')),
+                ('impacts', models.JSONField(default=dict, help_text='Annualized totals, as in Product.get_total_impact')),
+                ('impacts_by_phase', models.JSONField(default=dict, help_text='Phase breakdown, as in Product.get_impact_by_phase')),
+                ('total_greenhouse_gas_kg', models.FloatField(default=0)),
+                ('total_water_liters', models.FloatField(default=0)),
+                ('total_energy_kwh', models.FloatField(default=0)),
+                ('total_land_m2', models.FloatField(default=0)),
+                ('total_cost_usd', models.FloatField(default=0)),
+                ('is_stale', models.BooleanField(db_index=True, default=True)),
+                ('computed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Product impact snapshot',
+            },
+        ),
+    ]
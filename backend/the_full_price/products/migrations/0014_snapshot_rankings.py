@@ -0,0 +1,220 @@
+# Generated by Django 5.0 on 2026-10-17
+
+from django.db import migrations, models
+
+
+def mark_snapshots_stale(apps, schema_editor):
+    """Existing snapshots have no phase columns yet; recompute them on next read."""
+    ProductImpactSnapshot = apps.get_model('products', 'ProductImpactSnapshot')
+    ProductImpactSnapshot.objects.update(is_stale=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0013_product_impact_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productimpactsnapshot',
+            name='end_of_life_cost_usd',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='productimpactsnapshot',
+            name='end_of_life_energy_kwh',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='productimpactsnapshot',
+            name='end_of_life_greenhouse_gas_kg',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='productimpactsnapshot',
+            name='end_of_life_land_m2',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='productimpactsnapshot',
+            name='end_of_life_water_liters',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='productimpactsnapshot',
+            name='production_cost_usd',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='productimpactsnapshot',
+            name='production_energy_kwh',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='productimpactsnapshot',
+            name='production_greenhouse_gas_kg',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='productimpactsnapshot',
+            name='production_land_m2',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='productimpactsnapshot',
+            name='production_water_liters',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='productimpactsnapshot',
+            name='transport_cost_usd',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='productimpactsnapshot',
+            name='transport_energy_kwh',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='productimpactsnapshot',
+            name='transport_greenhouse_gas_kg',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='productimpactsnapshot',
+            name='transport_land_m2',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='productimpactsnapshot',
+            name='transport_water_liters',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='productimpactsnapshot',
+            name='use_cost_usd',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='productimpactsnapshot',
+            name='use_energy_kwh',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='productimpactsnapshot',
+            name='use_greenhouse_gas_kg',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='productimpactsnapshot',
+            name='use_land_m2',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='productimpactsnapshot',
+            name='use_water_liters',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['total_greenhouse_gas_kg', 'product'], name='snapshot_tot_ghg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['total_water_liters', 'product'], name='snapshot_tot_wat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['total_energy_kwh', 'product'], name='snapshot_tot_nrg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['total_land_m2', 'product'], name='snapshot_tot_lnd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['total_cost_usd', 'product'], name='snapshot_tot_usd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['production_greenhouse_gas_kg', 'product'], name='snapshot_prd_ghg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['production_water_liters', 'product'], name='snapshot_prd_wat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['production_energy_kwh', 'product'], name='snapshot_prd_nrg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['production_land_m2', 'product'], name='snapshot_prd_lnd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['production_cost_usd', 'product'], name='snapshot_prd_usd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['transport_greenhouse_gas_kg', 'product'], name='snapshot_trn_ghg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['transport_water_liters', 'product'], name='snapshot_trn_wat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['transport_energy_kwh', 'product'], name='snapshot_trn_nrg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['transport_land_m2', 'product'], name='snapshot_trn_lnd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['transport_cost_usd', 'product'], name='snapshot_trn_usd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['end_of_life_greenhouse_gas_kg', 'product'], name='snapshot_eol_ghg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['end_of_life_water_liters', 'product'], name='snapshot_eol_wat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['end_of_life_energy_kwh', 'product'], name='snapshot_eol_nrg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['end_of_life_land_m2', 'product'], name='snapshot_eol_lnd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['end_of_life_cost_usd', 'product'], name='snapshot_eol_usd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['use_greenhouse_gas_kg', 'product'], name='snapshot_use_ghg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['use_water_liters', 'product'], name='snapshot_use_wat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['use_energy_kwh', 'product'], name='snapshot_use_nrg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['use_land_m2', 'product'], name='snapshot_use_lnd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productimpactsnapshot',
+            index=models.Index(fields=['use_cost_usd', 'product'], name='snapshot_use_usd_idx'),
+        ),
+        migrations.RunPython(mark_snapshots_stale, migrations.RunPython.noop),
+    ]
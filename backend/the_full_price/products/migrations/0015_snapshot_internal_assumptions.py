@@ -0,0 +1,20 @@
+# Generated by Django 5.0 on 2026-10-17
+
+from django.db import migrations
+
+
+def mark_snapshots_stale(apps, schema_editor):
+    """Existing snapshots exclude internal assumption multipliers; recompute them on next read."""
+    ProductImpactSnapshot = apps.get_model('products', 'ProductImpactSnapshot')
+    ProductImpactSnapshot.objects.update(is_stale=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0014_snapshot_rankings'),
+    ]
+
+    operations = [
+        migrations.RunPython(mark_snapshots_stale, migrations.RunPython.noop),
+    ]
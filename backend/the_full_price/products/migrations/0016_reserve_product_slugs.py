@@ -0,0 +1,27 @@
+# Generated by Django 5.0 on 2026-10-17 03:06
+
+import products.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0015_snapshot_internal_assumptions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='product',
+            name='slug',
+            field=models.SlugField(unique=True, validators=[products.models.validate_product_slug]),
+        ),
+        migrations.AddConstraint(
+            model_name='product',
+            constraint=models.CheckConstraint(
+                check=models.Q(('slug__in', ('break-even', 'top')), _negated=True),
+                name='product_slug_not_reserved',
+                violation_error_message='This slug is reserved for an API route.',
+            ),
+        ),
+    ]
@@ -7,8 +7,12 @@ weights and impact factors.
 """
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import F
 from django.utils.text import slugify
 
+from .impact_engine import MATERIAL_PHASES, METRIC_FIELD_SUFFIXES, METRICS, PHASES
+from .phase_matrix import cell_index
+
 
 class Material(models.Model):
     """
@@ -90,6 +94,42 @@ class Material(models.Model):
         return self.name
 
 
+# Collection endpoints registered next to ``api/products/<slug>/``; a product
+# with one of these slugs could not be reached through the API.
+RESERVED_PRODUCT_SLUGS = ('break-even', 'top')
+
+
+def validate_product_slug(value):
+    """Reject slugs that collide with the product API's collection routes."""
+    if value in RESERVED_PRODUCT_SLUGS:
+        raise ValidationError(f"'{value}' is reserved for an API route.")
+
+
+class ProductQuerySet(models.QuerySet):
+    """QuerySet with database-side impact columns."""
+
+    def with_impacts(self):
+        """
+        Annotate each product with its impacts, read from its impact snapshot.
+
+        Adds one float annotation per phase and metric (``production_greenhouse_gas_kg``,
+        ``use_cost_usd``, ...) plus the annualized ``total_{metric}`` values, so
+        lists can be sorted and filtered by impact without instantiating
+        evaluations in Python. The values are the snapshot columns, which the
+        evaluation computes with internal assumption multipliers applied.
+
+        This only adds annotations and runs no query until the queryset is
+        evaluated. The values equal ``get_impact_by_phase`` and
+        ``get_total_impact`` only while the snapshots are fresh, so callers
+        refresh stale snapshots first (``products.snapshots.get_snapshots``
+        or ``refresh_stale_snapshots``); products without a snapshot get None.
+        """
+        columns = [f'total_{metric}' for metric in METRICS] + [
+            f'{phase}_{metric}' for phase in PHASES for metric in METRICS
+        ]
+        return self.annotate(**{column: F(f'impact_snapshot__{column}') for column in columns})
+
+
 class Product(models.Model):
     """
     Represents a physical product that users want to understand the impact of.
@@ -100,7 +140,7 @@ class Product(models.Model):
     """
     name = models.CharField(max_length=255, unique=True)
     description = models.TextField(blank=True)
-    slug = models.SlugField(unique=True)
+    slug = models.SlugField(unique=True, validators=[validate_product_slug])
     
     # Lifecycle parameters
     purchase_price_usd = models.FloatField(default=0, help_text="Price at purchase")
@@ -134,173 +174,117 @@ class Product(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProductQuerySet.as_manager()
+
     class Meta:
         ordering = ['name']
+        # The slug validator only runs in full_clean(); this also covers
+        # objects.create(), seed scripts and fixtures.
+        constraints = [
+            models.CheckConstraint(
+                check=~models.Q(slug__in=RESERVED_PRODUCT_SLUGS),
+                name='product_slug_not_reserved',
+                violation_error_message="This slug is reserved for an API route.",
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
-    def get_total_impact(self):
+    def evaluate(self, engine=None, snapshot=None, include_sources=True, scenario=None, multipliers=None):
+        """
+        Build an evaluation context for this product.
+
+        The context loads components and materials once and computes the phase
+        breakdown once; totals, phases and component dicts all reuse it.
+
+        Args:
+            engine (ImpactEngine, optional): Batch results covering this product.
+            snapshot (ProductImpactSnapshot, optional): Stored results to read
+                instead of recomputing.
+            include_sources (bool): Build provenance ``sources`` lists. When
+                False, serialized impacts carry values only.
+            scenario (dict, optional): ``{assumption id or key: option key}``
+                overriding the default options of internal assumptions.
+            multipliers (tuple, optional): This product's internal assumption
+                multipliers from ``evaluation.load_multipliers``.
+
+        Returns:
+            ProductEvaluation: Lazily computed impacts for this product.
+        """
+        from .evaluation import ProductEvaluation
+        return ProductEvaluation(
+            self, engine=engine, snapshot=snapshot, include_sources=include_sources, scenario=scenario,
+            multipliers=multipliers,
+        )
+
+    def get_total_impact(self, engine=None, include_sources=True, scenario=None):
         """
         Calculate total lifecycle impact annualized over the product's lifespan.
         
         Formula: (Production + Transport + End of Life) / Lifespan Years  +  Annual Use Impact
         
+        Args:
+            engine (ImpactEngine, optional): Precomputed batch results to take
+                the values from instead of summing components in Python.
+            include_sources (bool): Build provenance ``sources`` lists.
+            scenario (dict, optional): Internal assumption overrides, see
+                ``evaluate``.
+
         Returns:
             dict: Total annualized impact for each metric and sources.
         """
-        phases = self.get_impact_by_phase()
-        impact = {}
-        
-        uses_per_year = self.uses_per_year or 1
-        lifespan_uses = self.average_lifespan_uses or 1
-        metrics = ['greenhouse_gas_kg', 'water_liters', 'energy_kwh', 'land_m2', 'cost_usd']
-        
-        for metric in metrics:
-            # Upfront impact per item (sum of production, transport, end_of_life)
-            production_val = phases['production'][metric]['value']
-            transport_val = phases['transport'][metric]['value']
-            eol_val = phases['end_of_life'][metric]['value']
-            
-            upfront = production_val + transport_val + eol_val
-            
-            annualized_upfront = (upfront / lifespan_uses) * uses_per_year
-            annual_use = phases['use'][metric]['value']
-            
-            total_val = annualized_upfront + annual_use
-            
-            sources = []
-            if annualized_upfront > 0:
-                sources.append({
-                    'item': "Manufacturing & EOL (Annualized)",
-                    'value': annualized_upfront,
-                    'calculation': f"({upfront:.3g} upfront / {lifespan_uses:.3g} uses) * {uses_per_year:.3g} uses/yr",
-                    'source': "Derived from component phases",
-                    'sub_sources': phases['production'][metric]['sources'] + phases['transport'][metric]['sources'] + phases['end_of_life'][metric]['sources']
-                })
-                
-            if annual_use > 0:
-                 sources.append({
-                    'item': "Use Phase (Annual)",
-                    'value': annual_use,
-                    'calculation': "Annual direct use",
-                    'source': {
-                        'url': self.use_phase_source_url,
-                        'name': self.use_phase_source_name,
-                        'note': self.use_phase_source_note
-                    },
-                    'sub_sources': phases['use'][metric]['sources']
-                })
-
-            impact[metric] = {
-                'value': total_val,
-                'sources': sources
-            }
-            
-        return impact
+        return self.evaluate(engine=engine, include_sources=include_sources, scenario=scenario).totals
 
-    def get_impact_by_phase(self):
+    def get_impact_by_phase(self, engine=None, include_sources=True, scenario=None):
         """
         Calculate product environmental impact broken down by lifecycle phase.
         Includes material phases (production, transport, end_of_life) and use phase.
         
+        Args:
+            engine (ImpactEngine, optional): Precomputed batch results. When
+                given, phase values come from the engine and the component
+                walk only builds the sources.
+            include_sources (bool): Build provenance ``sources`` lists.
+            scenario (dict, optional): Internal assumption overrides, see
+                ``evaluate``.
+
         Returns:
             dict: {
                 'production': { 'metric': {'value': val, 'sources': [...]}, ... },
                 ...
             }
         """
-        metrics_map = {
-            'greenhouse_gas_kg': 'co2e_kg',
-            'water_liters': 'water_liters',
-            'energy_kwh': 'energy_kwh',
-            'land_m2': 'land_m2',
-            'cost_usd': 'cost',
-        }
-        
-        phases = {}
-        for phase_name in ['production', 'transport', 'end_of_life', 'use']:
-            phases[phase_name] = {}
-            for metric in metrics_map.keys():
-                phases[phase_name][metric] = {'value': 0.0, 'sources': []}
-
-        # Material Phases
-        for component in self.components.all():
-            w = component.get_weight_kg()
-            for phase in ['production', 'transport', 'end_of_life']:
-                # Construct rich source object from split fields
-                source_url = getattr(component.material, f"{phase}_source_url", "")
-                source_name = getattr(component.material, f"{phase}_source_name", "")
-                source_note = getattr(component.material, f"{phase}_source_note", "")
-                
-                source_data = {
-                    'url': source_url,
-                    'name': source_name,
-                    'note': source_note
-                }
-                
-                for metric, suffix in metrics_map.items():
-                    attr_name = f"{phase}_{suffix}_per_kg"
-                    factor = getattr(component.material, attr_name, 0)
-                    impact = w * factor
-                    
-                    phases[phase][metric]['value'] += impact
-                    if impact > 0:
-                        phases[phase][metric]['sources'].append({
-                            'item': component.material.name,
-                            'value': impact,
-                            'calculation': f"{w:.3g} kg * {factor:.3g}",
-                            'source': source_data
-                        })
-
-        # Use Phase
-        # Add use phase impacts (these are per use, so multiply by uses_per_year for annualized impact)
-        use_source_data = {
-            'url': self.use_phase_source_url,
-            'name': self.use_phase_source_name,
-            'note': self.use_phase_source_note
-        }
-        
-        product_metrics_map = {
-            'greenhouse_gas_kg': 'co2e_kg',
-            'water_liters': 'water_liters',
-            'energy_kwh': 'energy_kwh',
-            'land_m2': 'land_m2',
-            'cost_usd': 'cost'
-        }
-        
-        for metric, suffix in product_metrics_map.items():
-            if metric == 'cost_usd':
-                 attr = "use_cost_per_use"
-            else:
-                 attr = f"use_{suffix}_per_use"
-                 
-            per_use = getattr(self, attr, 0)
-            total = per_use * self.uses_per_year
-            
-            phases['use'][metric]['value'] = total
-            if total > 0:
-                phases['use'][metric]['sources'].append({
-                    'item': "Direct Use (Annual)",
-                    'value': total,
-                    'calculation': f"{per_use:.3g} / use * {self.uses_per_year} uses/yr",
-                    'source': use_source_data
-                })
-        
-        return phases
+        return self.evaluate(engine=engine, include_sources=include_sources, scenario=scenario).phases
 
-    def to_dict(self):
+    def to_dict(self, engine=None, snapshot=None, include_sources=True, uncertainty=None, assumptions=None,
+                multipliers=None):
         """
         Convert product to a dictionary suitable for JSON serialization.
         This is used when exporting data to the React frontend.
         
+        Args:
+            engine (ImpactEngine, optional): Batch results covering this product.
+            snapshot (ProductImpactSnapshot, optional): Stored results to read
+                instead of recomputing.
+            include_sources (bool): Include provenance ``sources`` lists in
+                the impact entries. Values-only output is much cheaper.
+            uncertainty (UncertaintyEngine, optional): Monte Carlo results
+                covering this product, added under ``uncertainty``.
+            assumptions (AssumptionResolver, optional): Exposed assumptions
+                loaded for the whole catalog.
+            multipliers (tuple, optional): This product's entry from
+                ``evaluation.load_multipliers``. Lists pass it so internal
+                assumptions are resolved once per batch, not per product.
+
         Returns:
             dict: Product data including total impacts and breakdown by lifecycle phase
         """
-        impact = self.get_total_impact()
-        impact_by_phase = self.get_impact_by_phase()
+        evaluation = self.evaluate(
+            engine=engine, snapshot=snapshot, include_sources=include_sources, multipliers=multipliers
+        )
         
-        return {
+        data = {
             'id': self.id,
             'name': self.name,
             'description': self.description,
@@ -308,9 +292,9 @@ class Product(models.Model):
             'purchase_price_usd': self.purchase_price_usd,
             'uses_per_year': self.uses_per_year,
             'average_lifespan_uses': self.average_lifespan_uses,
-            'impacts': impact,
-            'impacts_by_phase': impact_by_phase,
-            'assumptions': self.get_assumptions(),
+            'impacts': evaluation.totals,
+            'impacts_by_phase': evaluation.phases,
+            'assumptions': self.get_assumptions(resolver=assumptions),
             'use_phase': {
                 'co2e_kg_per_use': self.use_co2e_kg_per_use,
                 'water_liters_per_use': self.use_water_liters_per_use,
@@ -318,18 +302,28 @@ class Product(models.Model):
                 'land_m2_per_use': self.use_land_m2_per_use,
                 'cost_per_use': self.use_cost_per_use,
             },
-            'components': [comp.to_dict() for comp in self.components.all()],
+            'components': [
+                comp.to_dict(multipliers=evaluation.component_multipliers(comp))
+                for comp in evaluation.components
+            ],
         }
+        if uncertainty is not None and self.id in uncertainty:
+            data['uncertainty'] = uncertainty.summary(self.id)
+        return data
 
-    def get_assumptions(self):
+    def get_assumptions(self, resolver=None):
         """
         Return assumptions metadata for this product.
 
         Includes product-specific assumptions AND global assumptions (those
         not attached to any product or material).  Only exposed assumptions
         are returned as editable controls for the frontend.
+
+        Args:
+            resolver (AssumptionResolver, optional): Assumptions loaded for
+                the whole catalog. Without one, this product's are loaded.
         """
-        from django.db.models import Q
+        from .assumption_resolver import AssumptionResolver
 
         all_assumptions = [
             {
@@ -377,50 +371,12 @@ class Product(models.Model):
         ]
 
         # Product-specific + global assumptions
-        assumptions = (
-            Assumption.objects
-            .filter(
-                Q(product=self) | Q(product__isnull=True, material__isnull=True),
-                exposed=True,
-            )
-            .prefetch_related('options__effects')
-            .order_by('sort_order', 'id')
-        )
-
-        exposed_assumptions = []
-        for assumption in assumptions:
-            default_option_id = assumption.default_option_key or None
-            options = []
-
-            for option in assumption.options.all().order_by('sort_order', 'id'):
-                if option.is_default and not default_option_id:
-                    default_option_id = option.option_key
-
-                phase_multipliers = {}
-                for effect in option.effects.all():
-                    phase_multipliers.setdefault(effect.phase, {})[effect.metric] = effect.multiplier
-
-                options.append({
-                    'id': option.option_key,
-                    'label': option.label,
-                    'phase_multipliers': phase_multipliers,
-                })
-
-            if not default_option_id and options:
-                default_option_id = options[0]['id']
-
-            exposed_assumptions.append({
-                'key': assumption.key,
-                'label': assumption.label,
-                'description': assumption.description,
-                'input_type': assumption.input_type,
-                'default_option_id': default_option_id,
-                'options': options,
-            })
+        if resolver is None:
+            resolver = AssumptionResolver.for_products(Product.objects.filter(pk=self.pk))
 
         return {
             'all_assumptions': all_assumptions,
-            'exposed_assumptions': exposed_assumptions,
+            'exposed_assumptions': resolver.exposed_assumptions(self.id),
         }
 
 
@@ -520,7 +476,8 @@ class Assumption(models.Model):
         return "Global"
 
     def to_export_dict(self):
-        options_queryset = self.options.all().order_by('sort_order', 'id')
+        # Options are ordered by Meta.ordering, so a prefetch is reused.
+        options_queryset = self.options.all()
         options = []
         default_option_id = self.default_option_key or None
 
@@ -566,6 +523,17 @@ class AssumptionOption(models.Model):
     def __str__(self):
         return f"{self.assumption.label} – {self.label}"
 
+    def multiplier_matrix(self):
+        """
+        Return this option's effects as a PhaseMetricMatrix of multipliers
+        (1.0 where the option has no effect).
+        """
+        from .phase_matrix import PhaseMetricMatrix
+        matrix = PhaseMetricMatrix.ones()
+        for effect in self.effects.all():
+            matrix[effect.phase, effect.metric] = effect.multiplier
+        return matrix
+
 
 class AssumptionEffect(models.Model):
     """
@@ -607,6 +575,9 @@ class ProductComponent(models.Model):
         """Convert weight from grams to kilograms."""
         return self.weight_grams / 1000
 
+    # The get_*_impact helpers below use the raw material factors, before
+    # internal assumption multipliers; to_dict applies them when given.
+
     def get_greenhouse_gas_impact(self):
         """Calculate this component's total lifecycle greenhouse gas impact in kg CO2e.
         
@@ -705,10 +676,38 @@ class ProductComponent(models.Model):
             'end_of_life': weight_kg * self.material.end_of_life_land_m2_per_kg,
         }
 
-    def to_dict(self):
+    def get_impacts(self, multipliers=None):
+        """
+        Lifecycle impact per metric, summed over the material phases.
+
+        Args:
+            multipliers (list, optional): Internal assumption multiplier per
+                phase matrix cell, as from ``ProductEvaluation.component_multipliers``.
+                Without them the raw material factors are used.
+
+        Returns:
+            dict: ``{metric: value}``
+        """
+        weight_kg = self.get_weight_kg()
+        impacts = {}
+        for metric, suffix in METRIC_FIELD_SUFFIXES.items():
+            total = 0.0
+            for phase in MATERIAL_PHASES:
+                impact = weight_kg * getattr(self.material, f'{phase}_{suffix}_per_kg')
+                if multipliers is not None:
+                    impact *= multipliers[cell_index(phase, metric)]
+                total += impact
+            impacts[metric] = total
+        return impacts
+
+    def to_dict(self, multipliers=None):
         """
         Convert component to a dictionary suitable for JSON serialization.
-        
+
+        Args:
+            multipliers (list, optional): Internal assumption multipliers, so
+                the component impacts add up to the product's phase values.
+
         Returns:
             dict: Component data with material and calculated impacts
         """
@@ -716,11 +715,104 @@ class ProductComponent(models.Model):
             'id': self.id,
             'material_name': self.material.name,
             'weight_grams': self.weight_grams,
-            'impacts': {
-                'greenhouse_gas_kg': self.get_greenhouse_gas_impact(),
-                'water_liters': self.get_water_impact(),
-                'energy_kwh': self.get_energy_impact(),
-                'land_m2': self.get_land_impact(),
-                'cost_usd': self.get_cost_impact(),
-            }
+            'impacts': self.get_impacts(multipliers),
         }
+
+
+# (column, index scope abbreviation, index metric abbreviation) for every
+# ranked snapshot column. Index names must stay within 30 characters.
+SNAPSHOT_RANKING_INDEXES = [
+    (f'{scope}_{metric}', scope_abbr, metric_abbr)
+    for scope, scope_abbr in [
+        ('total', 'tot'), ('production', 'prd'), ('transport', 'trn'), ('end_of_life', 'eol'), ('use', 'use'),
+    ]
+    for metric, metric_abbr in [
+        ('greenhouse_gas_kg', 'ghg'), ('water_liters', 'wat'), ('energy_kwh', 'nrg'), ('land_m2', 'lnd'),
+        ('cost_usd', 'usd'),
+    ]
+]
+
+
+class ProductImpactSnapshot(models.Model):
+    """
+    Denormalized copy of a product's computed impacts.
+
+    Kept current by the signal handlers in ``products.signals``: edits to a
+    product, its components or a material recompute only the affected
+    products, while assumption edits mark snapshots stale so they are
+    recomputed on next read. Read paths use ``products.snapshots.get_snapshots``
+    instead of re-evaluating every product.
+    """
+    product = models.OneToOneField(
+        Product,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='impact_snapshot',
+    )
+    impacts = models.JSONField(default=dict, help_text="Annualized totals, as in Product.get_total_impact")
+    impacts_by_phase = models.JSONField(default=dict, help_text="Phase breakdown, as in Product.get_impact_by_phase")
+
+    # Annualized totals, duplicated as columns so lists can sort and filter on them.
+    total_greenhouse_gas_kg = models.FloatField(default=0)
+    total_water_liters = models.FloatField(default=0)
+    total_energy_kwh = models.FloatField(default=0)
+    total_land_m2 = models.FloatField(default=0)
+    total_cost_usd = models.FloatField(default=0)
+
+    # Phase values, duplicated as columns for the per-phase rankings.
+    production_greenhouse_gas_kg = models.FloatField(default=0)
+    production_water_liters = models.FloatField(default=0)
+    production_energy_kwh = models.FloatField(default=0)
+    production_land_m2 = models.FloatField(default=0)
+    production_cost_usd = models.FloatField(default=0)
+
+    transport_greenhouse_gas_kg = models.FloatField(default=0)
+    transport_water_liters = models.FloatField(default=0)
+    transport_energy_kwh = models.FloatField(default=0)
+    transport_land_m2 = models.FloatField(default=0)
+    transport_cost_usd = models.FloatField(default=0)
+
+    end_of_life_greenhouse_gas_kg = models.FloatField(default=0)
+    end_of_life_water_liters = models.FloatField(default=0)
+    end_of_life_energy_kwh = models.FloatField(default=0)
+    end_of_life_land_m2 = models.FloatField(default=0)
+    end_of_life_cost_usd = models.FloatField(default=0)
+
+    use_greenhouse_gas_kg = models.FloatField(default=0)
+    use_water_liters = models.FloatField(default=0)
+    use_energy_kwh = models.FloatField(default=0)
+    use_land_m2 = models.FloatField(default=0)
+    use_cost_usd = models.FloatField(default=0)
+
+    is_stale = models.BooleanField(default=True, db_index=True)
+    computed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Product impact snapshot"
+        # One (value, product) index per ranked column, so top-k queries read
+        # k index entries instead of sorting the catalog.
+        indexes = [
+            models.Index(fields=[field, 'product'], name=f'snapshot_{scope}_{metric}_idx')
+            for field, scope, metric in SNAPSHOT_RANKING_INDEXES
+        ]
+
+    def __str__(self):
+        return f"{self.product.name} impact snapshot"
+
+
+class CatalogVersion(models.Model):
+    """
+    Single row whose token changes whenever any assumption model changes.
+
+    Every process compares the token of its compiled ``AssumptionCatalog``
+    against this row on read, so an edit made by one server or worker process
+    invalidates the catalog in all of them. The token is written in the same
+    transaction as the edit, so a rollback restores the previous token.
+    """
+    token = models.CharField(max_length=32)
+
+    class Meta:
+        verbose_name = "Assumption catalog version"
+
+    def __str__(self):
+        return self.token
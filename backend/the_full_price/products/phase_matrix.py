@@ -0,0 +1,154 @@
+"""
+Compact phase × metric result type for The Full Price project.
+
+PhaseMetricMatrix stores the 4 lifecycle phases × 5 metrics of a product's
+impact (or of an assumption option's multipliers) in one flat float array
+instead of 20 nested ``{'value': ..., 'sources': [...]}`` dicts. The nested
+JSON shape is only produced by ``to_dict()`` at the serialization boundary.
+"""
+from array import array
+
+from .impact_engine import METRICS, PHASES
+
+N_PHASES = len(PHASES)
+N_METRICS = len(METRICS)
+SIZE = N_PHASES * N_METRICS
+
+PHASE_INDEX = {phase: index for index, phase in enumerate(PHASES)}
+METRIC_INDEX = {metric: index for index, metric in enumerate(METRICS)}
+
+_ZEROS = array('d', [0.0] * SIZE)
+_ONES = array('d', [1.0] * SIZE)
+
+
+def cell_index(phase, metric):
+    """Flat array index of a (phase, metric) cell."""
+    return PHASE_INDEX[phase] * N_METRICS + METRIC_INDEX[metric]
+
+
+class PhaseMetricMatrix:
+    """
+    Fixed 4 × 5 float matrix indexed by ``(phase, metric)``.
+
+    Supports elementwise ``+``, scaling by a number and ``apply`` of a
+    multiplier matrix, all returning new matrices.
+    """
+    __slots__ = ('data',)
+
+    def __init__(self, data=None):
+        """
+        Args:
+            data (iterable, optional): 20 floats in PHASES × METRICS order.
+                Defaults to zeros.
+        """
+        self.data = array('d', _ZEROS if data is None else data)
+        if len(self.data) != SIZE:
+            raise ValueError(f"PhaseMetricMatrix needs {SIZE} values, got {len(self.data)}")
+
+    @classmethod
+    def zeros(cls):
+        return cls(_ZEROS)
+
+    @classmethod
+    def ones(cls):
+        return cls(_ONES)
+
+    @classmethod
+    def from_nested(cls, phases):
+        """
+        Build from ``{phase: {metric: value}}`` or the serialized
+        ``{phase: {metric: {'value': value, ...}}}`` shape.
+        """
+        matrix = cls()
+        for phase, metrics in phases.items():
+            for metric, entry in metrics.items():
+                value = entry['value'] if isinstance(entry, dict) else entry
+                matrix.data[cell_index(phase, metric)] = value
+        return matrix
+
+    @classmethod
+    def from_phase_multipliers(cls, phase_multipliers):
+        """
+        Build a multiplier matrix from an option's sparse ``phase_multipliers``
+        dict. Cells without an effect keep a multiplier of 1.0; unknown phases
+        and metrics are ignored, as in the frontend.
+        """
+        matrix = cls.ones()
+        for phase, metrics in (phase_multipliers or {}).items():
+            if phase not in PHASE_INDEX:
+                continue
+            for metric, factor in (metrics or {}).items():
+                if metric in METRIC_INDEX and isinstance(factor, (int, float)):
+                    matrix.data[cell_index(phase, metric)] *= factor
+        return matrix
+
+    def __getitem__(self, key):
+        phase, metric = key
+        return self.data[cell_index(phase, metric)]
+
+    def __setitem__(self, key, value):
+        phase, metric = key
+        self.data[cell_index(phase, metric)] = value
+
+    def __eq__(self, other):
+        if not isinstance(other, PhaseMetricMatrix):
+            return NotImplemented
+        return self.data == other.data
+
+    def __repr__(self):
+        return f"PhaseMetricMatrix({list(self.data)!r})"
+
+    def __add__(self, other):
+        return PhaseMetricMatrix([a + b for a, b in zip(self.data, other.data)])
+
+    def scale(self, factor):
+        """Multiply every cell by a scalar."""
+        return PhaseMetricMatrix([value * factor for value in self.data])
+
+    def apply(self, multipliers):
+        """Multiply elementwise by another matrix (e.g. assumption multipliers)."""
+        return PhaseMetricMatrix([a * b for a, b in zip(self.data, multipliers.data)])
+
+    def row(self, phase):
+        """The five metric values of one phase, in METRICS order."""
+        start = PHASE_INDEX[phase] * N_METRICS
+        return self.data[start:start + N_METRICS]
+
+    def upfront(self):
+        """Per-metric sum of the production, transport and end-of-life phases."""
+        production = self.row('production')
+        transport = self.row('transport')
+        end_of_life = self.row('end_of_life')
+        return [production[m] + transport[m] + end_of_life[m] for m in range(N_METRICS)]
+
+    def to_dict(self, sources=None):
+        """
+        Produce the serialized ``{phase: {metric: {'value': ..., 'sources': [...]}}}`` shape.
+
+        Args:
+            sources (callable, optional): ``sources(phase, metric)`` returning
+                the provenance list for a cell. When omitted, entries carry
+                ``{'value': ...}`` only.
+        """
+        data = self.data
+        result = {}
+        for p, phase in enumerate(PHASES):
+            offset = p * N_METRICS
+            if sources is None:
+                result[phase] = {
+                    metric: {'value': data[offset + m]} for m, metric in enumerate(METRICS)
+                }
+            else:
+                result[phase] = {
+                    metric: {'value': data[offset + m], 'sources': sources(phase, metric)}
+                    for m, metric in enumerate(METRICS)
+                }
+        return result
+
+    def to_values(self):
+        """Plain ``{phase: {metric: value}}`` dict."""
+        data = self.data
+        return {
+            phase: {metric: data[p * N_METRICS + m] for m, metric in enumerate(METRICS)}
+            for p, phase in enumerate(PHASES)
+        }
@@ -0,0 +1,108 @@
+"""
+Per-metric product rankings for The Full Price project.
+
+Rankings read the impact snapshot columns (annualized totals and phase
+values), each backed by a ``(value, product)`` database index, so a top-k
+query walks k index entries instead of sorting the catalog. Ties are broken
+by product id so every ranking is a total order.
+
+Snapshots are created and refreshed by the signal handlers in
+``products.signals``; stale ones are recomputed before a ranking is read.
+A top-k read finds them through the ``is_stale`` index, so it costs O(k)
+when nothing is stale rather than a scan of the catalog.
+
+Usage:
+    top_products('greenhouse_gas_kg', k=10)                      # lowest totals
+    top_products('water_liters', k=5, phase='use', descending=True)
+    build_rankings()                                             # full, exportable index
+"""
+import numpy as np
+
+from .impact_engine import METRICS, PHASES
+from .models import ProductImpactSnapshot
+from .snapshots import refresh_stale_snapshots
+
+RANKING_SCOPES = ['total', *PHASES]
+
+DEFAULT_TOP_K = 10
+MAX_TOP_K = 100
+
+
+def ranking_field(metric, phase=None):
+    """
+    Snapshot column holding one metric for a scope.
+
+    Args:
+        metric (str): One of METRICS.
+        phase (str, optional): One of PHASES, or None for annualized totals.
+
+    Raises:
+        ValueError: If the metric or phase is unknown.
+    """
+    scope = phase or 'total'
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric: {metric}")
+    if scope not in RANKING_SCOPES:
+        raise ValueError(f"Unknown phase: {phase}")
+    return f'{scope}_{metric}'
+
+
+def top_products(metric, k=DEFAULT_TOP_K, phase=None, descending=False):
+    """
+    The k products with the lowest (or highest) value of a metric.
+
+    Args:
+        metric (str): One of METRICS.
+        k (int): Number of products to return.
+        phase (str, optional): Rank by this phase's value instead of the
+            annualized total.
+        descending (bool): Highest values first.
+
+    Returns:
+        list: ``[(ProductImpactSnapshot, value), ...]`` with the product
+        loaded, best first.
+    """
+    field = ranking_field(metric, phase)
+    refresh_stale_snapshots(missing=False)
+    direction = '-' if descending else ''
+    snapshots = (
+        ProductImpactSnapshot.objects
+        .select_related('product')
+        .order_by(f'{direction}{field}', f'{direction}product_id')[:k]
+    )
+    return [(snapshot, getattr(snapshot, field)) for snapshot in snapshots]
+
+
+def build_rankings():
+    """
+    Full ascending ranking for every metric and scope.
+
+    Reads every snapshot column in one query and sorts each column with
+    NumPy, breaking ties by product id.
+
+    Returns:
+        dict: {
+            'metrics': [...], 'scopes': ['total', *PHASES],
+            'products': [slug, ...],
+            'rankings': {metric: {scope: [product index, lowest value first]}},
+        }
+    """
+    refresh_stale_snapshots()
+    columns = [(scope, metric) for scope in RANKING_SCOPES for metric in METRICS]
+    fields = [f'{scope}_{metric}' for scope, metric in columns]
+    rows = list(
+        ProductImpactSnapshot.objects.order_by('product_id').values_list('product', 'product__slug', *fields)
+    )
+    product_ids = np.array([row[0] for row in rows], dtype=np.int64)
+    values = np.array([row[2:] for row in rows], dtype=np.float64).reshape(len(rows), len(fields))
+
+    rankings = {metric: {} for metric in METRICS}
+    for column, (scope, metric) in enumerate(columns):
+        rankings[metric][scope] = np.lexsort((product_ids, values[:, column])).tolist()
+
+    return {
+        'metrics': METRICS,
+        'scopes': RANKING_SCOPES,
+        'products': [row[1] for row in rows],
+        'rankings': rankings,
+    }
@@ -0,0 +1,121 @@
+"""
+Precomputed assumption scenarios for The Full Price project.
+
+The frontend lets users pick an option for every exposed assumption of a
+product. Rather than re-deriving impacts in the browser, the static export
+carries the results for every combination of options:
+
+- ``cube`` mode: phase values and annualized totals for every combination,
+  used when a product has at most ``cube_limit`` combinations;
+- ``factorized`` mode: the base phase values plus one multiplier vector per
+  option, used for products with many combinations. The combined multiplier
+  is the elementwise product of the selected options' vectors.
+
+Multiplier semantics mirror ``getPhaseMetricMultipliers`` in
+``frontend/src/utils/assumptions.js``: every cell starts at 1.0, the selected
+option of each assumption (falling back to its default) multiplies the cells
+it has effects for, and unknown phases or metrics are ignored.
+"""
+import math
+
+import numpy as np
+
+from .impact_engine import METRICS, PHASES, annualize
+from .phase_matrix import SIZE, PhaseMetricMatrix
+
+DEFAULT_CUBE_LIMIT = 64
+
+
+def selected_option(assumption, selected_id=None):
+    """Return the chosen option dict of an exposed assumption, or None."""
+    selected_id = selected_id or assumption.get('default_option_id')
+    for option in assumption.get('options') or []:
+        if option['id'] == selected_id:
+            return option
+    return None
+
+
+def selection_multipliers(exposed_assumptions, selections=None):
+    """
+    Combined PhaseMetricMatrix of multipliers for a set of selections.
+
+    Args:
+        exposed_assumptions (list): ``exposed_assumptions`` export dicts.
+        selections (dict, optional): ``{assumption_key: option_id}``; missing
+            keys use the assumption's default option.
+    """
+    selections = selections or {}
+    multipliers = PhaseMetricMatrix.ones()
+    for assumption in exposed_assumptions:
+        option = selected_option(assumption, selections.get(assumption['key']))
+        if option is not None:
+            multipliers = multipliers.apply(
+                PhaseMetricMatrix.from_phase_multipliers(option.get('phase_multipliers'))
+            )
+    return multipliers
+
+
+def build_scenarios(product_data, cube_limit=DEFAULT_CUBE_LIMIT):
+    """
+    Precompute assumption scenarios for one serialized product.
+
+    Args:
+        product_data (dict): Output of ``Product.to_dict``.
+        cube_limit (int): Largest number of combinations stored as a full cube.
+
+    Returns:
+        dict or None: Scenario table, or None when the product has no
+        exposed assumptions with options.
+    """
+    axes = [
+        assumption
+        for assumption in product_data['assumptions']['exposed_assumptions']
+        if assumption.get('options')
+    ]
+    if not axes:
+        return None
+
+    base = np.array(PhaseMetricMatrix.from_nested(product_data['impacts_by_phase']).data)
+    option_multipliers = [
+        np.array([
+            PhaseMetricMatrix.from_phase_multipliers(option.get('phase_multipliers')).data
+            for option in assumption['options']
+        ])
+        for assumption in axes
+    ]
+    sizes = [len(assumption['options']) for assumption in axes]
+
+    scenarios = {
+        'phases': PHASES,
+        'metrics': METRICS,
+        'keys': [assumption['key'] for assumption in axes],
+        'options': [[option['id'] for option in assumption['options']] for assumption in axes],
+        'defaults': [assumption.get('default_option_id') for assumption in axes],
+    }
+
+    if math.prod(sizes) > cube_limit:
+        scenarios['mode'] = 'factorized'
+        scenarios['base'] = base.tolist()
+        scenarios['multipliers'] = [multipliers.tolist() for multipliers in option_multipliers]
+        return scenarios
+
+    # Broadcast every assumption's (options × 20) multipliers along its own
+    # axis; combinations are laid out row-major in ``keys`` order.
+    cube = np.ones(sizes + [SIZE])
+    for axis, multipliers in enumerate(option_multipliers):
+        shape = [1] * len(sizes) + [SIZE]
+        shape[axis] = sizes[axis]
+        cube = cube * multipliers.reshape(shape)
+
+    phase_values = base * cube.reshape(-1, SIZE)
+    n_combinations = phase_values.shape[0]
+    totals = annualize(
+        phase_values.reshape(n_combinations, len(PHASES), len(METRICS)),
+        np.full(n_combinations, float(product_data['uses_per_year'] or 0)),
+        np.full(n_combinations, float(product_data['average_lifespan_uses'] or 0)),
+    )
+
+    scenarios['mode'] = 'cube'
+    scenarios['phase_values'] = phase_values.tolist()
+    scenarios['totals'] = totals.tolist()
+    return scenarios
@@ -0,0 +1,297 @@
+"""
+One-at-a-time sensitivity (tornado) analysis for The Full Price project.
+
+The base case selects the default option of every assumption, exposed and
+internal. Each option is then swapped in on its own, with every other
+assumption left at its default, and the change in phase values and
+annualized totals is recorded.
+
+Because assumptions act as multipliers, swapping an option only rescales
+the cells it touches by ``option / default``. All deltas for the catalog are
+therefore computed as array operations over (products × options × 20
+phase-metric cells) instead of re-running ``get_total_impact`` per option:
+
+- product assumptions rescale that product's base phase values;
+- material assumptions rescale the contribution of that material's
+  components in every product that contains it;
+- global assumptions rescale every product.
+
+Totals are annualized from the phase deltas, which is exact because
+annualization is linear in the phase values.
+
+Usage:
+    sensitivity = SensitivityEngine.for_products(Product.objects.all())
+    sensitivity.summary(product.id)   # {'base': ..., 'assumptions': [...], 'ranking': {...}}
+"""
+import numpy as np
+
+from .assumption_tables import default_matrices, default_multipliers, load_assumption_tables
+from .impact_engine import (
+    MATERIAL_PHASES,
+    METRICS,
+    PHASES,
+    annualize,
+    component_contributions,
+    load_arrays,
+)
+from .phase_matrix import SIZE
+
+N_MATERIAL_CELLS = len(MATERIAL_PHASES) * len(METRICS)
+
+
+class SensitivityEngine:
+    """
+    One-at-a-time option deltas for a set of products.
+
+    Attributes:
+        product_ids (np.ndarray): Product ids, one per row of ``base_totals``.
+        base_totals (np.ndarray): (products × 5) base case annualized totals.
+        row_products (np.ndarray): (R,) product row of each delta row.
+        row_assumptions (np.ndarray): (R,) assumption id of each delta row.
+        row_options (np.ndarray): (R,) option index of each delta row.
+        phase_deltas (np.ndarray): (R × 20) change in phase values.
+        total_deltas (np.ndarray): (R × 5) change in annualized totals.
+        assumptions (dict): ``{assumption id: metadata}`` with key, label,
+            scope, material name, exposed flag and option ids/labels.
+    """
+
+    def __init__(self, product_ids, base_totals, row_products, row_assumptions, row_options,
+                 phase_deltas, total_deltas, assumptions):
+        self.product_ids = product_ids
+        self.base_totals = base_totals
+        self.row_products = row_products
+        self.row_assumptions = row_assumptions
+        self.row_options = row_options
+        self.phase_deltas = phase_deltas
+        self.total_deltas = total_deltas
+        self.assumptions = assumptions
+        self._row_by_id = {int(pid): row for row, pid in enumerate(product_ids)}
+
+        # Group delta rows by product for per-product lookups.
+        self._order = np.argsort(row_products, kind='stable')
+        self._bounds = np.searchsorted(row_products[self._order], np.arange(len(product_ids) + 1))
+
+    @classmethod
+    def for_products(cls, products=None):
+        """
+        Compute every one-at-a-time delta for a product queryset (defaults to
+        every product).
+        """
+        arrays = load_arrays(products)
+        product_ids = arrays['product_ids']
+        params = arrays['product_params']
+        n_products = len(product_ids)
+        tables = load_assumption_tables(product_ids, arrays['material_ids'], exposed=None)
+
+        # Material contributions per (product, material) pair.
+        rows, materials, contributions = component_contributions(
+            product_ids, arrays['material_ids'], arrays['material_factors'], arrays['components']
+        )
+        pairs, pair_index = np.unique(
+            np.stack([rows, materials], axis=1), axis=0, return_inverse=True
+        )
+        pair_contributions = np.zeros((len(pairs), N_MATERIAL_CELLS))
+        np.add.at(pair_contributions, pair_index.ravel(), contributions)
+        pair_rows, pair_materials = pairs[:, 0], pairs[:, 1]
+
+        # Base case: every assumption at its default option.
+        product_defaults = default_multipliers(tables['product'], n_products)
+        material_defaults = default_multipliers(tables['material'], len(arrays['material_ids']))
+        global_defaults = default_matrices(tables['global']).prod(axis=0)
+
+        scaled_pairs = pair_contributions * material_defaults[pair_materials, :N_MATERIAL_CELLS]
+        base = np.zeros((n_products, SIZE))
+        np.add.at(base[:, :N_MATERIAL_CELLS], pair_rows, scaled_pairs)
+        base[:, N_MATERIAL_CELLS:] = params[:, 2:] * params[:, 0:1]
+        base *= product_defaults * global_defaults
+
+        row_products, row_assumptions, row_options, phase_deltas = [], [], [], []
+
+        def add(product_rows, table, assumption_index, option_index, deltas):
+            row_products.append(product_rows)
+            row_assumptions.append(table['ids'][assumption_index])
+            row_options.append(option_index)
+            phase_deltas.append(deltas)
+
+        # Product assumptions: one row per (assumption, option).
+        table = tables['product']
+        a, o = _option_pairs(table)
+        add(table['owners'][a], table, a, o, base[table['owners'][a]] * (_ratios(table)[a, o] - 1))
+
+        # Global assumptions: one row per (product, assumption, option).
+        table = tables['global']
+        a, o = _option_pairs(table)
+        ratios = _ratios(table)[a, o] - 1
+        add(
+            np.repeat(np.arange(n_products), len(a)),
+            table,
+            np.tile(a, n_products),
+            np.tile(o, n_products),
+            (base[:, None, :] * ratios[None]).reshape(-1, SIZE),
+        )
+
+        # Material assumptions: one row per (product containing the
+        # material, assumption, option).
+        table = tables['material']
+        a, o = _option_pairs(table)
+        by_material = np.argsort(table['owners'][a], kind='stable')
+        a, o = a[by_material], o[by_material]
+        option_materials = table['owners'][a]
+        starts = np.searchsorted(option_materials, pair_materials, side='left')
+        ends = np.searchsorted(option_materials, pair_materials, side='right')
+        counts = ends - starts
+        pair_of_row = np.repeat(np.arange(len(pairs)), counts)
+        option_of_row = np.concatenate(
+            [np.arange(start, end) for start, end in zip(starts, ends)]
+        ).astype(np.int64) if len(pairs) else np.zeros(0, dtype=np.int64)
+        deltas = np.zeros((len(pair_of_row), SIZE))
+        deltas[:, :N_MATERIAL_CELLS] = (
+            scaled_pairs[pair_of_row]
+            * (_ratios(table)[a[option_of_row], o[option_of_row], :N_MATERIAL_CELLS] - 1)
+        )
+        target_rows = pair_rows[pair_of_row]
+        deltas *= product_defaults[target_rows] * global_defaults
+        add(target_rows, table, a[option_of_row], o[option_of_row], deltas)
+
+        row_products = np.concatenate(row_products).astype(np.int64)
+        phase_deltas = np.concatenate(phase_deltas)
+        n_rows = len(row_products)
+        total_deltas = _annualize_rows(phase_deltas, params[row_products, 0], params[row_products, 1])
+        base_totals = _annualize_rows(base, params[:, 0], params[:, 1])
+
+        return cls(
+            product_ids,
+            base_totals,
+            row_products,
+            np.concatenate(row_assumptions).astype(np.int64).reshape(n_rows),
+            np.concatenate(row_options).astype(np.int64).reshape(n_rows),
+            phase_deltas,
+            total_deltas,
+            _assumption_metadata(tables),
+        )
+
+    def __contains__(self, product_id):
+        return product_id in self._row_by_id
+
+    def __len__(self):
+        return len(self.product_ids)
+
+    def rows(self, product_id):
+        """Delta row indices for one product."""
+        row = self._row_by_id[product_id]
+        return self._order[self._bounds[row]:self._bounds[row + 1]]
+
+    def summary(self, product_id):
+        """
+        Serializable tornado data for one product.
+
+        Returns:
+            dict: {
+                'base': {metric: base case total},
+                'assumptions': [{
+                    'id', 'key', 'label', 'scope', 'material', 'exposed',
+                    'options': [{'id', 'label', 'impacts': {metric: delta}}],
+                    'swing': {metric: largest minus smallest delta},
+                }, ...],
+                'ranking': {metric: [assumption ids, largest swing first]},
+            }
+        """
+        rows = self.rows(product_id)
+        by_assumption = {}
+        for row in rows:
+            by_assumption.setdefault(int(self.row_assumptions[row]), []).append(row)
+
+        entries = []
+        for assumption_id in sorted(by_assumption):
+            meta = self.assumptions[assumption_id]
+            option_rows = sorted(by_assumption[assumption_id], key=lambda row: self.row_options[row])
+            deltas = self.total_deltas[option_rows]
+            entries.append({
+                'id': assumption_id,
+                'key': meta['key'],
+                'label': meta['label'],
+                'scope': meta['scope'],
+                'material': meta['material'],
+                'exposed': meta['exposed'],
+                'options': [
+                    {
+                        'id': meta['options'][self.row_options[row]][0],
+                        'label': meta['options'][self.row_options[row]][1],
+                        'impacts': {metric: float(delta[m]) for m, metric in enumerate(METRICS)},
+                    }
+                    for row, delta in zip(option_rows, deltas)
+                ],
+                'swing': {
+                    metric: float(deltas[:, m].max() - deltas[:, m].min())
+                    for m, metric in enumerate(METRICS)
+                },
+            })
+
+        base = self.base_totals[self._row_by_id[product_id]]
+        return {
+            'base': {metric: float(base[m]) for m, metric in enumerate(METRICS)},
+            'assumptions': entries,
+            'ranking': {
+                metric: [
+                    entry['id']
+                    for entry in sorted(entries, key=lambda entry: -entry['swing'][metric])
+                    if entry['swing'][metric] > 0
+                ]
+                for metric in METRICS
+            },
+        }
+
+
+def _ratios(table):
+    """(assumptions × options × 20) option multipliers relative to the default."""
+    defaults = default_matrices(table)[:, None, :]
+    tables = table['tables']
+    return np.divide(tables, defaults, out=tables.copy(), where=defaults != 0)
+
+
+def _option_pairs(table):
+    """Flat (assumption index, option index) pairs for every real option."""
+    n_options = table['n_options']
+    assumption_index = np.repeat(np.arange(len(n_options)), n_options)
+    option_index = np.arange(n_options.sum()) - np.repeat(np.cumsum(n_options) - n_options, n_options)
+    return assumption_index, option_index
+
+
+def _annualize_rows(phase_values, uses_per_year, lifespan_uses):
+    """Annualize (rows × 20) phase values into (rows × 5) totals."""
+    return annualize(
+        phase_values.reshape(len(phase_values), len(PHASES), len(METRICS)),
+        uses_per_year,
+        lifespan_uses,
+    )
+
+
+def _assumption_metadata(tables):
+    """Labels and option ids for every assumption in the tables, in two queries."""
+    from .models import Assumption, AssumptionOption
+
+    ids = np.concatenate([table['ids'] for table in tables.values()]).tolist()
+    metadata = {}
+    for row in Assumption.objects.filter(id__in=ids).values(
+        'id', 'key', 'label', 'exposed', 'product_id', 'material__name'
+    ):
+        if row['product_id'] is not None:
+            scope = 'product'
+        elif row['material__name'] is not None:
+            scope = 'material'
+        else:
+            scope = 'global'
+        metadata[row['id']] = {
+            'key': row['key'],
+            'label': row['label'],
+            'exposed': row['exposed'],
+            'scope': scope,
+            'material': row['material__name'],
+            'options': [],
+        }
+    options = AssumptionOption.objects.filter(assumption_id__in=ids).values_list(
+        'assumption_id', 'option_key', 'label'
+    )
+    for assumption_id, option_key, label in options:
+        metadata[assumption_id]['options'].append((option_key, label))
+    return metadata
@@ -0,0 +1,106 @@
+"""
+Signal handlers that keep ProductImpactSnapshot rows and the compiled
+AssumptionCatalog current.
+
+Connected in ProductsConfig.ready().
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .assumption_catalog import bump_catalog_version
+from .models import (
+    Assumption,
+    AssumptionEffect,
+    AssumptionOption,
+    Material,
+    Product,
+    ProductComponent,
+    ProductImpactSnapshot,
+)
+from .snapshots import mark_stale, product_ids_using_material, refresh_snapshots
+
+
+@receiver(post_save, sender=Product)
+def refresh_product_snapshot(sender, instance, raw=False, **kwargs):
+    if raw:
+        # Fixture loading: components may not be loaded yet, so only leave a
+        # stale snapshot for the next read to recompute.
+        ProductImpactSnapshot.objects.update_or_create(product_id=instance.pk, defaults={'is_stale': True})
+        return
+    refresh_snapshots(Product.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=ProductComponent)
+def refresh_component_product_snapshot(sender, instance, raw=False, **kwargs):
+    if raw:
+        mark_stale(Product.objects.filter(pk=instance.product_id))
+        return
+    refresh_snapshots(Product.objects.filter(pk=instance.product_id))
+
+
+@receiver(post_delete, sender=ProductComponent)
+def invalidate_component_product_snapshot(sender, instance, **kwargs):
+    # Only flag the snapshot here: the component may be going away as part of
+    # deleting its product, and recomputing would recreate the snapshot row.
+    mark_stale(Product.objects.filter(pk=instance.product_id))
+
+
+@receiver(post_save, sender=Material)
+def refresh_material_product_snapshots(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    product_ids = product_ids_using_material(instance.pk)
+    if product_ids.exists():
+        refresh_snapshots(Product.objects.filter(pk__in=product_ids))
+
+
+@receiver(post_save, sender=Assumption)
+@receiver(post_delete, sender=Assumption)
+@receiver(post_save, sender=AssumptionOption)
+@receiver(post_delete, sender=AssumptionOption)
+@receiver(post_save, sender=AssumptionEffect)
+@receiver(post_delete, sender=AssumptionEffect)
+def invalidate_assumption_catalog(sender, instance, **kwargs):
+    bump_catalog_version()
+
+
+@receiver(post_save, sender=Assumption)
+@receiver(post_delete, sender=Assumption)
+def invalidate_assumption_snapshots(sender, instance, **kwargs):
+    _mark_assumption_scope_stale(instance.product_id, instance.material_id)
+
+
+@receiver(post_save, sender=AssumptionOption)
+@receiver(post_delete, sender=AssumptionOption)
+def invalidate_option_snapshots(sender, instance, **kwargs):
+    _mark_assumption_stale(instance.assumption_id)
+
+
+@receiver(post_save, sender=AssumptionEffect)
+@receiver(post_delete, sender=AssumptionEffect)
+def invalidate_effect_snapshots(sender, instance, **kwargs):
+    assumption_id = (
+        AssumptionOption.objects.filter(pk=instance.option_id)
+        .values_list('assumption_id', flat=True)
+        .first()
+    )
+    _mark_assumption_stale(assumption_id)
+
+
+def _mark_assumption_stale(assumption_id):
+    scope = Assumption.objects.filter(pk=assumption_id).values('product_id', 'material_id').first()
+    if scope is None:
+        # The parent row is already gone; fall back to invalidating everything.
+        mark_stale()
+        return
+    _mark_assumption_scope_stale(scope['product_id'], scope['material_id'])
+
+
+def _mark_assumption_scope_stale(product_id, material_id):
+    """Mark stale the snapshots an assumption with this scope can affect."""
+    if product_id:
+        mark_stale(Product.objects.filter(pk=product_id))
+    elif material_id:
+        mark_stale(Product.objects.filter(pk__in=product_ids_using_material(material_id)))
+    else:
+        mark_stale()
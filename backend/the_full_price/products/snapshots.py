@@ -0,0 +1,146 @@
+"""
+Materialized impact snapshots for The Full Price project.
+
+Each product's computed impacts are stored in a ProductImpactSnapshot row so
+list/detail views, the admin and the static exporter can read them instead of
+re-evaluating every product. The signal handlers in ``products.signals`` keep
+snapshots current:
+
+- product, component and material edits recompute only the affected products
+  (materials find their products through the component table's material index);
+- assumption edits mark the affected snapshots stale in one bulk update, and
+  stale snapshots are recomputed in a batch on next read.
+"""
+from django.utils import timezone
+
+from .impact_engine import METRICS, PHASES, ImpactEngine
+from .models import Product, ProductComponent, ProductImpactSnapshot
+
+SNAPSHOT_UPDATE_FIELDS = [
+    'impacts',
+    'impacts_by_phase',
+    *[f'total_{metric}' for metric in METRICS],
+    *[f'{phase}_{metric}' for phase in PHASES for metric in METRICS],
+    'is_stale',
+    'computed_at',
+]
+
+
+def product_ids_using_material(material_id):
+    """Reverse index lookup: ids of the products that contain a material."""
+    return ProductComponent.objects.filter(material_id=material_id).values_list('product_id', flat=True)
+
+
+def refresh_snapshots(products=None, batch_size=500):
+    """
+    Recompute and store snapshots for a product queryset (defaults to all).
+
+    Values come from one ImpactEngine pass over the whole queryset; components
+    and materials are prefetched so sources are built without per-product
+    queries.
+
+    Returns:
+        dict: {product_id: ProductImpactSnapshot} for the refreshed products.
+    """
+    if products is None:
+        products = Product.objects.all()
+
+    engine = ImpactEngine.for_products(products)
+    computed_at = timezone.now()
+    snapshots = []
+    for product in products.prefetch_related('components__material'):
+        evaluation = product.evaluate(engine=engine)
+        totals = evaluation.totals
+        phases = evaluation.phases
+        snapshots.append(ProductImpactSnapshot(
+            product=product,
+            impacts=totals,
+            impacts_by_phase=evaluation.phases,
+            is_stale=False,
+            computed_at=computed_at,
+            **{f'total_{metric}': totals[metric]['value'] for metric in METRICS},
+            **{
+                f'{phase}_{metric}': phases[phase][metric]['value']
+                for phase in PHASES for metric in METRICS
+            },
+        ))
+
+    ProductImpactSnapshot.objects.bulk_create(
+        snapshots,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['product'],
+        update_fields=SNAPSHOT_UPDATE_FIELDS,
+    )
+    return {snapshot.product_id: snapshot for snapshot in snapshots}
+
+
+def mark_stale(products=None):
+    """
+    Flag snapshots for recomputation with a single UPDATE.
+
+    Args:
+        products (QuerySet, optional): Products to invalidate. Defaults to all.
+
+    Returns:
+        int: Number of snapshots marked stale.
+    """
+    snapshots = ProductImpactSnapshot.objects.all()
+    if products is not None:
+        snapshots = snapshots.filter(product__in=products.order_by().values('id'))
+    return snapshots.filter(is_stale=False).update(is_stale=True)
+
+
+def refresh_stale_snapshots(batch_size=500, missing=True):
+    """
+    Recompute every stale (and by default every missing) snapshot,
+    ``batch_size`` products at a time, so memory does not grow with the
+    number of outdated products.
+
+    Used before reading across the whole catalog (the export, the ranking
+    and alternatives indexes), where the snapshot columns must be current
+    for every product.
+
+    Args:
+        batch_size (int): Products recomputed per batch.
+        missing (bool): Also create snapshots for products that have none,
+            which scans every product. With False only the ``is_stale``
+            index is read, so a request path pays for the stale snapshots
+            and nothing else; every product gets a snapshot when it is
+            saved (see ``products.signals``).
+
+    Returns:
+        int: Number of snapshots recomputed.
+    """
+    if missing:
+        outdated = Product.objects.exclude(impact_snapshot__is_stale=False).order_by('id')
+        outdated_ids = outdated.values_list('id', flat=True)
+        key = 'id'
+    else:
+        outdated = ProductImpactSnapshot.objects.filter(is_stale=True).order_by('product_id')
+        outdated_ids = outdated.values_list('product_id', flat=True)
+        key = 'product_id'
+    refreshed = 0
+    last_id = 0
+    while True:
+        ids = list(outdated_ids.filter(**{f'{key}__gt': last_id})[:batch_size])
+        if not ids:
+            return refreshed
+        refreshed += len(refresh_snapshots(Product.objects.filter(pk__in=ids), batch_size=batch_size))
+        last_id = ids[-1]
+
+
+def get_snapshots(products):
+    """
+    Return fresh snapshots for a product queryset.
+
+    Missing or stale snapshots are recomputed in one batch first.
+
+    Returns:
+        dict: {product_id: ProductImpactSnapshot}
+    """
+    outdated = products.exclude(impact_snapshot__is_stale=False)
+    if outdated.exists():
+        refresh_snapshots(outdated)
+    snapshots = ProductImpactSnapshot.objects.filter(product__in=products.order_by().values('id'))
+    return {snapshot.product_id: snapshot for snapshot in snapshots}
@@ -0,0 +1,323 @@
+"""
+Monte Carlo uncertainty engine for The Full Price project.
+
+``seed_assumptions`` gives every product and material internal (non-exposed)
+low/base/high "Production factor", "Transport factor", "End of Life factor"
+and "Use factor" assumptions. This module samples the options of those
+assumptions for thousands of draws across the catalog at once and reports
+percentiles of the resulting phase values and annualized totals.
+
+Scoping follows the Assumption model:
+
+- product assumptions scale that product's phase values;
+- material assumptions scale the contribution of every component made of
+  that material, with one draw per material shared by all its products;
+- global assumptions scale every product.
+
+Every assumption draws from its own random stream seeded with
+``(seed, assumption id)``, so results are reproducible and do not depend on
+how products are split into blocks or across worker processes.
+
+Usage:
+    uncertainty = UncertaintyEngine.for_products(Product.objects.all(), draws=2000, jobs=4)
+    uncertainty.summary(product.id)   # {'impacts': {'greenhouse_gas_kg': {'p5': ..., ...}}, ...}
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .assumption_tables import combine_multipliers, load_assumption_tables
+from .impact_engine import (
+    MATERIAL_PHASES,
+    METRICS,
+    PHASES,
+    annualize,
+    component_contributions,
+    load_arrays,
+)
+from .phase_matrix import SIZE
+
+DEFAULT_DRAWS = 1000
+DEFAULT_SEED = 0
+PERCENTILES = (5, 50, 95)
+
+# How options are sampled:
+#   discrete   - pick one option, each with equal probability
+#   uniform    - continuous, between the lowest and highest option multiplier
+#   triangular - continuous, between the lowest and highest option multiplier,
+#                peaking at the default option
+DISTRIBUTIONS = ('discrete', 'uniform', 'triangular')
+
+N_MATERIAL_CELLS = len(MATERIAL_PHASES) * len(METRICS)
+
+# Draws scaled together per component; bounds the per-component buffer.
+DRAW_CHUNK = 128
+
+
+class UncertaintyEngine:
+    """
+    Percentiles of sampled impacts for a set of products.
+
+    Attributes:
+        product_ids (np.ndarray): Product ids, one per row of the result arrays.
+        phase_percentiles (np.ndarray): (products × percentiles × 4 phases × 5 metrics).
+        total_percentiles (np.ndarray): (products × percentiles × 5 metrics).
+        draws (int): Number of samples per product.
+        seed (int): Base random seed.
+        distribution (str): One of DISTRIBUTIONS.
+    """
+
+    def __init__(self, product_ids, phase_percentiles, total_percentiles, draws, seed, distribution):
+        self.product_ids = product_ids
+        self.phase_percentiles = phase_percentiles
+        self.total_percentiles = total_percentiles
+        self.draws = draws
+        self.seed = seed
+        self.distribution = distribution
+        self._row_by_id = {int(pid): row for row, pid in enumerate(product_ids)}
+
+    @classmethod
+    def for_products(cls, products=None, draws=DEFAULT_DRAWS, seed=DEFAULT_SEED,
+                     distribution='discrete', jobs=1, block_size=256):
+        """
+        Simulate a product queryset (defaults to every product).
+
+        Args:
+            products (QuerySet, optional): Products to simulate.
+            draws (int): Samples per product.
+            seed (int): Base random seed.
+            distribution (str): One of DISTRIBUTIONS.
+            jobs (int): Worker processes. 1 runs in-process.
+            block_size (int): Products simulated together; each block is one
+                unit of work for the process pool.
+        """
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown distribution {distribution!r}; expected one of {', '.join(DISTRIBUTIONS)}"
+            )
+        arrays = load_arrays(products)
+        assumptions = load_assumption_tables(arrays['product_ids'], arrays['material_ids'])
+        blocks = _build_blocks(arrays, assumptions, draws, seed, distribution, block_size)
+
+        if jobs > 1 and len(blocks) > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = list(executor.map(simulate_block, blocks))
+        else:
+            results = [simulate_block(block) for block in blocks]
+
+        n_products = len(arrays['product_ids'])
+        n_percentiles = len(PERCENTILES)
+        phase_percentiles = np.empty((n_products, n_percentiles, len(PHASES), len(METRICS)))
+        total_percentiles = np.empty((n_products, n_percentiles, len(METRICS)))
+        for block, (phases, totals) in zip(blocks, results):
+            rows = slice(block['start'], block['start'] + len(phases))
+            phase_percentiles[rows] = phases
+            total_percentiles[rows] = totals
+
+        return cls(arrays['product_ids'], phase_percentiles, total_percentiles, draws, seed, distribution)
+
+    def __contains__(self, product_id):
+        return product_id in self._row_by_id
+
+    def __len__(self):
+        return len(self.product_ids)
+
+    def summary(self, product_id):
+        """
+        Serializable percentiles for one product.
+
+        Returns:
+            dict: {
+                'draws': ..., 'seed': ..., 'distribution': ..., 'percentiles': [5, 50, 95],
+                'impacts': {metric: {'p5': ..., 'p50': ..., 'p95': ...}},
+                'impacts_by_phase': {phase: {metric: {'p5': ..., ...}}},
+            }
+        """
+        row = self._row_by_id[product_id]
+        phases = self.phase_percentiles[row]
+        totals = self.total_percentiles[row]
+        labels = [f'p{percentile}' for percentile in PERCENTILES]
+        return {
+            'draws': self.draws,
+            'seed': self.seed,
+            'distribution': self.distribution,
+            'percentiles': list(PERCENTILES),
+            'impacts': {
+                metric: {label: float(totals[i, m]) for i, label in enumerate(labels)}
+                for m, metric in enumerate(METRICS)
+            },
+            'impacts_by_phase': {
+                phase: {
+                    metric: {label: float(phases[i, p, m]) for i, label in enumerate(labels)}
+                    for m, metric in enumerate(METRICS)
+                }
+                for p, phase in enumerate(PHASES)
+            },
+        }
+
+
+def _take(table, mask, owners=None):
+    """Subset an assumption table, optionally remapping its owners."""
+    subset = {key: values[mask] for key, values in table.items()}
+    if owners is not None:
+        subset['owners'] = owners
+    return subset
+
+
+def _build_blocks(arrays, assumptions, draws, seed, distribution, block_size):
+    """
+    Split the catalog into self-contained blocks of products.
+
+    Each block carries only the components, materials and assumptions its
+    products need, with owners remapped to block-local indices, so a worker
+    process can simulate it without database access.
+    """
+    product_ids = arrays['product_ids']
+    params = arrays['product_params']
+    component_rows, component_materials, contributions = component_contributions(
+        product_ids, arrays['material_ids'], arrays['material_factors'], arrays['components']
+    )
+
+    # Sort components by product so each block takes a contiguous slice.
+    by_row = np.argsort(component_rows, kind='stable')
+    component_rows = component_rows[by_row]
+    component_materials = component_materials[by_row]
+    contributions = contributions[by_row]
+
+    product_assumptions = assumptions['product']
+    material_assumptions = assumptions['material']
+
+    blocks = []
+    for start in range(0, len(product_ids), block_size):
+        end = min(start + block_size, len(product_ids))
+        lo, hi = np.searchsorted(component_rows, [start, end])
+        materials, local_materials = np.unique(component_materials[lo:hi], return_inverse=True)
+
+        in_block = (product_assumptions['owners'] >= start) & (product_assumptions['owners'] < end)
+        used = np.isin(material_assumptions['owners'], materials)
+
+        blocks.append({
+            'start': start,
+            'draws': draws,
+            'seed': seed,
+            'distribution': distribution,
+            'uses_per_year': params[start:end, 0],
+            'lifespan_uses': params[start:end, 1],
+            'annual_use': params[start:end, 2:] * params[start:end, 0:1],
+            'component_rows': component_rows[lo:hi] - start,
+            'component_materials': local_materials,
+            'contributions': contributions[lo:hi],
+            'n_materials': len(materials),
+            'product_assumptions': _take(
+                product_assumptions, in_block, product_assumptions['owners'][in_block] - start
+            ),
+            'material_assumptions': _take(
+                material_assumptions, used,
+                np.searchsorted(materials, material_assumptions['owners'][used]),
+            ),
+            'global_assumptions': assumptions['global'],
+        })
+    return blocks
+
+
+def sample_multipliers(table, draws, seed, distribution):
+    """
+    Sample multipliers for every assumption in a table.
+
+    Returns:
+        np.ndarray: (assumptions × draws × 20) multipliers.
+    """
+    n_assumptions = len(table['ids'])
+    if n_assumptions == 0:
+        return np.ones((0, draws, SIZE))
+
+    uniforms = np.stack(
+        [np.random.default_rng([seed, int(aid)]).random(draws) for aid in table['ids']]
+    )
+    tables = table['tables']
+
+    if distribution == 'discrete':
+        n_options = table['n_options'][:, None]
+        choice = np.minimum((uniforms * n_options).astype(np.int64), n_options - 1)
+        return tables[np.arange(n_assumptions)[:, None], choice]
+
+    # Padding rows hold 1.0 and must not widen the range.
+    valid = np.arange(tables.shape[1])[None, :, None] < table['n_options'][:, None, None]
+    low = np.where(valid, tables, np.inf).min(axis=1)[:, None, :]
+    high = np.where(valid, tables, -np.inf).max(axis=1)[:, None, :]
+    u = uniforms[:, :, None]
+
+    if distribution == 'uniform':
+        return low + u * (high - low)
+
+    mode = tables[np.arange(n_assumptions), table['defaults']][:, None, :]
+    spread = high - low
+    split = (mode - low) / np.where(spread > 0, spread, 1.0)
+    lower = low + np.sqrt(u * spread * (mode - low))
+    upper = high - np.sqrt((1 - u) * spread * (high - mode))
+    return np.where(u < split, lower, upper)
+
+
+def simulate_block(block):
+    """
+    Simulate one block of products.
+
+    Module-level so it can run in a worker process. Arrays are laid out
+    owner-major (products or materials × draws × cells) so gathers by owner
+    read contiguous memory.
+
+    Returns:
+        tuple: (products × percentiles × 4 × 5) phase percentiles and
+        (products × percentiles × 5) total percentiles.
+    """
+    draws = block['draws']
+    seed = block['seed']
+    distribution = block['distribution']
+    n_products = len(block['uses_per_year'])
+    n_phases = len(PHASES)
+    n_metrics = len(METRICS)
+
+    product_multipliers = combine_multipliers(
+        block['product_assumptions'],
+        sample_multipliers(block['product_assumptions'], draws, seed, distribution),
+        n_products,
+    )
+    material_multipliers = combine_multipliers(
+        block['material_assumptions'],
+        sample_multipliers(block['material_assumptions'], draws, seed, distribution),
+        block['n_materials'],
+    )[:, :, :N_MATERIAL_CELLS]
+    global_multipliers = sample_multipliers(
+        block['global_assumptions'], draws, seed, distribution
+    ).prod(axis=0)
+
+    component_rows = block['component_rows']
+    component_materials = block['component_materials']
+    contributions = block['contributions'][:, None, :]
+    rows_with_components, starts = np.unique(component_rows, return_index=True)
+
+    phase_values = np.empty((n_products, draws, SIZE))
+    phase_values[:, :, N_MATERIAL_CELLS:] = block['annual_use'][:, None, :]
+    phase_values[:, :, :N_MATERIAL_CELLS] = 0.0
+    if len(component_rows):
+        for lo in range(0, draws, DRAW_CHUNK):
+            hi = min(lo + DRAW_CHUNK, draws)
+            scaled = contributions * material_multipliers[component_materials, lo:hi]
+            phase_values[rows_with_components, lo:hi, :N_MATERIAL_CELLS] = np.add.reduceat(
+                scaled, starts, axis=0
+            )
+    phase_values *= product_multipliers
+    phase_values *= global_multipliers
+
+    totals = annualize(
+        phase_values.reshape(n_products * draws, n_phases, n_metrics),
+        np.repeat(block['uses_per_year'], draws),
+        np.repeat(block['lifespan_uses'], draws),
+    ).reshape(n_products, draws, n_metrics)
+
+    phase_percentiles = np.percentile(phase_values, PERCENTILES, axis=1)
+    total_percentiles = np.percentile(totals, PERCENTILES, axis=1)
+    return (
+        phase_percentiles.transpose(1, 0, 2).reshape(n_products, len(PERCENTILES), n_phases, n_metrics),
+        total_percentiles.transpose(1, 0, 2),
+    )
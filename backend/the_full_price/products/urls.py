@@ -4,7 +4,12 @@ URL routing for products API endpoints.
 from django.urls import path
 from . import views
 
+# Fixed routes sit next to <slug>/: add each one to RESERVED_PRODUCT_SLUGS
+# in products.models so no product slug can shadow it.
 urlpatterns = [
     path('', views.product_list, name='product-list'),
+    path('break-even/', views.break_even, name='product-break-even'),
+    path('top/', views.top_products, name='product-top'),
     path('<slug:slug>/', views.product_detail, name='product-detail'),
+    path('<slug:slug>/alternatives/', views.product_alternatives, name='product-alternatives'),
 ]
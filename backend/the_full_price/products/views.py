@@ -4,20 +4,65 @@ These views are minimal since we're primarily generating static JSON data.
 They're here for reference and for development purposes.
 """
 import json
-from django.http import JsonResponse
+from django.http import HttpResponse
+from .alternatives import DEFAULT_ALTERNATIVES, N_NEIGHBOURS, get_alternatives_index
+from .assumption_catalog import get_assumption_catalog
+from .breakeven import BreakEvenMatrix
+from .evaluation import load_multipliers
+from .impact_engine import METRICS
+from .json_encoder import get_encoder
 from .models import Product
+from .rankings import DEFAULT_TOP_K, MAX_TOP_K, top_products as rank_products
+from .snapshots import get_snapshots
+
+
+def json_response(data, status=200):
+    """
+    A JSON response encoded with the configured encoder (see
+    ``json_encoder``) rather than ``JsonResponse``'s stdlib encoder.
+    """
+    return HttpResponse(get_encoder().encode(data), content_type='application/json', status=status)
+
+
+def include_sources(request):
+    """Whether the request wants provenance; ``?sources=0`` returns values only."""
+    return request.GET.get('sources', '1').lower() not in ('0', 'false', 'no')
 
 
 def product_list(request):
     """
     API endpoint that returns all products with their impacts.
     In production, this data is pre-generated as static JSON.
+
+    Optional ``?sort=<metric>`` (or ``-<metric>`` for descending) orders the
+    list by annualized total impact, read from the impact snapshots.
+    ``?sources=0`` omits provenance and returns values only.
     """
     products = Product.objects.all()
+    sort = request.GET.get('sort')
+    if sort:
+        metric = sort.lstrip('-')
+        if metric not in METRICS:
+            return json_response({'error': f'Unknown metric: {metric}'}, status=400)
+    snapshots = get_snapshots(products)
+    if sort:
+        direction = '-' if sort.startswith('-') else ''
+        products = products.order_by(f'{direction}impact_snapshot__total_{metric}', 'name')
+    products = products.prefetch_related('components__material')
+    assumptions = get_assumption_catalog().resolver
+    multipliers = load_multipliers(products)
     data = {
-        'products': [product.to_dict() for product in products]
+        'products': [
+            product.to_dict(
+                snapshot=snapshots[product.id],
+                include_sources=include_sources(request),
+                assumptions=assumptions,
+                multipliers=multipliers[product.id],
+            )
+            for product in products
+        ]
     }
-    return JsonResponse(data)
+    return json_response(data)
 
 
 def product_detail(request, slug):
@@ -27,6 +72,117 @@ def product_detail(request, slug):
     """
     try:
         product = Product.objects.get(slug=slug)
-        return JsonResponse(product.to_dict())
+        snapshots = get_snapshots(Product.objects.filter(pk=product.pk))
+        return json_response(
+            product.to_dict(
+                snapshot=snapshots[product.id],
+                include_sources=include_sources(request),
+                assumptions=get_assumption_catalog().resolver,
+            )
+        )
+    except Product.DoesNotExist:
+        return json_response({'error': 'Product not found'}, status=404)
+
+
+def product_alternatives(request, slug):
+    """
+    API endpoint for similar products with a lower impact.
+
+    Alternatives are the product's nearest neighbours on price, uses per year
+    and annualized totals whose total is lower on the metric. ``?metric=``
+    limits the response to one metric and ``?k=`` (default 5, at most 32)
+    sets how many alternatives are listed per metric.
+    """
+    metric = request.GET.get('metric')
+    if metric is not None and metric not in METRICS:
+        return json_response({'error': f'Unknown metric: {metric}'}, status=400)
+    try:
+        k = int(request.GET.get('k', DEFAULT_ALTERNATIVES))
+    except ValueError:
+        return json_response({'error': 'k must be an integer'}, status=400)
+    if not 1 <= k <= N_NEIGHBOURS:
+        return json_response({'error': f'k must be between 1 and {N_NEIGHBOURS}'}, status=400)
+
+    try:
+        product = Product.objects.get(slug=slug)
     except Product.DoesNotExist:
-        return JsonResponse({'error': 'Product not found'}, status=404)
+        return json_response({'error': 'Product not found'}, status=404)
+
+    index = get_alternatives_index()
+    metrics = [metric] if metric else METRICS
+    return json_response({
+        'product': product.slug,
+        'alternatives': {m: index.alternatives(product.id, m, k) for m in metrics},
+    })
+
+
+def break_even(request):
+    """
+    API endpoint for pairwise break-even years.
+
+    Without parameters, returns the compact index of every pair (the export
+    writes the same data sharded per product, under ``break-even/``). With ``?a=<slug>&b=<slug>``,
+    returns the line parameters and crossing year of one pair for every
+    metric.
+    """
+    slug_a = request.GET.get('a')
+    slug_b = request.GET.get('b')
+    if not slug_a and not slug_b:
+        return json_response(BreakEvenMatrix.for_products().to_index())
+    if not slug_a or not slug_b:
+        return json_response({'error': 'Both a and b product slugs are required'}, status=400)
+
+    products = Product.objects.filter(slug__in=[slug_a, slug_b])
+    matrix = BreakEvenMatrix.for_products(products)
+    try:
+        metrics = {metric: matrix.pair(slug_a, slug_b, metric) for metric in METRICS}
+    except KeyError:
+        return json_response({'error': 'Product not found'}, status=404)
+    return json_response({'products': [slug_a, slug_b], 'metrics': metrics})
+
+
+def top_products(request):
+    """
+    API endpoint for the k products with the lowest impact on one metric.
+
+    ``?metric=<metric>`` is required. ``?k=`` defaults to 10 (at most 100),
+    ``?phase=<phase>`` ranks by one lifecycle phase instead of the annualized
+    total, and ``?order=desc`` returns the highest values first.
+    """
+    metric = request.GET.get('metric')
+    if metric not in METRICS:
+        return json_response({'error': f'Unknown metric: {metric}'}, status=400)
+    phase = request.GET.get('phase') or None
+    order = request.GET.get('order', 'asc')
+    if order not in ('asc', 'desc'):
+        return json_response({'error': f'Unknown order: {order}'}, status=400)
+    try:
+        k = int(request.GET.get('k', DEFAULT_TOP_K))
+    except ValueError:
+        return json_response({'error': 'k must be an integer'}, status=400)
+    if not 1 <= k <= MAX_TOP_K:
+        return json_response({'error': f'k must be between 1 and {MAX_TOP_K}'}, status=400)
+
+    try:
+        ranked = rank_products(metric, k=k, phase=phase, descending=order == 'desc')
+    except ValueError as e:
+        return json_response({'error': str(e)}, status=400)
+
+    return json_response({
+        'metric': metric,
+        'phase': phase or 'total',
+        'order': order,
+        'k': k,
+        'products': [
+            {
+                'rank': rank,
+                'id': snapshot.product.id,
+                'name': snapshot.product.name,
+                'slug': snapshot.product.slug,
+                'purchase_price_usd': snapshot.product.purchase_price_usd,
+                'value': value,
+                'impacts': {m: getattr(snapshot, f'total_{m}') for m in METRICS},
+            }
+            for rank, (snapshot, value) in enumerate(ranked, start=1)
+        ],
+    })
@@ -89,3 +89,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Path where static JSON data will be exported
 # Exports to frontend/public/data so Vite serves it correctly
 STATIC_DATA_OUTPUT_DIR = BASE_DIR.parent / 'frontend' / 'public' / 'data'
+
+# JSON encoder for the static export and API responses:
+# 'auto' (orjson, then msgspec, then stdlib), 'orjson', 'msgspec' or 'stdlib'
+JSON_ENCODER = 'auto'
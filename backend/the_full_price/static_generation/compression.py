@@ -0,0 +1,55 @@
+"""
+Precompressed variants of exported files for static hosting.
+
+Static hosts and CDNs can serve ``products.json.gz`` or ``products.json.br``
+directly when a browser accepts the encoding, instead of compressing on
+every request (or not at all). Both are written at maximum level; gzip
+output carries no timestamp or file name, so it is deterministic.
+
+Brotli needs the optional ``brotli`` package; without it only ``.gz``
+variants are written.
+"""
+import gzip
+import hashlib
+import shutil
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+CHUNK_SIZE = 1 << 20
+
+
+def encodings():
+    """File suffixes of the variants this environment can write."""
+    return ['.gz', '.br'] if brotli is not None else ['.gz']
+
+
+def compress_file(source, target, suffix):
+    """
+    Write the compressed variant of ``source`` to ``target``, in chunks.
+
+    Args:
+        source (Path): File to compress.
+        target (Path): Variant to write.
+        suffix (str): ``'.gz'`` or ``'.br'``.
+
+    Returns:
+        str: sha256 hex digest of the variant.
+    """
+    with open(source, 'rb') as infile, open(target, 'wb') as outfile:
+        if suffix == '.gz':
+            with gzip.GzipFile(filename='', mode='wb', fileobj=outfile, compresslevel=9, mtime=0) as gz:
+                shutil.copyfileobj(infile, gz, CHUNK_SIZE)
+        else:
+            compressor = brotli.Compressor(quality=11)
+            for chunk in iter(lambda: infile.read(CHUNK_SIZE), b''):
+                outfile.write(compressor.process(chunk))
+            outfile.write(compressor.finish())
+
+    digest = hashlib.sha256()
+    with open(target, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
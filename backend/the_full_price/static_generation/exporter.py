@@ -4,18 +4,84 @@ Static data exporter for The Full Price project.
 This module handles exporting all product and post data to static JSON files.
 This allows the React frontend to be completely static (no server required at runtime).
 
+Output is deterministic: keys are sorted and data files carry no timestamp.
+``manifest.json`` records a content hash for every file and the time of the
+last export that changed anything. Files whose hash matches the previous
+manifest are not rewritten, files listed there but no longer exported (a
+deleted post or product) are removed, so a rebuild only touches what
+actually changed.
+
+``export_all`` builds into a staging directory next to the output directory:
+unchanged files are hardlinked from the live export, changed ones written,
+and the finished directory is swapped in atomically (see ``staging``), so
+readers never see a partial export. The individual ``export_*`` methods
+write into the output directory directly.
+
+The ``dist`` profile ships smaller, cache-friendly files: minified JSON,
+``.gz``/``.br`` siblings of every file (see ``compression``) and
+content-hashed names for the top-level files (``products.3f9a1c2e.json``).
+The manifest's ``paths`` map logical to hashed names for the frontend
+loader; per-product and per-post files keep their names, so the manifest
+does not grow with the catalog.
+
+The optional columnar export is for typed-array loading: the phase and
+total impact values of every product, in ``products.json`` order, as one
+little-endian float buffer (``products-columns.bin``) that the browser wraps
+in a ``Float32Array`` or ``Float64Array`` without parsing. Its header,
+``products-columns.json``, names the columns and dtype, and
+``products-columns-slugs.json`` the rows, as product slugs.
+
+With ``jobs > 1``, products and posts are serialized in a pool of worker
+processes, each with its own database connection (see ``workers``). Ids
+are split into chunks in export order and results are merged back in that
+order, so the output does not depend on the number of workers.
+
 Usage:
     python manage.py shell
     from static_generation.exporter import StaticDataExporter
     exporter = StaticDataExporter()
     exporter.export_all()
 """
+import hashlib
 import json
+import multiprocessing
 import os
+import pickle
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
 from django.conf import settings
+from products.alternatives import get_alternatives_index
+from products.assumption_catalog import get_assumption_catalog
+from products.breakeven import BreakEvenMatrix
+from products.evaluation import load_multipliers
+from products.impact_engine import METRICS, PHASES
 from products.models import Product
+from products.rankings import build_rankings
+from products.scenarios import DEFAULT_CUBE_LIMIT, build_scenarios
+from products.sensitivity import SensitivityEngine
+from products.snapshots import refresh_stale_snapshots
+from products.uncertainty import DEFAULT_DRAWS, DEFAULT_SEED, UncertaintyEngine
 from posts.models import Post
+from . import workers
+from .compression import compress_file, encodings
+from .staging import link_or_copy, make_staging_dir, swap_directories
+from .writers import JsonArrayWriter, NdjsonWriter, RowWriter, compact, dumps, nest
+
+MANIFEST_FILE = 'manifest.json'
+DEFAULT_CHUNK_SIZE = 500
+HASH_LENGTH = 8
+COLUMNAR_DTYPES = ('float32', 'float64')
+
+# Columns of the columnar export: every phase, then the annualized total.
+COLUMN_GROUPS = PHASES + ['total']
+
+# Output profiles: 'pretty' for development and diffs, 'dist' for hosting.
+PROFILES = {
+    'pretty': {'minify': False, 'precompress': False, 'hashed_names': False},
+    'dist': {'minify': True, 'precompress': True, 'hashed_names': True},
+}
 
 
 class StaticDataExporter:
@@ -24,87 +90,618 @@ class StaticDataExporter:
     This enables static site hosting without a backend database.
     """
 
-    def __init__(self):
-        """Initialize the exporter and ensure output directory exists."""
+    def __init__(self, include_sources=True, scenario_cube_limit=DEFAULT_CUBE_LIMIT,
+                 uncertainty_draws=DEFAULT_DRAWS, uncertainty_seed=DEFAULT_SEED,
+                 uncertainty_distribution='discrete', uncertainty_jobs=1,
+                 include_sensitivity=False, shared_assumptions=True,
+                 chunk_size=DEFAULT_CHUNK_SIZE, ndjson=False, jobs=1, profile='pretty',
+                 columnar=None):
+        """
+        Initialize the exporter and ensure output directory exists.
+
+        Args:
+            include_sources (bool): Include provenance ``sources`` lists in
+                product impacts. Values-only exports are smaller and faster.
+            scenario_cube_limit (int): Products with at most this many
+                assumption option combinations get a full scenario cube;
+                larger ones get per-option multiplier vectors.
+            uncertainty_draws (int): Monte Carlo draws per product over the
+                internal assumptions. 0 skips the uncertainty section.
+            uncertainty_seed (int): Random seed, for reproducible exports.
+            uncertainty_distribution (str): How assumption options are sampled.
+            uncertainty_jobs (int): Worker processes for the simulation.
+            include_sensitivity (bool): Add one-at-a-time sensitivity
+                (tornado) data for every assumption option to each product.
+            shared_assumptions (bool): Write global assumptions once to
+                ``assumptions.json`` and list them in products as
+                ``{'ref': key}``. When False they are copied into every product.
+            chunk_size (int): Products fetched per database round trip while
+                streaming the product files.
+            ndjson (bool): Also write ``products.ndjson``, one product per line.
+            jobs (int): Worker processes serializing products and posts.
+                1 runs in-process.
+            profile (str): One of PROFILES: indented JSON (``pretty``) or
+                minified, precompressed, content-hashed files (``dist``).
+            columnar (str): Also write the impact values as a binary buffer
+                of this dtype (one of COLUMNAR_DTYPES). None skips it.
+        """
         self.output_dir = Path(settings.STATIC_DATA_OUTPUT_DIR)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Where files are written: the output directory itself, or a staging
+        # directory during export_all.
+        self.build_dir = self.output_dir
+        self.include_sources = include_sources
+        self.scenario_cube_limit = scenario_cube_limit
+        self.uncertainty_draws = uncertainty_draws
+        self.uncertainty_seed = uncertainty_seed
+        self.uncertainty_distribution = uncertainty_distribution
+        self.uncertainty_jobs = uncertainty_jobs
+        self.include_sensitivity = include_sensitivity
+        self.shared_assumptions = shared_assumptions
+        self.chunk_size = chunk_size
+        self.ndjson = ndjson
+        self.jobs = jobs
+        self.profile = profile
+        self.minify = PROFILES[profile]['minify']
+        self.precompress = PROFILES[profile]['precompress']
+        self.hashed_names = PROFILES[profile]['hashed_names']
+        self.columnar = columnar
+        self._uncertainty = None
+        self._sensitivity = None
+        self._alternatives = None
+        self._assumptions = None
+        self._previous_hashes = self._read_manifest().get('files', {})
+        self._hashes = {}
+        self._written = []
+        self._paths = {}
+        self._pool = None
+
+    def __getstate__(self):
+        # Workers get everything but the pool itself.
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        return state
 
     def export_all(self):
         """
         Export all data to static JSON files.
         
         Creates:
+        - assumptions.json: Global assumptions referenced by products (when shared)
         - products.json: All products with their impact calculations
+        - products/{slug}.json: Individual product files for detail pages
+        - products-index.json: List-page fields and totals of every product
+        - products.ndjson: One product per line (when enabled)
+        - products-columns.bin/.json/-slugs.json: Impact values as a float
+          buffer, its header and its row slugs
+          header (when enabled)
+        - break-even/{slug}.json: Each product's break-even lines and years
+        - rankings.json: Products ordered by every metric, total and per phase
         - posts.json: All published posts
         - posts/{slug}.json: Individual post files for easier caching
+        - manifest.json: Content hash of every file above, export time and
+          hashed file names (``dist`` profile)
+
+        Returns:
+            dict: Relative paths ``written``, ``unchanged`` and ``deleted``.
         """
         print("Starting static data export...")
-        
-        self.export_products()
-        self.export_posts()
-        self.export_individual_posts()
+
+        staging = make_staging_dir(self.output_dir)
+        self.build_dir = staging
+        try:
+            try:
+                if self.shared_assumptions:
+                    self.export_assumptions()
+                self.export_products()
+                self.export_break_even()
+                self.export_rankings()
+                self.export_posts()
+            finally:
+                self.close()
+            known = set(self._previous_hashes) | set(self._hashes)
+            changes = self.write_manifest()
+            self._publish(changes, known)
+        finally:
+            self.build_dir = self.output_dir
+            shutil.rmtree(staging, ignore_errors=True)
         
         print("✓ Static data export completed successfully!")
+        return changes
 
-    def export_products(self):
+    def export_assumptions(self):
         """
-        Export all products to a single JSON file with complete impact data.
+        Export the global assumptions once, keyed by assumption key, so
+        products and comparison posts only carry references to them.
         """
-        products = Product.objects.all()
         data = {
-            'products': [product.to_dict() for product in products],
-            'export_timestamp': self._get_timestamp(),
+            'assumptions': self._get_assumptions().shared_assumptions(),
         }
-        
-        output_file = self.output_dir / 'products.json'
+
+        output_file = self.build_dir / 'assumptions.json'
         self._write_json(output_file, data)
-        print(f"✓ Exported {len(products)} products to {output_file}")
+        print(f"✓ Exported {len(data['assumptions'])} shared assumptions to {output_file}")
 
-    def export_posts(self):
+    def export_products(self):
         """
-        Export all published posts to a single JSON file.
+        Export all products with complete impact data, to a single file and
+        to one file per product, plus a slim index for list pages.
+
+        Products are loaded and serialized in chunks, and every output is
+        written entry by entry, so memory does not grow with the catalog.
         """
-        posts = Post.objects.filter(published=True)
-        data = {
-            'posts': [post.to_dict() for post in posts],
-            'export_timestamp': self._get_timestamp(),
+        refresh_stale_snapshots(batch_size=self.chunk_size)
+        self._alternatives = get_alternatives_index()
+        product_ids = list(Product.objects.values_list('id', flat=True))
+        (self.build_dir / 'products').mkdir(parents=True, exist_ok=True)
+
+        with ExitStack() as stack:
+            products_file = stack.enter_context(
+                self._stream(JsonArrayWriter(self.build_dir / 'products.json', 'products', self.minify))
+            )
+            index_file = stack.enter_context(
+                self._stream(JsonArrayWriter(self.build_dir / 'products-index.json', 'products', self.minify))
+            )
+            ndjson_file = None
+            if self.ndjson:
+                ndjson_file = stack.enter_context(self._stream(NdjsonWriter(self.build_dir / 'products.ndjson')))
+            columns_file = slugs_file = None
+            if self.columnar:
+                columns_file = stack.enter_context(
+                    self._stream(RowWriter(self.build_dir / 'products-columns.bin', self.columnar))
+                )
+                slugs_file = stack.enter_context(
+                    self._stream(JsonArrayWriter(self.build_dir / 'products-columns-slugs.json', 'slugs', self.minify))
+                )
+
+            for results in self._map('_serialize_products', product_ids):
+                for text, index_text, line, row, shard in results:
+                    products_file.append(text)
+                    index_file.append(index_text)
+                    self._note(shard)
+                    if ndjson_file is not None:
+                        ndjson_file.append(line)
+                    if columns_file is not None:
+                        slugs_file.append(dumps(row[0], self.minify))
+                        columns_file.append(row[1])
+
+        print(f"✓ Exported {products_file.count} products to {products_file.path}")
+        print(f"✓ Exported {products_file.count} individual product files to {self.build_dir / 'products'}")
+        print(f"✓ Exported index of {index_file.count} products to {index_file.path}")
+        if ndjson_file is not None:
+            print(f"✓ Exported {ndjson_file.count} products to {ndjson_file.path}")
+        if columns_file is not None:
+            self._write_json(self.build_dir / 'products-columns.json', self._columns_header(columns_file.count))
+            print(f"✓ Exported {columns_file.count} rows of impact values to {columns_file.path}")
+
+    def _serialize_products(self, product_ids):
+        """
+        Serialize a chunk of products, in the given order, and write their
+        individual files. Runs in a worker process when ``jobs > 1``.
+
+        Returns:
+            list: ``(products.json entry, index entry, NDJSON line or None,
+            (slug, columnar row) or None, manifest records of the product
+            file)`` per product.
+        """
+        products = (
+            Product.objects
+            .filter(pk__in=product_ids)
+            .select_related('impact_snapshot')
+            .prefetch_related('components__material')
+        )
+        by_id = {product.id: product for product in products}
+        multipliers = load_multipliers(by_id.values())
+        products_dir = self.build_dir / 'products'
+
+        results = []
+        for product_id in product_ids:
+            product = by_id.get(product_id)
+            if product is None:
+                continue  # deleted since the ids were listed
+            product_data = self._product_entry(
+                product.to_dict(
+                    snapshot=product.impact_snapshot,
+                    include_sources=self.include_sources,
+                    assumptions=self._get_assumptions(),
+                    multipliers=multipliers[product_id],
+                )
+            )
+            text = dumps(product_data, self.minify)
+            shard = self._write_if_changed(
+                products_dir / f"{product_data['slug']}.json",
+                nest('product', text, self.minify),
+            )
+            line = compact(product_data) if self.ndjson else None
+            row = (product_data['slug'], self._columns_row(product_data)) if self.columnar else None
+            results.append((text, dumps(self._index_entry(product_data), self.minify), line, row, shard))
+        return results
+
+    def _index_entry(self, product_data):
+        """
+        The fields list pages show: name, slug, description, price and the
+        five annualized totals as plain numbers.
+        """
+        return {
+            'id': product_data['id'],
+            'name': product_data['name'],
+            'slug': product_data['slug'],
+            'description': product_data['description'],
+            'purchase_price_usd': product_data['purchase_price_usd'],
+            'impacts': {
+                metric: product_data['impacts'][metric]['value'] for metric in METRICS
+            },
         }
-        
-        output_file = self.output_dir / 'posts.json'
+
+    def _columns_row(self, product_data):
+        """
+        A product's impact values in the columnar export's column order:
+        every metric of each phase, then the annualized totals.
+        """
+        by_phase = product_data['impacts_by_phase']
+        return [
+            by_phase[group][metric]['value'] if group in PHASES else product_data['impacts'][metric]['value']
+            for group in COLUMN_GROUPS
+            for metric in METRICS
+        ]
+
+    def _columns_header(self, rows):
+        """
+        Describe ``products-columns.bin``: row ``i`` holds the product
+        ``slugs[i]`` of ``products-columns-slugs.json``, and value ``(i, j)``
+        is at flat index ``i * len(columns) + j``.
+        """
+        return {
+            'dtype': self.columnar,
+            'byte_order': 'little',
+            'shape': [rows, len(COLUMN_GROUPS) * len(METRICS)],
+            'groups': COLUMN_GROUPS,
+            'metrics': METRICS,
+            'columns': [f'{group}.{metric}' for group in COLUMN_GROUPS for metric in METRICS],
+        }
+
+    def export_break_even(self):
+        """
+        Export each product's line parameters and break-even years to its
+        own file, so comparisons never solve them in the browser and only
+        download the two products they show.
+        """
+        matrix = BreakEvenMatrix.for_products(Product.objects.all())
+
+        output_dir = self.build_dir / 'break-even'
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for slug, data in matrix.product_shards():
+            self._write_json(output_dir / f"{slug}.json", data)
+        n_crossings = sum(len(pairs) for pairs, _ in matrix.crossings.values())
+        print(f"✓ Exported {n_crossings} break-even crossings for {len(matrix.slugs)} products to {output_dir}")
+
+    def export_rankings(self):
+        """
+        Export the ascending product order for every metric and scope, so
+        "lowest impact" lists are a slice of a precomputed array.
+        """
+        data = build_rankings()
+
+        output_file = self.build_dir / 'rankings.json'
         self._write_json(output_file, data)
-        print(f"✓ Exported {len(posts)} posts to {output_file}")
+        print(f"✓ Exported rankings for {len(data['products'])} products to {output_file}")
+
+    def export_posts(self):
+        """
+        Export all published posts to a single JSON file and to one file per
+        post, in one streamed pass.
+        """
+        posts_dir = self.build_dir / 'posts'
+        posts_dir.mkdir(parents=True, exist_ok=True)
+        with self._stream(JsonArrayWriter(self.build_dir / 'posts.json', 'posts', self.minify)) as posts_file:
+            for results in self._map('_serialize_posts', self._post_ids()):
+                for text, records in results:
+                    posts_file.append(text)
+                    self._note(records)
+        print(f"✓ Exported {posts_file.count} posts to {posts_file.path}")
+        print(f"✓ Exported {posts_file.count} individual post files to {posts_dir}")
 
     def export_individual_posts(self):
         """
-        Export each post to its own JSON file for better caching and organization.
-        This is optional but useful for larger sites.
+        Export each post to its own JSON file only, for better caching and
+        organization. ``export_posts`` already writes these files.
         """
-        posts_dir = self.output_dir / 'posts'
+        posts_dir = self.build_dir / 'posts'
         posts_dir.mkdir(parents=True, exist_ok=True)
-        
-        posts = Post.objects.filter(published=True)
-        
-        for post in posts:
-            data = {
-                'post': post.to_dict(),
-                'export_timestamp': self._get_timestamp(),
-            }
-            
-            output_file = posts_dir / f"{post.slug}.json"
-            self._write_json(output_file, data)
-        
-        print(f"✓ Exported {len(posts)} individual post files to {posts_dir}")
+
+        count = 0
+        for results in self._map('_serialize_posts', self._post_ids()):
+            for _text, records in results:
+                self._note(records)
+                count += 1
+
+        print(f"✓ Exported {count} individual post files to {posts_dir}")
+
+    def _post_ids(self):
+        return list(Post.objects.filter(published=True).values_list('id', flat=True))
+
+    def _serialize_posts(self, post_ids):
+        """
+        Serialize a chunk of posts, in the given order, and write their
+        individual files. Runs in a worker process when ``jobs > 1``.
+
+        Returns:
+            list: ``(posts.json entry, manifest records of the post file)`` per post.
+        """
+        by_id = {post.id: post for post in Post.objects.filter(pk__in=post_ids)}
+        posts_dir = self.build_dir / 'posts'
+        results = []
+        for post_id in post_ids:
+            post = by_id.get(post_id)
+            if post is None:
+                continue  # deleted since the ids were listed
+            text = dumps(self._post_entry(post), self.minify)
+            records = self._write_if_changed(posts_dir / f"{post.slug}.json", nest('post', text, self.minify))
+            results.append((text, records))
+        return results
+
+    def _map(self, method, ids):
+        """
+        Call a chunk serializer over ``ids`` split into ``chunk_size`` chunks.
+
+        Yields:
+            Each chunk's results, in chunk order, whether the chunks ran
+            in-process or in worker processes.
+        """
+        chunks = [ids[start:start + self.chunk_size] for start in range(0, len(ids), self.chunk_size)]
+        if self.jobs <= 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                yield getattr(self, method)(chunk)
+            return
+        yield from self._get_pool().map(workers.run, [method] * len(chunks), chunks)
+
+    def _get_pool(self):
+        """
+        Start the worker pool on first use, after computing everything the
+        workers share so none of them recomputes it.
+        """
+        if self._pool is None:
+            if self._alternatives is None:
+                self._alternatives = get_alternatives_index()
+            self._get_assumptions()
+            self._get_uncertainty()
+            self._get_sensitivity()
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.jobs,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=workers.init_worker,
+                initargs=(pickle.dumps(self),),
+            )
+        return self._pool
+
+    def close(self):
+        """Shut down the worker pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def write_manifest(self):
+        """
+        Remove files from the previous export that were not written this time
+        and record the content hashes of this one in ``manifest.json``.
+
+        Call after all ``export_*`` methods: anything not exported in this run
+        is treated as gone. The manifest, and its timestamp, only change when
+        some file did.
+
+        Returns:
+            dict: Relative paths ``written``, ``unchanged`` and ``deleted``.
+        """
+        deleted = sorted(set(self._previous_hashes) - set(self._hashes))
+        if self.build_dir == self.output_dir:
+            for name in deleted:
+                (self.output_dir / name).unlink(missing_ok=True)
+
+        written = sorted(set(self._written))
+        unchanged = sorted(set(self._hashes) - set(written))
+        live_manifest = self.output_dir / MANIFEST_FILE
+        if written or deleted or not live_manifest.exists():
+            manifest = {'export_timestamp': self._get_timestamp(), 'files': self._hashes}
+            if self._paths:
+                manifest['paths'] = self._paths
+            with open(self.build_dir / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+        elif self.build_dir != self.output_dir:
+            link_or_copy(live_manifest, self.build_dir / MANIFEST_FILE)
+        self._previous_hashes = dict(self._hashes)
+
+        print(f"✓ {len(written)} files written, {len(unchanged)} unchanged, {len(deleted)} deleted")
+        return {'written': written, 'unchanged': unchanged, 'deleted': deleted}
+
+    def _publish(self, changes, known):
+        """
+        Swap the staging directory in for the output directory, unless
+        nothing changed. Files the exporter never wrote (not in this or the
+        previous manifest) are carried over.
+        """
+        if not changes['written'] and not changes['deleted']:
+            print("✓ Export unchanged; output directory left as is")
+            return
+        for path in self.output_dir.rglob('*'):
+            name = path.relative_to(self.output_dir).as_posix()
+            if path.is_file() and name not in known and name != MANIFEST_FILE and not name.endswith('.tmp'):
+                link_or_copy(path, self.build_dir / name)
+        swap_directories(self.build_dir, self.output_dir)
+        print(f"✓ Published export to {self.output_dir}")
+
+    def _read_manifest(self):
+        """The previous export's manifest, or an empty one."""
+        try:
+            with open(self.output_dir / MANIFEST_FILE, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _product_entry(self, product_data):
+        """
+        Add precomputed assumption scenarios to a serialized product so the
+        frontend can look up impacts for any option selection, its
+        lower-impact alternatives, plus its Monte Carlo percentiles and
+        sensitivity data when enabled. Scenarios are built from the inline
+        assumptions before global ones are swapped for shared references.
+        """
+        product_data['assumption_scenarios'] = build_scenarios(
+            product_data, cube_limit=self.scenario_cube_limit
+        )
+        if self.shared_assumptions:
+            product_data['assumptions']['exposed_assumptions'] = (
+                self._get_assumptions().exposed_assumptions(product_data['id'], shared=True)
+            )
+        if self._alternatives is not None and product_data['id'] in self._alternatives:
+            product_data['alternatives'] = self._alternatives.summary(product_data['id'])
+        uncertainty = self._get_uncertainty()
+        if uncertainty is not None and product_data['id'] in uncertainty:
+            product_data['uncertainty'] = uncertainty.summary(product_data['id'])
+        sensitivity = self._get_sensitivity()
+        if sensitivity is not None and product_data['id'] in sensitivity:
+            product_data['sensitivity'] = sensitivity.summary(product_data['id'])
+        return product_data
+
+    def _get_uncertainty(self):
+        """Simulate the whole catalog once per export, on first use."""
+        if self._uncertainty is None and self.uncertainty_draws > 0:
+            self._uncertainty = UncertaintyEngine.for_products(
+                Product.objects.all(),
+                draws=self.uncertainty_draws,
+                seed=self.uncertainty_seed,
+                distribution=self.uncertainty_distribution,
+                jobs=self.uncertainty_jobs,
+            )
+        return self._uncertainty
+
+    def _get_sensitivity(self):
+        """Compute sensitivity for the whole catalog once per export, on first use."""
+        if self._sensitivity is None and self.include_sensitivity:
+            self._sensitivity = SensitivityEngine.for_products(Product.objects.all())
+        return self._sensitivity
+
+    def _get_assumptions(self):
+        """Exposed assumptions for the whole catalog, from the compiled catalog cache."""
+        if self._assumptions is None:
+            self._assumptions = get_assumption_catalog().resolver
+        return self._assumptions
+
+    def _post_entry(self, post):
+        """Serialize a post, adding scenarios to its comparison products."""
+        data = post.to_dict(include_sources=self.include_sources, assumptions=self._get_assumptions())
+        for product_data in data.get('comparison', {}).get('products', []):
+            self._product_entry(product_data)
+        return data
 
     def _write_json(self, file_path, data):
         """
-        Write data to a JSON file with pretty formatting.
+        Write data to a JSON file with sorted keys, pretty-printed unless the
+        profile minifies.
         
         Args:
             file_path (Path): Where to write the file
             data (dict): Data to serialize to JSON
         """
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        self._write_text(file_path, dumps(data, self.minify))
+
+    def _write_text(self, file_path, text):
+        """Write serialized JSON (bytes) and record it in the manifest."""
+        self._note(self._write_if_changed(file_path, text))
+
+    def _write_if_changed(self, file_path, content):
+        """
+        Write a file unless its content hash matches the previous manifest
+        and it is still on disk, then its compressed variants. Safe to call
+        from worker processes.
+
+        Returns:
+            list: ``(name, digest, written)`` of the file and each variant,
+            for ``_note``.
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        file_path = self._final_path(file_path, digest)
+        name = self._name(file_path)
+        written = not self._unchanged(name, digest)
+        if written:
+            with open(file_path, 'wb') as f:
+                f.write(content)
+        elif self.build_dir != self.output_dir:
+            link_or_copy(self.output_dir / name, file_path)
+        return [(name, digest, written)] + self._write_variants(file_path, written)
+
+    @contextmanager
+    def _stream(self, writer):
+        """
+        Yield a streaming writer and commit its file on a clean exit: moved
+        into place if its content changed, dropped otherwise.
+        """
+        try:
+            yield writer
+        except BaseException:
+            writer.discard()
+            raise
+        digest = writer.close()
+        file_path = self._final_path(writer.path, digest)
+        name = self._name(file_path)
+        written = not self._unchanged(name, digest)
+        if written:
+            os.replace(writer.tmp_path, file_path)
+        else:
+            writer.tmp_path.unlink()
+            if self.build_dir != self.output_dir:
+                link_or_copy(self.output_dir / name, file_path)
+        self._note([(name, digest, written)] + self._write_variants(file_path, written))
+
+    def _final_path(self, file_path, digest):
+        """
+        Where a file is written: with hashed names on, top-level files get
+        the content hash in their name and are listed in ``paths``.
+        """
+        file_path = Path(file_path)
+        if not self.hashed_names or file_path.parent != self.build_dir:
+            return file_path
+        hashed = file_path.with_name(f"{file_path.stem}.{digest[:HASH_LENGTH]}{file_path.suffix}")
+        self._paths[file_path.name] = hashed.name
+        return hashed
+
+    def _write_variants(self, file_path, written):
+        """
+        Write the compressed variants of a file when the profile asks for
+        them. Variants of an unchanged file are reused from the previous
+        export.
+
+        Returns:
+            list: ``(name, digest, written)`` per variant.
+        """
+        if not self.precompress:
+            return []
+        records = []
+        for suffix in encodings():
+            variant = file_path.with_name(file_path.name + suffix)
+            name = self._name(variant)
+            previous = self._previous_hashes.get(name)
+            if not written and previous is not None and self._unchanged(name, previous):
+                if self.build_dir != self.output_dir:
+                    link_or_copy(self.output_dir / name, variant)
+                records.append((name, previous, False))
+            else:
+                records.append((name, compress_file(file_path, variant, suffix), True))
+        return records
+
+    def _name(self, file_path):
+        """Manifest name of an output file: its path relative to the build directory."""
+        return Path(file_path).relative_to(self.build_dir).as_posix()
+
+    def _unchanged(self, name, digest):
+        """Whether the previous export left this exact content in the output directory."""
+        return self._previous_hashes.get(name) == digest and (self.output_dir / name).exists()
+
+    def _note(self, records):
+        """Record files' hashes for the manifest, and which were rewritten."""
+        for name, digest, written in records:
+            self._hashes[name] = digest
+            if written:
+                self._written.append(name)
 
     def _get_timestamp(self):
         """
@@ -119,10 +716,12 @@ class StaticDataExporter:
 
 
 # Management command support
-def run_export():
+def run_export(include_sources=True, **options):
     """
     Convenience function to run the export.
     Can be called from management commands or scripts.
+
+    Extra keyword arguments are passed to StaticDataExporter.
     """
-    exporter = StaticDataExporter()
-    exporter.export_all()
+    exporter = StaticDataExporter(include_sources=include_sources, **options)
+    return exporter.export_all()
@@ -1,10 +1,8 @@
-from django.core.management.base import BaseCommand
-from the_full_price.static_generation.exporter import StaticDataExporter
+"""
+The exportstatic command, defined once in the products app.
 
-class Command(BaseCommand):
-    help = 'Export all static data for the frontend (products, posts, per-post files)'
-
-    def handle(self, *args, **options):
-        exporter = StaticDataExporter()
-        exporter.export_all()
-        self.stdout.write(self.style.SUCCESS('Static data export completed.'))
+static_generation is not in INSTALLED_APPS, so Django runs
+``products.management.commands.exportstatic``. This module re-exports that
+command so both paths share one set of options.
+"""
+from products.management.commands.exportstatic import Command  # noqa: F401
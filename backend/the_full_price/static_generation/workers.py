@@ -0,0 +1,30 @@
+"""
+Worker-process entry points for parallel static exports.
+
+``StaticDataExporter`` with ``jobs > 1`` serializes products and posts in a
+pool of spawned processes. Spawned workers start from a fresh interpreter,
+so each sets up Django and opens its own database connection rather than
+sharing the parent's socket. This module therefore imports nothing from
+Django at module level: the pool imports it before ``django.setup()`` runs.
+
+The exporter is passed pickled, with its catalog-wide engines (alternatives,
+uncertainty, sensitivity, assumptions) already computed, and unpickled once
+per worker after setup.
+"""
+import pickle
+
+_exporter = None
+
+
+def init_worker(state):
+    """Set up Django and load the exporter this worker serializes for."""
+    import django
+
+    global _exporter
+    django.setup()
+    _exporter = pickle.loads(state)
+
+
+def run(method, chunk):
+    """Call one of the exporter's chunk serializers, e.g. ``_serialize_products``."""
+    return getattr(_exporter, method)(chunk)
@@ -0,0 +1,161 @@
+"""
+Streaming JSON writers for the static exporter.
+
+The exporter writes the product catalog one entry at a time, so memory stays
+flat however many products there are. Each writer streams into a temporary
+sibling of its target and hashes the bytes as they are written; the exporter
+then either moves the file into place or drops it when the hash matches the
+previous export.
+
+Serialization goes through the configured JSON encoder (see
+``products.json_encoder``) and stays in bytes from encoder to file.
+``JsonArrayWriter`` produces exactly the bytes ``dumps({key: items})`` would,
+so streamed and in-memory files are interchangeable. Every helper takes
+``minify``: indented output for development, compact output for shipping.
+
+Usage:
+    writer = JsonArrayWriter(output_dir / 'products.json', 'products')
+    for entry in entries:
+        writer.append(dumps(entry))
+    digest = writer.close()
+"""
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+from products.json_encoder import get_encoder
+
+
+def dumps(data, minify=False):
+    """Serialize data the way every exported JSON file is: sorted keys, indented unless minified."""
+    return get_encoder().encode(data, indent=not minify, sort_keys=True)
+
+
+def compact(data):
+    """Serialize data on a single line, as ``products.ndjson`` holds it."""
+    return get_encoder().encode(data, sort_keys=True)
+
+
+def _key(key):
+    """A key as its JSON string."""
+    return json.dumps(key, ensure_ascii=False).encode('utf-8')
+
+
+def nest(key, text, minify=False):
+    """
+    Wrap serialized data in a one-key object: ``nest(key, dumps(data))`` is
+    ``dumps({key: data})`` without serializing ``data`` again.
+    """
+    if minify:
+        return b'{' + _key(key) + b':' + text + b'}'
+    return b'{\n  ' + _key(key) + b': ' + text.replace(b'\n', b'\n  ') + b'\n}'
+
+
+class StreamingWriter:
+    """
+    Write a file incrementally to ``{name}.tmp`` next to its target, hashing
+    the content as it goes.
+
+    Attributes:
+        path (Path): Final location of the file.
+        tmp_path (Path): Where the content is written until it is committed.
+        count (int): Number of items appended.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self.count = 0
+        self._hash = hashlib.sha256()
+        self._file = open(self.tmp_path, 'wb')
+
+    def _write(self, content):
+        self._file.write(content)
+        self._hash.update(content)
+
+    def close(self):
+        """
+        Finish the file.
+
+        Returns:
+            str: sha256 hex digest of the content.
+        """
+        self._file.close()
+        return self._hash.hexdigest()
+
+    def discard(self):
+        """Close and delete the temporary file without committing it."""
+        self._file.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
+class JsonArrayWriter(StreamingWriter):
+    """Stream ``{key: [item, ...]}``, one serialized item at a time."""
+
+    def __init__(self, path, key, minify=False):
+        super().__init__(path)
+        self.key = key
+        self.minify = minify
+
+    def append(self, text):
+        """
+        Add an item.
+
+        Args:
+            text (bytes): The item serialized with ``dumps`` (same ``minify``).
+        """
+        if self.minify:
+            prefix = b'{' + _key(self.key) + b':[' if self.count == 0 else b','
+            self._write(prefix + text)
+        else:
+            prefix = b'{\n  ' + _key(self.key) + b': [\n' if self.count == 0 else b',\n'
+            self._write(prefix + b'    ' + text.replace(b'\n', b'\n    '))
+        self.count += 1
+
+    def close(self):
+        if self.minify:
+            self._write(b'{' + _key(self.key) + b':[]}' if self.count == 0 else b']}')
+        elif self.count == 0:
+            self._write(b'{\n  ' + _key(self.key) + b': []\n}')
+        else:
+            self._write(b'\n  ]\n}')
+        return super().close()
+
+
+class NdjsonWriter(StreamingWriter):
+    """Stream newline-delimited JSON: one compact object per line."""
+
+    def append(self, text):
+        """
+        Add an item.
+
+        Args:
+            text (bytes): The item serialized with ``compact``.
+        """
+        self._write(text + b'\n')
+        self.count += 1
+
+
+class RowWriter(StreamingWriter):
+    """
+    Stream rows of numbers as one contiguous little-endian buffer, for
+    ``products-columns.bin``.
+
+    Attributes:
+        dtype (numpy.dtype): Little-endian ``float32`` or ``float64``.
+    """
+
+    def __init__(self, path, dtype):
+        super().__init__(path)
+        self.dtype = np.dtype(dtype).newbyteorder('<')
+
+    def append(self, values):
+        """
+        Add a row.
+
+        Args:
+            values (list): The row's numbers, in column order.
+        """
+        self._write(np.asarray(values, dtype=self.dtype).tobytes())
+        self.count += 1
@@ -0,0 +1,93 @@
+/**
+ * Tests for assumption utilities
+ *
+ * Verifies precomputed scenario lookups and shared assumption references
+ * from the static export
+ */
+import { describe, it, expect } from 'vitest'
+import { lookupAssumptionScenario, resolveAssumptionRefs } from '../utils/assumptions.js'
+
+describe('Assumption scenario lookup', () => {
+  const cell = (value) => Array.from({ length: 20 }, (_, i) => (i === 0 ? value : 0))
+
+  const cubeProduct = {
+    assumption_scenarios: {
+      mode: 'cube',
+      keys: ['wash_frequency', 'grocery_trip_distance'],
+      options: [['every_use', 'every_2_uses'], ['nearby', 'moderate', 'far']],
+      defaults: ['every_use', 'moderate'],
+      phase_values: [1, 2, 3, 4, 5, 6].map(cell),
+      totals: [1, 2, 3, 4, 5, 6].map((v) => [v, 0, 0, 0, 0]),
+    },
+  }
+
+  it('should use default options for missing selections', () => {
+    const result = lookupAssumptionScenario(cubeProduct, {})
+    expect(result.totals[0]).toBe(2)
+  })
+
+  it('should index combinations in row-major order', () => {
+    const result = lookupAssumptionScenario(cubeProduct, {
+      wash_frequency: 'every_2_uses',
+      grocery_trip_distance: 'far',
+    })
+    expect(result.phaseValues[0]).toBe(6)
+  })
+
+  it('should return null for unknown options', () => {
+    expect(lookupAssumptionScenario(cubeProduct, { wash_frequency: 'never' })).toBeNull()
+    expect(lookupAssumptionScenario({}, {})).toBeNull()
+  })
+
+  it('should combine factorized multipliers', () => {
+    const product = {
+      assumption_scenarios: {
+        mode: 'factorized',
+        keys: ['a', 'b'],
+        options: [['x', 'y'], ['z']],
+        defaults: ['x', 'z'],
+        base: cell(10),
+        multipliers: [[cell(1), cell(0.5)], [cell(2)]],
+      },
+    }
+    const result = lookupAssumptionScenario(product, { a: 'y' })
+    expect(result.phaseValues[0]).toBe(10)
+    expect(result.totals).toBeNull()
+  })
+})
+
+describe('Shared assumption references', () => {
+  const shared = {
+    grocery_trip_distance: { key: 'grocery_trip_distance', default_option_id: 'moderate', options: [] },
+  }
+
+  it('should replace references in place, keeping order', () => {
+    const product = {
+      assumptions: {
+        exposed_assumptions: [
+          { key: 'wash_frequency', options: [] },
+          { ref: 'grocery_trip_distance' },
+        ],
+      },
+    }
+    const resolved = resolveAssumptionRefs(product, shared)
+    expect(resolved).toBe(product)
+    expect(resolved.assumptions.exposed_assumptions.map((a) => a.key)).toEqual([
+      'wash_frequency',
+      'grocery_trip_distance',
+    ])
+    expect(resolved.assumptions.exposed_assumptions[1]).toBe(shared.grocery_trip_distance)
+  })
+
+  it('should drop references without a definition', () => {
+    const product = { assumptions: { exposed_assumptions: [{ ref: 'missing' }] } }
+    expect(resolveAssumptionRefs(product, shared).assumptions.exposed_assumptions).toEqual([])
+  })
+
+  it('should leave inline exports untouched', () => {
+    const exposed = [{ key: 'wash_frequency', options: [] }]
+    const product = { assumptions: { exposed_assumptions: exposed } }
+    expect(resolveAssumptionRefs(product, shared).assumptions.exposed_assumptions).toBe(exposed)
+    expect(resolveAssumptionRefs({ name: 'No assumptions' }, shared)).toEqual({ name: 'No assumptions' })
+  })
+})
@@ -11,6 +11,7 @@ import {
   getUsesPerYear,
   getYearsUntilReplacement,
   getItemsPerYear,
+  lookupBreakEven,
 } from '../utils/comparison.js'
 
 describe('Comparison utilities', () => {
@@ -213,4 +214,43 @@ describe('Comparison utilities', () => {
       expect(breakdown).toEqual([])
     })
   })
+
+  describe('lookupBreakEven', () => {
+    const metrics = ['greenhouse_gas_kg', 'water_liters', 'energy_kwh', 'land_m2', 'cost_usd']
+    const shards = {
+      'plastic-bag': {
+        slug: 'plastic-bag',
+        horizon: 100,
+        metrics,
+        initial: [0, 0, 0, 0, 0],
+        slope: [0.3, 0, 0, 0, 10],
+        crossings: { cost_usd: { 'steel-bottle': 2.7778 }, greenhouse_gas_kg: { 'steel-bottle': 5 } },
+      },
+      'steel-bottle': {
+        slug: 'steel-bottle',
+        horizon: 100,
+        metrics,
+        initial: [1.5, 0, 0, 0, 25],
+        slope: [0, 0, 0, 0, 1],
+        crossings: { cost_usd: {}, greenhouse_gas_kg: {} },
+      },
+    }
+
+    it('should return params and year in the requested order', () => {
+      const result = lookupBreakEven(shards, { slug: 'steel-bottle' }, { slug: 'plastic-bag' }, 'cost_usd')
+      expect(result.p1).toEqual({ initial: 25, slope: 1 })
+      expect(result.p2).toEqual({ initial: 0, slope: 10 })
+      expect(result.year).toBe(2.7778)
+    })
+
+    it('should return a null year when lines do not cross', () => {
+      const result = lookupBreakEven(shards, { slug: 'plastic-bag' }, { slug: 'steel-bottle' }, 'water_liters')
+      expect(result.year).toBeNull()
+    })
+
+    it('should return null for products without a shard', () => {
+      expect(lookupBreakEven(shards, { slug: 'plastic-bag' }, { slug: 'unknown' }, 'cost_usd')).toBeNull()
+      expect(lookupBreakEven(null, { slug: 'plastic-bag' }, { slug: 'steel-bottle' }, 'cost_usd')).toBeNull()
+    })
+  })
 })
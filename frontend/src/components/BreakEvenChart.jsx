@@ -7,9 +7,9 @@ import {
   formatEnergy, 
   formatLand 
 } from '../utils/formatting';
-import { getItemsPerYear, getBreakEvenParams } from '../utils/comparison';
+import { getItemsPerYear, getBreakEvenParams, lookupBreakEven } from '../utils/comparison';
 
-export function BreakEvenChart({ product1, product2 }) {
+export function BreakEvenChart({ product1, product2, breakEvenShards = null }) {
   const [activeMetric, setActiveMetric] = useState('cost_usd');
 
   const metrics = [
@@ -24,8 +24,10 @@ export function BreakEvenChart({ product1, product2 }) {
   const chartData = useMemo(() => {
     if (!product1 || !product2) return null;
 
-    const p1 = getBreakEvenParams(product1, activeMetric);
-    const p2 = getBreakEvenParams(product2, activeMetric);
+    // Exported break-even data, when both products have a shard
+    const precomputed = lookupBreakEven(breakEvenShards, product1, product2, activeMetric);
+    const p1 = precomputed ? precomputed.p1 : getBreakEvenParams(product1, activeMetric);
+    const p2 = precomputed ? precomputed.p2 : getBreakEvenParams(product2, activeMetric);
 
     // Calculate break-even year (intersection point)
     // p1.init + p1.slope * t = p2.init + p2.slope * t
@@ -34,7 +36,11 @@ export function BreakEvenChart({ product1, product2 }) {
     let breakEvenYear = null;
     const slopeDiff = p1.slope - p2.slope;
     
-    if (Math.abs(slopeDiff) > 0.000001) {
+    if (precomputed) {
+      if (precomputed.year !== null && precomputed.year < 50) {
+        breakEvenYear = precomputed.year;
+      }
+    } else if (Math.abs(slopeDiff) > 0.000001) {
       const t = (p2.initial - p1.initial) / slopeDiff;
       if (t > 0 && t < 50) {
         breakEvenYear = t;
@@ -60,7 +66,7 @@ export function BreakEvenChart({ product1, product2 }) {
     const maxY = Math.max(...allValues) * 1.1 || 10; // Add headroom
 
     return { maxYear, maxY, p1, p2, breakEvenYear };
-  }, [product1, product2, activeMetric]);
+  }, [product1, product2, activeMetric, breakEvenShards]);
 
   if (!chartData) return null;
 
@@ -24,8 +24,15 @@ import {
   getAnnualImpactByPhase,
   getBreakEvenParams,
   calculateBreakEvenIntersection,
+  lookupBreakEven,
 } from '../utils/comparison.js';
-import { applyAssumptionsToProduct, getDefaultAssumptionSelections, getExposedAssumptions } from '../utils/assumptions.js';
+import {
+  applyAssumptionsToProduct,
+  getDefaultAssumptionSelections,
+  getExposedAssumptions,
+  isDefaultAssumptionSelection,
+} from '../utils/assumptions.js';
+import { loadBreakEvenPair } from '../data/index.js';
 import { CalculationModal } from './CalculationModal';
 import { BreakEvenChart } from './BreakEvenChart';
 import './ComparisonView.css';
@@ -37,6 +44,24 @@ export function ComparisonView({ product1, product2 }) {
   const [groupByPhase, setGroupByPhase] = useState(false);
   // Toggle between metric and imperial units
   const [useImperial, setUseImperial] = useState(false);
+  // Precomputed break-even shards of both products, valid while they use default assumptions
+  const [breakEvenShards, setBreakEvenShards] = useState(null);
+
+  useEffect(() => {
+    if (!product1?.slug || !product2?.slug) {
+      return undefined;
+    }
+    let cancelled = false;
+    setBreakEvenShards(null);
+    loadBreakEvenPair(product1.slug, product2.slug).then((shards) => {
+      if (!cancelled) {
+        setBreakEvenShards(shards);
+      }
+    });
+    return () => {
+      cancelled = true;
+    };
+  }, [product1?.slug, product2?.slug]);
 
   useEffect(() => {
     if (!product1 || !product2) {
@@ -56,6 +81,11 @@ export function ComparisonView({ product1, product2 }) {
   const exposedAssumptions1 = getExposedAssumptions(product1);
   const exposedAssumptions2 = getExposedAssumptions(product2);
 
+  const precomputedBreakEven = (
+    isDefaultAssumptionSelection(product1, assumptionSelections.product1)
+    && isDefaultAssumptionSelection(product2, assumptionSelections.product2)
+  ) ? breakEvenShards : null;
+
   product1 = applyAssumptionsToProduct(product1, assumptionSelections.product1);
   product2 = applyAssumptionsToProduct(product2, assumptionSelections.product2);
 
@@ -257,6 +287,10 @@ export function ComparisonView({ product1, product2 }) {
 
   // Break-even calculation for each metric (aligned with BreakEvenChart)
   function getAdvancedBreakEven(productA, productB, metric) {
+    const precomputed = lookupBreakEven(precomputedBreakEven, productA, productB, metric);
+    if (precomputed) {
+      return precomputed.year;
+    }
     const paramsA = getBreakEvenParams(productA, metric);
     const paramsB = getBreakEvenParams(productB, metric);
     return calculateBreakEvenIntersection(paramsA, paramsB);
@@ -618,7 +652,7 @@ export function ComparisonView({ product1, product2 }) {
         </div>
       </div>
 
-      <BreakEvenChart product1={product1} product2={product2} />
+      <BreakEvenChart product1={product1} product2={product2} breakEvenShards={precomputedBreakEven} />
 
       {/* PHASE BREAKDOWNS */}
       <div className="comparison__phase-section">
@@ -5,6 +5,88 @@
  * using the StaticDataExporter. This allows the entire site to be hosted
  * as static files without a server.
  */
+import { resolveAssumptionRefs } from '../utils/assumptions.js';
+
+let manifestPromise = null;
+
+/**
+ * Load the export manifest's map of file names to content-hashed names.
+ * Only exports made with the 'dist' profile hash names; others, and
+ * exports without a manifest, resolve to an empty map.
+ * @returns {Promise<Object>} Hashed file names by logical name
+ */
+export function loadManifest() {
+  if (!manifestPromise) {
+    manifestPromise = (async () => {
+      try {
+        const response = await fetch(`${import.meta.env.BASE_URL}data/manifest.json`);
+        if (!response.ok) {
+          return {};
+        }
+        const data = await response.json();
+        return data.paths || {};
+      } catch (error) {
+        return {};
+      }
+    })();
+  }
+  return manifestPromise;
+}
+
+/**
+ * URL of an exported top-level file, using its hashed name when the export has one.
+ * @param {string} name - Logical file name, e.g. 'products.json'
+ * @returns {Promise<string>} URL to fetch
+ */
+export async function dataUrl(name) {
+  const paths = await loadManifest();
+  return `${import.meta.env.BASE_URL}data/${paths[name] || name}`;
+}
+
+let sharedAssumptionsPromise = null;
+
+/**
+ * Load the global assumptions that products reference by key.
+ * Fetched once per page load; exports with inline assumptions have no file.
+ * @returns {Promise<Object>} Assumption definitions by key
+ */
+export function loadSharedAssumptions() {
+  if (!sharedAssumptionsPromise) {
+    sharedAssumptionsPromise = (async () => {
+      try {
+        const response = await fetch(await dataUrl('assumptions.json'));
+        if (!response.ok) {
+          throw new Error('Failed to load shared assumptions');
+        }
+        const data = await response.json();
+        return data.assumptions || {};
+      } catch (error) {
+        console.error('Error loading shared assumptions:', error);
+        return {};
+      }
+    })();
+  }
+  return sharedAssumptionsPromise;
+}
+
+const hasAssumptionRefs = (products) => products.some(
+  (product) => product?.assumptions?.exposed_assumptions?.some((assumption) => assumption?.ref)
+);
+
+/**
+ * Resolve shared assumption references in loaded products, fetching
+ * assumptions.json only when some product uses them.
+ * @param {Array} products - Products from the static export
+ * @returns {Promise<Array>} The same products, resolved
+ */
+async function resolveProducts(products) {
+  if (!hasAssumptionRefs(products)) {
+    return products;
+  }
+  const sharedAssumptions = await loadSharedAssumptions();
+  products.forEach((product) => resolveAssumptionRefs(product, sharedAssumptions));
+  return products;
+}
 
 /**
  * Load all products from the static data export
@@ -12,12 +94,12 @@
  */
 export async function loadProducts() {
   try {
-    const response = await fetch(`${import.meta.env.BASE_URL}data/products.json`);
+    const response = await fetch(await dataUrl('products.json'));
     if (!response.ok) {
       throw new Error('Failed to load products');
     }
     const data = await response.json();
-    return data.products || [];
+    return await resolveProducts(data.products || []);
   } catch (error) {
     console.error('Error loading products:', error);
     return [];
@@ -30,12 +112,14 @@ export async function loadProducts() {
  */
 export async function loadPosts() {
   try {
-    const response = await fetch(`${import.meta.env.BASE_URL}data/posts.json`);
+    const response = await fetch(await dataUrl('posts.json'));
     if (!response.ok) {
       throw new Error('Failed to load posts');
     }
     const data = await response.json();
-    return data.posts || [];
+    const posts = data.posts || [];
+    await resolveProducts(posts.flatMap((post) => post.comparison?.products || []));
+    return posts;
   } catch (error) {
     console.error('Error loading posts:', error);
     return [];
@@ -54,6 +138,7 @@ export async function loadPostBySlug(slug) {
       throw new Error('Failed to load post');
     }
     const data = await response.json();
+    await resolveProducts(data.post?.comparison?.products || []);
     return data.post;
   } catch (error) {
     console.error(`Error loading post ${slug}:`, error);
@@ -62,11 +147,117 @@ export async function loadPostBySlug(slug) {
 }
 
 /**
- * Load a single product by slug
+ * Load the slim product index for list pages: name, slug, description,
+ * price and the five annualized totals. Falls back to the full
+ * products.json for exports made before the index existed.
+ * @returns {Promise<Array>} Array of product summaries
+ */
+export async function loadProductIndex() {
+  try {
+    const response = await fetch(await dataUrl('products-index.json'));
+    if (!response.ok) {
+      throw new Error('Failed to load product index');
+    }
+    const data = await response.json();
+    return data.products || [];
+  } catch (error) {
+    console.error('Error loading product index:', error);
+    return loadProducts();
+  }
+}
+
+/**
+ * Load a single product by slug from its own file, falling back to the
+ * full products.json for exports made before per-product files existed.
  * @param {string} slug - The product slug
  * @returns {Promise<Object|null>} Product object or null if not found
  */
 export async function loadProductBySlug(slug) {
-  const products = await loadProducts();
-  return products.find(p => p.slug === slug) || null;
+  try {
+    const response = await fetch(`${import.meta.env.BASE_URL}data/products/${slug}.json`);
+    if (!response.ok) {
+      throw new Error('Failed to load product');
+    }
+    const data = await response.json();
+    const [product] = await resolveProducts(data.product ? [data.product] : []);
+    return product || null;
+  } catch (error) {
+    console.error(`Error loading product ${slug}:`, error);
+    const products = await loadProducts();
+    return products.find(p => p.slug === slug) || null;
+  }
+}
+
+const breakEvenPromises = new Map();
+
+/**
+ * Load one product's precomputed break-even shard: its line parameters and
+ * the crossing years with products exported after it.
+ * Each shard is fetched once per page load.
+ * @param {string} slug - The product slug
+ * @returns {Promise<Object|null>} Break-even shard or null if unavailable
+ */
+export function loadBreakEven(slug) {
+  if (!breakEvenPromises.has(slug)) {
+    breakEvenPromises.set(slug, (async () => {
+      try {
+        const response = await fetch(`${import.meta.env.BASE_URL}data/break-even/${slug}.json`);
+        if (!response.ok) {
+          throw new Error('Failed to load break-even data');
+        }
+        return await response.json();
+      } catch (error) {
+        console.error(`Error loading break-even data for ${slug}:`, error);
+        return null;
+      }
+    })());
+  }
+  return breakEvenPromises.get(slug);
+}
+
+/**
+ * Load the break-even shards of two compared products.
+ * @param {string} slug1 - First product slug
+ * @param {string} slug2 - Second product slug
+ * @returns {Promise<Object|null>} Shards keyed by slug, or null if either is unavailable
+ */
+export async function loadBreakEvenPair(slug1, slug2) {
+  const [shard1, shard2] = await Promise.all([loadBreakEven(slug1), loadBreakEven(slug2)]);
+  return shard1 && shard2 ? { [slug1]: shard1, [slug2]: shard2 } : null;
+}
+
+const TYPED_ARRAYS = { float32: Float32Array, float64: Float64Array };
+
+/**
+ * Load the columnar impact export: phase and total impact values of every
+ * product as one typed array, with no JSON parsing of the values. Value
+ * (row, column) is at `values[row * columns.length + column]`; rows follow
+ * `slugs` and columns are named like 'production.greenhouse_gas_kg' or
+ * 'total.water_liters'. Only present when exported with --columnar.
+ * @returns {Promise<Object|null>} Header fields plus `slugs` and `values`, or null if unavailable
+ */
+export async function loadImpactColumns() {
+  try {
+    const responses = await Promise.all([
+      fetch(await dataUrl('products-columns.json')),
+      fetch(await dataUrl('products-columns-slugs.json')),
+      fetch(await dataUrl('products-columns.bin')),
+    ]);
+    if (responses.some((response) => !response.ok)) {
+      throw new Error('Failed to load impact columns');
+    }
+    const [headerResponse, slugsResponse, bufferResponse] = responses;
+    const header = await headerResponse.json();
+    const TypedArray = TYPED_ARRAYS[header.dtype];
+    if (!TypedArray) {
+      throw new Error(`Unsupported impact column dtype: ${header.dtype}`);
+    }
+    const { slugs } = await slugsResponse.json();
+    // The buffer is little-endian, like every platform browsers run on.
+    const values = new TypedArray(await bufferResponse.arrayBuffer());
+    return { ...header, slugs, values };
+  } catch (error) {
+    console.error('Error loading impact columns:', error);
+    return null;
+  }
 }
@@ -5,10 +5,10 @@
  * static JSON export, handling loading states, and caching results.
  */
 import { useState, useEffect } from 'react';
-import { loadProducts, loadProductBySlug } from '../data/index.js';
+import { loadProductIndex, loadProductBySlug } from '../data/index.js';
 
 /**
- * Hook to fetch all products
+ * Hook to fetch all products, as the slim list-page index
  * @returns {Object} Object with products array, loading state, and error
  */
 export function useAllProducts() {
@@ -21,7 +21,7 @@ export function useAllProducts() {
       try {
         setLoading(true);
         setError(null);
-        const data = await loadProducts();
+        const data = await loadProductIndex();
         setProducts(data);
       } catch (err) {
         setError(err.message);
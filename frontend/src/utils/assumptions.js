@@ -7,6 +7,27 @@ const getVal = (val) => (
 
 const cloneProduct = (product) => JSON.parse(JSON.stringify(product));
 
+/**
+ * Replace shared assumption references with their definitions.
+ *
+ * The static export writes global assumptions once to assumptions.json and
+ * lists them in each product as `{ ref: key }`. Products are resolved in place
+ * right after loading; references without a definition are dropped.
+ * @param {Object} product - Product from the static export
+ * @param {Object} sharedAssumptions - Assumption definitions by key
+ * @returns {Object} The same product
+ */
+export function resolveAssumptionRefs(product, sharedAssumptions = {}) {
+  const exposed = product?.assumptions?.exposed_assumptions;
+  if (!Array.isArray(exposed) || !exposed.some((assumption) => assumption?.ref)) {
+    return product;
+  }
+  product.assumptions.exposed_assumptions = exposed
+    .map((assumption) => (assumption?.ref ? sharedAssumptions[assumption.ref] : assumption))
+    .filter(Boolean);
+  return product;
+}
+
 export function getExposedAssumptions(product) {
   return product?.assumptions?.exposed_assumptions || [];
 }
@@ -22,6 +43,16 @@ export function getDefaultAssumptionSelections(product) {
   }, {});
 }
 
+/**
+ * Whether every exposed assumption of a product is at its default option.
+ */
+export function isDefaultAssumptionSelection(product, selections = {}) {
+  return getExposedAssumptions(product).every((assumption) => {
+    const selectedId = selections[assumption.key] || assumption.default_option_id;
+    return selectedId === assumption.default_option_id;
+  });
+}
+
 function getSelectedOptions(product, selections = {}) {
   const exposed = getExposedAssumptions(product);
   return exposed
@@ -147,6 +178,88 @@ function rebuildImpactsFromPhases(product) {
   return rebuilt;
 }
 
+/**
+ * Look up precomputed phase values and totals for a selection in the
+ * exporter's assumption_scenarios table.
+ * @returns {Object|null} { phaseValues, totals } (flat arrays in PHASES × METRICS
+ *   and METRICS order; totals may be null), or null when the table is missing
+ *   or does not cover the selection.
+ */
+export function lookupAssumptionScenario(product, selections = {}) {
+  const scenarios = product?.assumption_scenarios;
+  if (!scenarios) {
+    return null;
+  }
+
+  const indices = [];
+  for (let i = 0; i < scenarios.keys.length; i += 1) {
+    const selectedId = selections[scenarios.keys[i]] || scenarios.defaults[i];
+    const index = scenarios.options[i].indexOf(selectedId);
+    if (index < 0) {
+      return null;
+    }
+    indices.push(index);
+  }
+
+  if (scenarios.mode === 'cube') {
+    const flatIndex = indices.reduce(
+      (acc, index, i) => acc * scenarios.options[i].length + index,
+      0,
+    );
+    return {
+      phaseValues: scenarios.phase_values[flatIndex],
+      totals: scenarios.totals[flatIndex],
+    };
+  }
+
+  if (scenarios.mode === 'factorized') {
+    const phaseValues = scenarios.base.map((value, cell) => {
+      const factor = indices.reduce(
+        (acc, index, i) => acc * scenarios.multipliers[i][index][cell],
+        1,
+      );
+      return value * factor;
+    });
+    return { phaseValues, totals: null };
+  }
+
+  return null;
+}
+
+function applyScenarioToProduct(product, scenario, selections) {
+  const impactsByPhase = {};
+
+  PHASES.forEach((phase, p) => {
+    impactsByPhase[phase] = {};
+    METRICS.forEach((metric, m) => {
+      const original = product.impacts_by_phase?.[phase]?.[metric];
+      const entry = original && typeof original === 'object' ? { ...original } : {};
+      const baseValue = getVal(original);
+      const value = scenario.phaseValues[p * METRICS.length + m];
+      if (value !== baseValue) {
+        applyMultiplierToPhaseMetric(entry, baseValue !== 0 ? value / baseValue : 1);
+      }
+      entry.value = value;
+      impactsByPhase[phase][metric] = entry;
+    });
+  });
+
+  const derived = {
+    ...product,
+    impacts_by_phase: impactsByPhase,
+    applied_assumption_selections: selections,
+  };
+  derived.impacts = rebuildImpactsFromPhases(derived);
+
+  if (scenario.totals) {
+    METRICS.forEach((metric, m) => {
+      derived.impacts[metric].value = scenario.totals[m];
+    });
+  }
+
+  return derived;
+}
+
 export function applyAssumptionsToProduct(product, selections = {}) {
   if (!product) {
     return product;
@@ -157,6 +270,11 @@ export function applyAssumptionsToProduct(product, selections = {}) {
     return product;
   }
 
+  const scenario = lookupAssumptionScenario(product, selections);
+  if (scenario) {
+    return applyScenarioToProduct(product, scenario, selections);
+  }
+
   const derived = cloneProduct(product);
   const multipliers = getPhaseMetricMultipliers(derived, selections);
 
@@ -295,3 +295,33 @@ export function calculateBreakEvenIntersection(p1, p2) {
   }
   return null;
 }
+
+/**
+ * Look up precomputed break-even data in the two products' exported shards.
+ * Only valid for products shown with their default assumption selections.
+ * @param {Object|null} shards - Contents of break-even/{slug}.json keyed by slug
+ * @param {Object} product1 - First product (matched by slug)
+ * @param {Object} product2 - Second product (matched by slug)
+ * @param {string} metric - 'cost_usd', 'greenhouse_gas_kg', etc.
+ * @returns {Object|null} { p1, p2, year } with params { initial, slope } per product
+ *   and the crossing year (null if none within the horizon), or null if either
+ *   product has no shard
+ */
+export function lookupBreakEven(shards, product1, product2, metric) {
+  const shard1 = shards?.[product1?.slug];
+  const shard2 = shards?.[product2?.slug];
+  if (!shard1 || !shard2) {
+    return null;
+  }
+  const m = (shard1.metrics || []).indexOf(metric);
+  if (m < 0) {
+    return null;
+  }
+  // Each crossing is stored once, in the shard of the product exported first.
+  const year = shard1.crossings?.[metric]?.[shard2.slug] ?? shard2.crossings?.[metric]?.[shard1.slug];
+  return {
+    p1: { initial: shard1.initial[m], slope: shard1.slope[m] },
+    p2: { initial: shard2.initial[m], slope: shard2.slope[m] },
+    year: year ?? null,
+  };
+}